@@ -0,0 +1,89 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import timeit
+
+from flask import Flask
+from sqlalchemy.orm import joinedload
+
+from extensions import db
+from models import Country, Vaccination, Vaccine
+from routes.main import _requirement_satisfied
+from services.catalog import invalidate_catalog
+from services.compliance import RequirementMatrix, compute_compliance
+from test_compliance_engine import build_profile, build_snapshot, reference, seed_database
+
+
+def _both(result):
+    return result.missing(), result.percent()
+
+
+def bench_engine():
+    profile = build_profile(n_illnesses=30, seed=1)
+    print(f"{'Länder':>7} {'Req/Land':>9} {'Schleife (ms)':>14} {'NumPy (ms)':>11} {'Faktor':>7}")
+    for n_countries, max_reqs in [(220, 4), (220, 8), (220, 16), (1000, 16)]:
+        snapshot = build_snapshot(n_countries=n_countries, max_reqs=max_reqs)
+        matrix = RequirementMatrix(snapshot)
+
+        runs = 50
+        loop = timeit.timeit(lambda: reference(snapshot, profile), number=runs) / runs
+        vec = timeit.timeit(lambda: _both(matrix.evaluate(profile)), number=runs) / runs
+        print(f"{n_countries:>7} {max_reqs:>9} {loop * 1000:>14.3f} {vec * 1000:>11.3f} {loop / vec:>6.1f}x")
+
+
+def orm_path(user_id):
+    """Bisheriger Weg der Routen: joinedload aller Impfungen und Länder, Schleife pro Requirement."""
+    vaccinations = (
+        Vaccination.query
+        .filter_by(user_id=user_id)
+        .options(joinedload(Vaccination.vaccine).joinedload(Vaccine.illness), joinedload(Vaccination.dates))
+        .all()
+    )
+    profile = {}
+    for v in vaccinations:
+        entry = profile.setdefault(v.vaccine.illness_id, {"dose_count": 0, "last_dose_date": None})
+        for d in v.dates:
+            entry["dose_count"] += 1
+            if entry["last_dose_date"] is None or d.date > entry["last_dose_date"]:
+                entry["last_dose_date"] = d.date
+
+    impfstatus = {}
+    for c in Country.query.options(joinedload(Country.requirements)).all():
+        impfstatus[c.iso_code] = sum(1 for req in c.requirements if not _requirement_satisfied(req, profile))
+    db.session.expunge_all()
+    return impfstatus
+
+
+def bench_modes():
+    """ORM-Pfad vs. COMPLIANCE_MODE python/sql gegen IMT_BENCH_DATABASE_URL (Default: SQLite in-memory)."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("IMT_BENCH_DATABASE_URL", "sqlite://")
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        invalidate_catalog()
+        try:
+            user_ids = seed_database(n_countries=220, n_illnesses=30, n_users=20)
+            runs = 20
+            print(f"\nDatenbank: {db.engine.url.render_as_string(hide_password=True)}")
+            print(f"{'Pfad':>8} {'ms/Request':>11}")
+
+            orm = timeit.timeit(lambda: [orm_path(u) for u in user_ids], number=runs) / (runs * len(user_ids))
+            print(f"{'orm':>8} {orm * 1000:>11.3f}")
+            for mode in ("python", "sql"):
+                app.config["COMPLIANCE_MODE"] = mode
+                elapsed = timeit.timeit(
+                    lambda: [compute_compliance(u).missing() for u in user_ids], number=runs
+                ) / (runs * len(user_ids))
+                print(f"{mode:>8} {elapsed * 1000:>11.3f}")
+        finally:
+            db.session.remove()
+            db.drop_all()
+            invalidate_catalog()
+
+
+if __name__ == "__main__":
+    bench_engine()
+    bench_modes()
@@ -0,0 +1,65 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import csv
+import time
+
+from crawler.illness_matcher import ILLNESSES_CSV, IllnessMatcher, normalize_text
+from crawler.CrawlerImpfdaten import OUTPUT_CSV
+
+
+def load_corpus(repeat=200):
+    """Alle Impftexte aus laender_impf_details.csv, vervielfacht für stabile Messwerte."""
+    with open(OUTPUT_CSV, encoding='utf-8') as f:
+        texts = [row[col] for row in csv.DictReader(f) for col in ('impf_voraussetzungen', 'impf_empfehlungen')]
+    return [normalize_text(t) for t in texts] * repeat
+
+
+def load_names(extra=0):
+    with open(ILLNESSES_CSV, encoding='utf-8') as f:
+        names = [row['name'] for row in csv.DictReader(f)]
+    # Künstliche Katalogerweiterung, um die Abhängigkeit von der Musterzahl zu zeigen
+    return names + [f"Testkrankheit{i:05d}" for i in range(extra)]
+
+
+def naive_find(patterns, text):
+    """Vergleich: jedes Muster einzeln per str.find – Kosten wachsen mit der Musterzahl."""
+    hits = []
+    for pattern, illness in patterns:
+        start = text.find(pattern)
+        while start != -1:
+            hits.append((start, illness))
+            start = text.find(pattern, start + 1)
+    return hits
+
+
+def bench(extra, corpus):
+    matcher = IllnessMatcher(load_names(extra))
+    patterns = matcher.patterns
+    chars = sum(len(t) for t in corpus)
+
+    start = time.perf_counter()
+    for text in corpus:
+        matcher.find(text, normalized=True)
+    automaton = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in corpus:
+        naive_find(patterns, text)
+    naive = time.perf_counter() - start
+    return matcher, chars, automaton, naive
+
+
+def main():
+    corpus = load_corpus()
+    print(f"Korpus: {len(corpus)} Texte, {sum(len(t) for t in corpus) / 1024:.0f} KiB")
+    print(f"{'Namen':>7} {'Muster':>7} {'Zustände':>9} {'AC MB/s':>8} {'naiv MB/s':>10}")
+    for extra in (0, 500, 5000):
+        matcher, chars, automaton, naive = bench(extra, corpus)
+        print(f"{len(matcher.illness_names):>7} {matcher.pattern_count:>7} {matcher.automaton.size:>9} "
+              f"{chars / automaton / 1e6:>8.2f} {chars / naive / 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
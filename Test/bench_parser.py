@@ -0,0 +1,85 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import glob
+import time
+import tracemalloc
+
+from crawler.CrawlerImpfdaten import parse_recommendations, parse_recommendations_fast
+from crawler.http_cache import DEFAULT_CACHE_DIR
+
+# Aufbau grob wie eine Sicherheitsseite des Auswärtigen Amts: viel Navigation und
+# Text vor und nach dem Abschnitt Gesundheit -> Impfschutz.
+SYNTHETIC_PAGE = """<!DOCTYPE html><html><head><title>Sicherheitshinweise</title>{scripts}</head><body>
+<nav><ul>{nav}</ul></nav>
+<main><div class="c-rte">
+<h2>Sicherheit</h2>{filler}
+<h2>Gesundheit</h2>
+<h3>Aktuelles</h3><p>Es gibt aktuell keine besonderen Hinweise.</p>
+<h3>Impfschutz</h3>
+<p>Bei Einreise aus einem Gelbfiebergebiet müssen alle Personen ab einem Alter von neun Monaten eine
+<a href="/gelbfieber">Gelbfieberimpfung</a> nachweisen. Der Nachweis einer Poliomyelitis-Impfung innerhalb von
+12 Monaten bis vier Wochen vor Einreise wird verlangt.</p>
+<ul><li>Als Reiseimpfungen werden Impfungen gegen Hepatitis A, Typhus und Tollwut empfohlen.</li></ul>
+<div><p>Beachten Sie die Hinweise des RKI.</p></div>
+<h3>Malaria</h3>{filler}
+</div></main><footer>{nav}</footer></body></html>"""
+
+
+def synthetic_pages(count=20):
+    nav = "".join(f'<li><a href="/l/{i}">Land {i}</a></li>' for i in range(250))
+    filler = "".join(f"<p>Absatz {i} mit allgemeinem Text zur Lage vor Ort.</p>" for i in range(300))
+    scripts = "".join(f"<script>var x{i} = {i};</script>" for i in range(50))
+    page = SYNTHETIC_PAGE.format(nav=nav, filler=filler, scripts=scripts)
+    return [page] * count
+
+
+def load_fixtures():
+    """Gecachte Seiten aus crawler/.http_cache, sonst synthetische Seiten."""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(DEFAULT_CACHE_DIR, '*.body'))):
+        with open(path, 'rb') as f:
+            pages.append(f.read().decode('utf-8', errors='replace'))
+    return (pages, "http_cache") if pages else (synthetic_pages(), "synthetisch")
+
+
+def measure(parser, pages):
+    results = []
+    start = time.perf_counter()
+    for html in pages:
+        try:
+            results.append(parser(html))
+        except Exception as e:
+            results.append(str(e))
+    elapsed = (time.perf_counter() - start) / len(pages)
+
+    peak = 0
+    for html in pages[:5]:
+        tracemalloc.start()
+        try:
+            parser(html)
+        except Exception:
+            pass
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return results, elapsed, peak
+
+
+def main():
+    pages, source = load_fixtures()
+    avg_size = sum(len(p) for p in pages) / len(pages)
+    print(f"{len(pages)} Seiten ({source}), Ø {avg_size / 1024:.0f} KiB")
+
+    full, full_time, full_peak = measure(parse_recommendations, pages)
+    fast, fast_time, fast_peak = measure(parse_recommendations_fast, pages)
+    mismatches = sum(1 for a, b in zip(full, fast) if a != b)
+
+    print(f"{'Modus':>6} {'ms/Seite':>9} {'Peak KiB':>9}")
+    print(f"{'full':>6} {full_time * 1000:>9.2f} {full_peak / 1024:>9.0f}")
+    print(f"{'fast':>6} {fast_time * 1000:>9.2f} {fast_peak / 1024:>9.0f}")
+    print(f"Faktor {full_time / fast_time:.1f}x, abweichende Ergebnisse: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Kandidaten für PASSWORD_HASH_METHOD (werkzeug-Syntax)
+METHODS = [
+    "pbkdf2:sha256:100000",
+    "pbkdf2:sha256:600000",
+    "scrypt:16384:8:1",
+    "scrypt:32768:8:1",   # werkzeug-Default
+    "scrypt:65536:8:1",
+]
+
+
+def logins_per_second(stored, threads=1, duration=1.0):
+    """Prüfungen pro Sekunde; threads > 1 zeigt, ob hashlib den GIL freigibt."""
+    def worker():
+        count = 0
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            check_password_hash(stored, "geheim123")
+            count += 1
+        return count
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return sum(pool.map(lambda _: worker(), range(threads))) / duration
+
+
+def main():
+    threads = min(4, os.cpu_count() or 1)
+    print(f"{'Verfahren':<24} {'ms/Login':>9} {'Logins/s/Kern':>14} {f'Logins/s ({threads} Threads)':>22}")
+    for method in METHODS:
+        stored = generate_password_hash("geheim123", method=method)
+        single = logins_per_second(stored)
+        parallel = logins_per_second(stored, threads=threads)
+        print(f"{method:<24} {1000 / single:>9.1f} {single:>14.1f} {parallel:>22.1f}")
+
+
+if __name__ == "__main__":
+    main()
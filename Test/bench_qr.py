@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import base64
+import io
+import time
+
+import qrcode
+
+from services.qr import FORMATS, clear_qr_cache, render_qr, render_qr_cached
+
+URI = ("otpauth://totp/ImmunTrack:max.mustermann%40example.com"
+       "?secret=JBSWY3DPEHPK3PXPJBSWY3DPEHPK3PXP&issuer=ImmunTrack")
+
+
+def per_call_ms(fn, duration=1.0):
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        fn()
+        count += 1
+    return (time.perf_counter() - start) / count * 1000
+
+
+def inline_png_base64():
+    """Bisheriger Weg in mfa_setup: qrcode.make + PNG + base64 im HTML."""
+    buf = io.BytesIO()
+    qrcode.make(URI).save(buf, format="PNG")
+    return base64.b64encode(buf.getvalue())
+
+
+def main():
+    print(f"{'Variante':<28} {'ms/Aufruf':>10} {'Bytes':>8}")
+    print(f"{'png+base64 (bisher)':<28} {per_call_ms(inline_png_base64):>10.3f} {len(inline_png_base64()):>8}")
+    for fmt in FORMATS:
+        print(f"{fmt + ' (ungecacht)':<28} {per_call_ms(lambda: render_qr(URI, fmt)):>10.3f} {len(render_qr(URI, fmt)):>8}")
+        clear_qr_cache()
+        print(f"{fmt + ' (Cache-Treffer)':<28} {per_call_ms(lambda: render_qr_cached(URI, fmt)):>10.4f} {len(render_qr_cached(URI, fmt)):>8}")
+
+
+if __name__ == "__main__":
+    main()
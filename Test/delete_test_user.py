@@ -4,7 +4,9 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from models import User
 from extensions import db
-from app import app
+from app import create_app
+
+app = create_app()
 
 with app.app_context():
     user_to_delete = User.query.filter_by(email="testuser@example.com").first()
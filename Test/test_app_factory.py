@@ -0,0 +1,61 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile
+
+from sqlalchemy import event
+
+from app import create_app
+from config import TestConfig
+from extensions import db
+from services.template_cache import template_stats
+
+
+def test_create_app_does_no_db_io():
+    # Nicht erreichbare Datenbank: create_app darf trotzdem nicht scheitern
+    app = create_app({"SQLALCHEMY_DATABASE_URI": "postgresql://nobody@127.0.0.1:1/immuntrack"})
+    with app.app_context():
+        assert db.engine.pool.checkedout() == 0
+    assert app.extensions["startup_timing"]["create_app_ms"] < 1000
+
+
+def test_in_memory_app_serves_pages():
+    app = create_app(TestConfig)
+    connects = []
+    with app.app_context():
+        event.listen(db.engine, "connect", lambda *args: connects.append(args))
+        db.create_all()
+
+    client = app.test_client()
+    assert client.get("/").status_code == 200
+    assert client.get("/dashboard").status_code == 302  # login_required
+    assert connects, "In-Memory-SQLite wird erst beim ersten Zugriff verbunden"
+
+
+def test_preloaded_templates_come_from_bytecode_cache():
+    cache_dir = tempfile.mkdtemp()
+    config = {"TEMPLATE_BYTECODE_CACHE": True, "TEMPLATE_CACHE_DIR": cache_dir, "TEMPLATE_PRELOAD": True}
+
+    template_stats.clear()
+    first = create_app({**config, "SQLALCHEMY_DATABASE_URI": "sqlite://"})
+    assert first.extensions["startup_timing"]["templates_ms"] is not None
+    assert template_stats["dashboard/einreise_map.html"]["compiles"] == 1
+    assert os.listdir(cache_dir)
+
+    # Zweiter Worker: alles aus dem Bytecode-Cache, nichts wird neu kompiliert
+    template_stats.clear()
+    second = create_app({**config, "SQLALCHEMY_DATABASE_URI": "sqlite://"})
+    assert not any(entry["compiles"] for entry in template_stats.values())
+
+    with second.app_context():
+        db.create_all()
+    second.test_client().get("/")
+    assert any(entry["renders"] for entry in template_stats.values())
+
+
+if __name__ == "__main__":
+    test_create_app_does_no_db_io()
+    test_in_memory_app_serves_pages()
+    test_preloaded_templates_come_from_bytecode_cache()
+    print("OK")
@@ -0,0 +1,88 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from config import TestConfig
+from crawler.catalog_loader import RequirementRecord, crawled_countries, load_catalog
+from extensions import db
+from models import CatalogRevision, VaccinationRequirement
+from services.catalog import _query_version
+
+ILLNESSES = ["Gelbfieber", "Masern", "Tollwut"]
+ISO_CODES = {"kenia": "KE", "peru": "PE"}
+
+
+def make_app():
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        load_catalog(ILLNESSES, ["Kenia", "Peru"], [
+            RequirementRecord("Kenia", "Gelbfieber"),
+            RequirementRecord("Kenia", "Masern", 2),
+            RequirementRecord("Peru", "Gelbfieber"),
+        ], ISO_CODES)
+    return app
+
+
+def requirement_count():
+    return VaccinationRequirement.query.count()
+
+
+def test_manual_insert_only_upserts():
+    app = make_app()
+    with app.app_context():
+        report = load_catalog(["Tollwut"], ["Kenia"], [RequirementRecord("Kenia", "Tollwut", 3)])
+        assert report["requirements"]["inserted"] == 1
+        assert report["requirements"]["deleted"] == 0
+        assert requirement_count() == 4
+
+
+def test_crawled_country_without_requirements_is_cleared():
+    app = make_app()
+    texts = {
+        "Kenia": "Eine Gelbfieberimpfung wird bei Einreise verlangt.",
+        "Peru": "Keine Impfvorschriften bei direkter Einreise aus Deutschland.",
+    }
+    with app.app_context():
+        report = load_catalog(ILLNESSES, ["Kenia", "Peru"], [RequirementRecord("Kenia", "Gelbfieber")],
+                              crawled=crawled_countries(texts), delete_obsolete=True)
+        # Kenia verliert Masern, Peru (erfolgreich gecrawlt, nichts gefordert) seine Gelbfieber-Zeile
+        assert report["requirements"]["deleted"] == 2
+        assert requirement_count() == 1
+
+
+def test_failed_crawl_keeps_existing_requirements():
+    app = make_app()
+    texts = {"Kenia": "Eine Gelbfieberimpfung wird verlangt.", "Peru": "Netzwerkfehler: Timeout"}
+    assert crawled_countries(texts) == ["Kenia"]
+    with app.app_context():
+        report = load_catalog(ILLNESSES, ["Kenia", "Peru"], [RequirementRecord("Kenia", "Gelbfieber")],
+                              crawled=crawled_countries(texts), delete_obsolete=True)
+        assert report["requirements"]["deleted"] == 1
+        assert requirement_count() == 2
+
+
+def test_content_change_bumps_catalog_version():
+    app = make_app()
+    with app.app_context():
+        version = _query_version()
+        records = [RequirementRecord("Kenia", "Gelbfieber"), RequirementRecord("Kenia", "Masern", 2)]
+        load_catalog(ILLNESSES, ["Kenia"], records)
+        assert _query_version() == version
+
+        # Nur required_doses ändert sich: gleiche Zeilen, gleiche ids – trotzdem neue Version
+        load_catalog(ILLNESSES, ["Kenia"], [RequirementRecord("Kenia", "Masern", 1)])
+        assert _query_version() != version
+        assert db.session.get(CatalogRevision, 1).revision == 2
+
+        load_catalog(ILLNESSES, ["Kenia"], [RequirementRecord("Kenia", "Masern", 3)], dry_run=True)
+        assert db.session.get(CatalogRevision, 1).revision == 2
+
+
+if __name__ == "__main__":
+    test_manual_insert_only_upserts()
+    test_crawled_country_without_requirements_is_cleared()
+    test_failed_crawl_keeps_existing_requirements()
+    test_content_change_bumps_catalog_version()
+    print("OK")
@@ -0,0 +1,144 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+from datetime import date, timedelta
+
+from flask import Flask
+
+from extensions import db
+from models import Country, Illness, User, Vaccination, VaccinationDate, VaccinationRequirement, Vaccine
+from routes.main import _requirement_satisfied
+from services.catalog import CatalogSnapshot, CountryEntry, RequirementEntry, invalidate_catalog
+from services.compliance import RequirementMatrix, compute_compliance
+
+
+def build_snapshot(n_countries=220, n_illnesses=30, max_reqs=8, seed=42):
+    rnd = random.Random(seed)
+    countries = []
+    req_id = 1
+    for idx in range(n_countries):
+        reqs = []
+        for illness_id in rnd.sample(range(1, n_illnesses + 1), rnd.randint(0, max_reqs)):
+            reqs.append(RequirementEntry(
+                req_id, illness_id, rnd.randint(0, 3), rnd.choice([None, 0, 1, 6, 12, 120])
+            ))
+            req_id += 1
+        countries.append(CountryEntry(idx + 1, f"L{idx:03d}", f"Land {idx}", tuple(reqs)))
+    return CatalogSnapshot(version=(seed,), countries=tuple(countries), built_at=0.0)
+
+
+def build_profile(n_illnesses=30, seed=0):
+    rnd = random.Random(seed)
+    profile = {}
+    for illness_id in rnd.sample(range(1, n_illnesses + 5), rnd.randint(0, n_illnesses)):
+        dose_count = rnd.randint(0, 4)
+        last = date.today() - timedelta(days=rnd.randint(0, 4000)) if dose_count else None
+        profile[illness_id] = {"dose_count": dose_count, "last_dose_date": last}
+    return profile
+
+
+def reference(snapshot, profile):
+    missing, percent = {}, {}
+    for c in snapshot.countries:
+        met = sum(1 for req in c.requirements if _requirement_satisfied(req, profile))
+        missing[c.iso_code] = len(c.requirements) - met
+        percent[c.iso_code] = round((met / len(c.requirements)) * 100) if c.requirements else 100
+    return missing, percent
+
+
+def test_vectorized_matches_reference():
+    snapshot = build_snapshot()
+    matrix = RequirementMatrix(snapshot)
+    for seed in range(50):
+        profile = build_profile(seed=seed)
+        result = matrix.evaluate(profile)
+        missing, percent = reference(snapshot, profile)
+        assert result.missing() == missing
+        assert result.percent() == percent
+
+
+def test_validity_boundary_day():
+    snapshot = CatalogSnapshot((1,), (
+        CountryEntry(1, "AAA", "A", (RequirementEntry(1, 7, 1, 12),)),
+    ), 0.0)
+    matrix = RequirementMatrix(snapshot)
+    today = date.today()
+    on_threshold = {7: {"dose_count": 1, "last_dose_date": today - timedelta(days=360)}}
+    one_day_late = {7: {"dose_count": 1, "last_dose_date": today - timedelta(days=361)}}
+    assert matrix.evaluate(on_threshold, today).missing() == {"AAA": 0}
+    assert matrix.evaluate(one_day_late, today).missing() == {"AAA": 1}
+
+
+def test_empty_catalog():
+    matrix = RequirementMatrix(CatalogSnapshot((0,), (), 0.0))
+    result = matrix.evaluate(build_profile())
+    assert result.missing() == {}
+    assert result.percent() == {}
+
+
+def seed_database(n_countries=60, n_illnesses=12, n_users=8, seed=7):
+    rnd = random.Random(seed)
+    illnesses = [Illness(name=f"Krankheit {i}") for i in range(n_illnesses)]
+    db.session.add_all(illnesses)
+    db.session.flush()
+    vaccines = [Vaccine(name=f"Impfstoff {i.id}", manufacturer="Test", illness_id=i.id) for i in illnesses]
+    db.session.add_all(vaccines)
+
+    for idx in range(n_countries):
+        country = Country(iso_code=f"L{idx:02d}", name=f"Land {idx}")
+        db.session.add(country)
+        db.session.flush()
+        for illness in rnd.sample(illnesses, rnd.randint(0, 5)):
+            db.session.add(VaccinationRequirement(
+                country_id=country.id, illness_id=illness.id,
+                required_doses=rnd.randint(0, 3),
+                validity_period_months=rnd.choice([None, 0, 6, 12, 120]),
+            ))
+
+    users = []
+    for idx in range(n_users):
+        user = User(first_name="Test", last_name=str(idx), email=f"user{idx}@example.com", password_hash="x")
+        db.session.add(user)
+        db.session.flush()
+        for vaccine in rnd.sample(vaccines, rnd.randint(0, len(vaccines))):
+            vaccination = Vaccination(user_id=user.id, vaccine_id=vaccine.id, status="erledigt")
+            for _ in range(rnd.randint(0, 4)):
+                vaccination.dates.append(VaccinationDate(date=date.today() - timedelta(days=rnd.randint(0, 4000))))
+            db.session.add(vaccination)
+        users.append(user.id)
+
+    db.session.commit()
+    return users
+
+
+def test_sql_mode_matches_python_mode():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("IMT_TEST_DATABASE_URL", "sqlite://")
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        invalidate_catalog()
+        try:
+            for user_id in seed_database():
+                app.config["COMPLIANCE_MODE"] = "python"
+                python_result = compute_compliance(user_id)
+                app.config["COMPLIANCE_MODE"] = "sql"
+                sql_result = compute_compliance(user_id)
+
+                assert sql_result.missing() == python_result.missing()
+                assert sql_result.percent() == python_result.percent()
+        finally:
+            db.session.remove()
+            db.drop_all()
+            invalidate_catalog()
+
+
+if __name__ == "__main__":
+    test_sql_mode_matches_python_mode()
+    test_vectorized_matches_reference()
+    test_validity_boundary_day()
+    test_empty_catalog()
+    print("Compliance-Engine: alle Prüfungen erfolgreich.")
@@ -0,0 +1,206 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from app import create_app
+from config import TestConfig
+from crawler.catalog_loader import RequirementRecord, after_catalog_load, load_catalog
+import db_routing
+from db_routing import REPLICA_KEY, RoutingSession
+from extensions import db
+from models import Country, Illness, User, UserCountryCompliance, Vaccination, VaccinationRequirement, Vaccine
+from services.catalog import invalidate_catalog
+from services.compliance_store import get_user_compliance, store_stats
+
+TODAY = date.today()
+
+
+def make_app(mode="materialized", **overrides):
+    invalidate_catalog()
+    app = create_app(type("StoreTestConfig", (TestConfig,), {"COMPLIANCE_MODE": mode, **overrides}))
+    with app.app_context():
+        db.create_all()
+        illness = Illness(name="Tollwut")
+        country = Country(iso_code="KE", name="Kenia")
+        db.session.add_all([illness, country])
+        db.session.flush()
+        db.session.add(Vaccine(name="Rabipur", manufacturer="Test", illness_id=illness.id))
+        db.session.add(VaccinationRequirement(country_id=country.id, illness_id=illness.id,
+                                              required_doses=1, validity_period_months=12))
+        user = User(first_name="Max", last_name="Mustermann", email="max@example.com")
+        user.set_password("geheim123")
+        db.session.add(user)
+        db.session.commit()
+    return app
+
+
+def login(app):
+    client = app.test_client()
+    client.post("/login", data={"email": "max@example.com", "password": "geheim123"})
+    return client
+
+
+def compliance_rows():
+    return [(row.iso_code, row.met, row.total, row.valid_until)
+            for row in UserCountryCompliance.query.order_by(UserCountryCompliance.country_id)]
+
+
+def add_vaccination(client, dose_date):
+    commits = []
+
+    def count(session):
+        commits.append(session)
+
+    event.listen(RoutingSession, "after_commit", count)
+    try:
+        response = client.post("/add_vaccine", data={
+            "vaccine_id": "1", "status": "erledigt", "datum": dose_date.isoformat(),
+        })
+    finally:
+        event.remove(RoutingSession, "after_commit", count)
+    assert response.status_code == 302
+    return len(commits)
+
+
+def test_materialized_mode_writes_read_model_with_vaccination():
+    app = make_app()
+    client = login(app)
+    dose_date = TODAY - timedelta(days=100)
+    assert add_vaccination(client, dose_date) == 1  # Impfung und Read-Model in einem Commit
+    with app.app_context():
+        assert compliance_rows() == [("KE", 1, 1, dose_date + timedelta(days=360))]
+        vaccination_id = Vaccination.query.one().id
+
+    assert client.post(f"/delete_impfung/{vaccination_id}").status_code == 302
+    with app.app_context():
+        assert compliance_rows() == [("KE", 0, 1, None)]
+
+
+def test_other_modes_leave_read_model_alone():
+    app = make_app(mode="python")
+    client = login(app)
+    refreshes = store_stats["user_refreshes"]
+    assert add_vaccination(client, TODAY) == 1
+    with app.app_context():
+        assert compliance_rows() == []
+        # Auch ein Katalogimport mit Änderungen baut das Read-Model nicht auf
+        report = load_catalog(["Tollwut", "Gelbfieber"], ["Kenia"], [RequirementRecord("Kenia", "Gelbfieber")])
+        assert after_catalog_load(report)
+        assert compliance_rows() == []
+    assert store_stats["user_refreshes"] == refreshes
+
+
+def test_catalog_import_rebuilds_read_model_in_materialized_mode():
+    app = make_app()
+    client = login(app)
+    add_vaccination(client, TODAY)
+    with app.app_context():
+        report = load_catalog(["Tollwut", "Gelbfieber"], ["Kenia"], [RequirementRecord("Kenia", "Gelbfieber")])
+        assert after_catalog_load(report)
+        assert compliance_rows()[0][1:3] == (1, 2)
+
+
+def test_expired_entry_is_refreshed_on_read():
+    app = make_app()
+    client = login(app)
+    dose_date = TODAY - timedelta(days=100)
+    add_vaccination(client, dose_date)
+    valid_until = dose_date + timedelta(days=360)
+
+    with app.app_context():
+        lazy = store_stats["lazy_refreshes"]
+        assert get_user_compliance(1, valid_until).missing() == {"KE": 0}
+        assert store_stats["lazy_refreshes"] == lazy
+
+        # Einen Tag nach valid_until ist der Eintrag abgelaufen und wird neu berechnet
+        assert get_user_compliance(1, valid_until + timedelta(days=1)).missing() == {"KE": 1}
+        assert store_stats["lazy_refreshes"] == lazy + 1
+        assert compliance_rows() == [("KE", 0, 1, None)]
+
+
+def test_catalog_change_triggers_lazy_refresh():
+    app = make_app()
+    client = login(app)
+    add_vaccination(client, TODAY)
+
+    with app.app_context():
+        assert get_user_compliance(1).missing() == {"KE": 0}
+        illness = Illness(name="Gelbfieber")
+        db.session.add(illness)
+        db.session.flush()
+        db.session.add(VaccinationRequirement(country_id=1, illness_id=illness.id, required_doses=1))
+        db.session.commit()
+        invalidate_catalog()
+
+        lazy = store_stats["lazy_refreshes"]
+        assert get_user_compliance(1).missing() == {"KE": 1}
+        assert store_stats["lazy_refreshes"] == lazy + 1
+        assert compliance_rows()[0][1:3] == (1, 2)
+
+
+def test_compliance_etag_tracks_vaccinations():
+    app = make_app(mode="python")
+    client = login(app)
+    first = client.get("/api/compliance")
+    assert first.json == {"countries": {"KE": [0, 1]}}
+
+    statements = []
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    cached = client.get("/api/compliance", headers={"If-None-Match": first.headers["ETag"]})
+    assert cached.status_code == 304
+    # 304 nur mit der Zählabfrage auf vaccinations, ohne Impfprofil
+    assert len(statements) == 1 and "vaccination_dates" not in statements[0]
+
+    add_vaccination(client, TODAY)
+    added = client.get("/api/compliance", headers={"If-None-Match": first.headers["ETag"]})
+    assert added.status_code == 200 and added.json == {"countries": {"KE": [1, 1]}}
+
+    with app.app_context():
+        vaccination_id = Vaccination.query.one().id
+    client.post(f"/delete_impfung/{vaccination_id}")
+    deleted = client.get("/api/compliance", headers={"If-None-Match": added.headers["ETag"]})
+    assert deleted.status_code == 200 and deleted.headers["ETag"] != added.headers["ETag"]
+
+
+def test_lazy_refresh_on_replica_route_writes_to_primary():
+    tmp = tempfile.mkdtemp()
+    primary, replica = os.path.join(tmp, "primary.db"), os.path.join(tmp, "replica.db")
+    db_routing._replica_down_until = 0.0
+    app = make_app(SQLALCHEMY_DATABASE_URI=f"sqlite:///{primary}", DB_REPLICA_URL=f"sqlite:///{replica}")
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    shutil.copy(primary, replica)  # Replica kennt Katalog und Nutzer, aber noch keine Impfung
+
+    client = login(app)
+    add_vaccination(client, TODAY)
+    with app.app_context():
+        db.session.execute(db.delete(UserCountryCompliance))  # abgelaufenes Read-Model simulieren
+        db.session.commit()
+
+    lazy = store_stats["lazy_refreshes"]
+    response = client.get("/api/compliance")
+    assert response.json == {"countries": {"KE": [1, 1]}}
+    assert store_stats["lazy_refreshes"] == lazy + 1
+    with app.app_context():
+        assert compliance_rows() == [("KE", 1, 1, TODAY + timedelta(days=360))]
+        with app.extensions[REPLICA_KEY].connect() as conn:
+            assert conn.execute(db.select(UserCountryCompliance)).all() == []
+
+
+if __name__ == "__main__":
+    test_materialized_mode_writes_read_model_with_vaccination()
+    test_other_modes_leave_read_model_alone()
+    test_catalog_import_rebuilds_read_model_in_materialized_mode()
+    test_expired_entry_is_refreshed_on_read()
+    test_catalog_change_triggers_lazy_refresh()
+    test_compliance_etag_tracks_vaccinations()
+    test_lazy_refresh_on_replica_route_writes_to_primary()
+    print("OK")
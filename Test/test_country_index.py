@@ -0,0 +1,78 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.catalog import CountryEntry
+from services.country_index import DEFAULT_LIMIT, MAX_LIMIT, CountryIndex, load_entries
+from services.names import normalize_name
+
+COUNTRIES = (
+    CountryEntry(1, "ARE", "Vereinigte Arabische Emirate", ()),
+    CountryEntry(2, "AUT", "Oesterreich", ()),
+    CountryEntry(3, "CIV", "Cote d'Ivoire", ()),
+)
+
+
+def make_index():
+    return CountryIndex(load_entries(), COUNTRIES)
+
+
+def test_normalize_name():
+    assert normalize_name("Österreich") == "oesterreich"
+    assert normalize_name("Côte d'Ivoire") == "cote-divoire"
+    assert normalize_name("Kongo (Demokratische Republik)") == "kongo"
+
+
+def test_alias_resolves_to_canonical_country():
+    index = make_index()
+    [match] = index.search("Dubai")
+    assert (match.label, match.iso_code, match.alias) == ("Vereinigte Arabische Emirate", "ARE", "Dubai")
+    # Wortanfang innerhalb des Namens
+    assert index.search("emirate")[0].label == "Vereinigte Arabische Emirate"
+    assert index.search("Elfenbein")[0].iso_code == "CIV"
+
+
+def test_umlauts_and_transcriptions():
+    index = make_index()
+    for query in ("Öst", "oest", "OESTERREICH"):
+        match = index.search(query)[0]
+        assert (match.label, match.iso_code) == ("Österreich", "AUT"), query
+    assert index.search("Öst")[0].alias is None  # kanonischer Name vor der Transkription
+    assert index.search("Cote")[0].label == "Côte d'Ivoire"
+
+
+def test_limit_and_empty_query():
+    index = make_index()
+    many = index.search("a", limit=MAX_LIMIT)
+    assert len(many) > 10
+    assert len({m.label for m in many}) == len(many)  # pro Land nur ein Treffer
+    assert index.search("a", limit=3) == many[:3]
+    assert index.search("") == [] and index.search("  (") == []
+
+
+def test_search_route_clamps_limit():
+    from app import create_app
+    from config import TestConfig
+    from extensions import db
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+
+    def results(query=""):
+        return client.get(f"/api/countries/search?q=s{query}").json["results"]
+
+    assert len(results()) == DEFAULT_LIMIT
+    assert len(results("&limit=5")) == 5
+    assert results("&limit=500") == results(f"&limit={MAX_LIMIT}")
+    assert len(results("&limit=0")) == 1
+
+
+if __name__ == "__main__":
+    test_normalize_name()
+    test_alias_resolves_to_canonical_country()
+    test_umlauts_and_transcriptions()
+    test_limit_and_empty_query()
+    test_search_route_clamps_limit()
+    print("OK")
@@ -2,10 +2,12 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from app import app
+from app import create_app
 from extensions import db
 from sqlalchemy import text
 
+app = create_app()
+
 with app.app_context():
     try:
         db.session.execute(text('SELECT 1'))
@@ -0,0 +1,157 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile
+import threading
+import time
+
+from flask import Flask
+from sqlalchemy import update
+
+import db_routing
+from db_routing import REPLICA_KEY, engine_options_from_env, init_routing, read_only, use_primary
+from extensions import db
+from models import Country
+
+# Zwei SQLite-Dateien als Primary/Replica; mit IMT_TEST_PRIMARY_URL/IMT_TEST_REPLICA_URL
+# lassen sich stattdessen zwei echte PostgreSQL-Instanzen verwenden.
+_tmp = tempfile.mkdtemp()
+PRIMARY_URL = os.getenv("IMT_TEST_PRIMARY_URL", f"sqlite:///{_tmp}/primary.db")
+REPLICA_URL = os.getenv("IMT_TEST_REPLICA_URL", f"sqlite:///{_tmp}/replica.db")
+
+
+def build_app(replica_url=REPLICA_URL):
+    db_routing._replica_down_until = 0.0
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = PRIMARY_URL
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options_from_env(PRIMARY_URL)
+    app.config["DB_REPLICA_URL"] = replica_url
+    db.init_app(app)
+    init_routing(app)
+
+    def names():
+        return ",".join(c.name for c in Country.query.order_by(Country.id))
+
+    @app.route("/read")
+    @read_only
+    def read():
+        return names()
+
+    @app.route("/read-after-write")
+    @read_only
+    def read_after_write():
+        db.session.add(Country(iso_code="NEU", name="Neu"))
+        db.session.flush()
+        result = names()
+        db.session.rollback()
+        return result
+
+    @app.route("/read-after-commit")
+    @read_only
+    def read_after_commit():
+        db.session.add(Country(iso_code="NEU", name="Neu"))
+        db.session.commit()
+        return names()
+
+    @app.route("/read-after-dml")
+    @read_only
+    def read_after_dml():
+        db.session.execute(update(Country).where(Country.iso_code == "PRI").values(name="Geändert"))
+        result = names()
+        db.session.commit()
+        return result
+
+    @app.route("/read-primary")
+    @read_only
+    def read_primary():
+        with use_primary():
+            return names()
+
+    @app.route("/write")
+    def write():
+        return names()
+
+    return app
+
+
+def seed(app):
+    """Unterschiedliche Inhalte, damit man sieht, welche Datenbank geantwortet hat."""
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.add(Country(iso_code="PRI", name="Primary"))
+        db.session.commit()
+        with app.extensions[REPLICA_KEY].begin() as conn:
+            db.metadata.drop_all(conn)
+            db.metadata.create_all(conn)
+            conn.execute(Country.__table__.insert().values(iso_code="REP", name="Replica"))
+
+
+def test_read_only_routes_use_replica():
+    app = build_app()
+    seed(app)
+    client = app.test_client()
+    assert client.get("/read").data == b"Replica"
+    assert client.get("/write").data == b"Primary"
+    # Nach einem Flush bleibt die Session auf der Primary (read-your-writes)
+    assert client.get("/read-after-write").data == b"Primary,Neu"
+    assert client.get("/read-primary").data == b"Primary"
+
+
+def test_read_your_writes_lasts_for_the_request():
+    app = build_app()
+    seed(app)
+    client = app.test_client()
+    # Auch nach dem Commit bleibt der Request auf der Primary
+    assert client.get("/read-after-commit").data == b"Primary,Neu"
+    # DML über session.execute geht an die Primary, ebenso die Lesezugriffe danach
+    assert client.get("/read-after-dml").data == "Geändert,Neu".encode()
+    # Der nächste Request liest wieder von der (unveränderten) Replica
+    assert client.get("/read").data == b"Replica"
+
+
+def test_falls_back_to_primary_when_replica_down():
+    app = build_app()
+    seed(app)
+    broken = build_app(replica_url=f"sqlite:///{_tmp}/fehlt/replica.db")
+    client = broken.test_client()
+    assert client.get("/read").data == b"Primary"
+    assert not db_routing.replica_available()
+
+
+def test_pool_records_checkout_waits():
+    os.environ["IMT_DB_POOL_SIZE"] = "1"
+    os.environ["IMT_DB_MAX_OVERFLOW"] = "0"
+    try:
+        app = build_app()
+    finally:
+        del os.environ["IMT_DB_POOL_SIZE"], os.environ["IMT_DB_MAX_OVERFLOW"]
+    seed(app)
+
+    with app.app_context():
+        engine = db.engines[None]
+        engine.pool.reset_wait_stats()
+
+    def hold_connection():
+        with engine.connect():
+            time.sleep(0.05)
+
+    threads = [threading.Thread(target=hold_connection) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = engine.pool.wait_stats()
+    assert stats["checkouts"] == 3
+    # Mit nur einer Verbindung muss mindestens ein Thread warten
+    assert stats["max_wait_ms"] >= 40
+
+
+if __name__ == "__main__":
+    test_read_only_routes_use_replica()
+    test_read_your_writes_lasts_for_the_request()
+    test_falls_back_to_primary_when_replica_down()
+    test_pool_records_checkout_waits()
+    print("OK")
@@ -0,0 +1,113 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import tempfile
+import time
+
+from crawler.http_cache import HttpCache
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.encoding = "utf-8"
+
+
+class FakeServer:
+    """Antwortet mit 304, solange der Client das aktuelle ETag mitschickt."""
+
+    def __init__(self):
+        self.pages = {}
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(dict(headers or {}))
+        etag, body = self.pages[url]
+        if (headers or {}).get("If-None-Match") == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, body, {"ETag": etag})
+
+
+def make_cache(**kwargs):
+    return HttpCache(directory=tempfile.mkdtemp(), **kwargs)
+
+
+def entry_files(cache):
+    return sorted(name for name in os.listdir(cache.directory) if name.endswith(".body"))
+
+
+def test_not_modified_serves_body_and_derived_result():
+    cache, server = make_cache(), FakeServer()
+    server.pages["https://example.com/kenia"] = ('"v1"', b"<html>Kenia</html>")
+
+    first = cache.fetch(server.get, "https://example.com/kenia")
+    assert first.status_code == 200 and not first.not_modified
+    assert cache.get_derived(first, "impfungen") is None  # frisch geladen: selbst parsen
+    cache.store_derived(first.url, "impfungen", ["Gelbfieber"])
+
+    second = cache.fetch(server.get, "https://example.com/kenia")
+    assert server.requests[-1]["If-None-Match"] == '"v1"'
+    assert second.not_modified and second.text == "<html>Kenia</html>"
+    assert cache.get_derived(second, "impfungen") == ["Gelbfieber"]
+    assert cache.stats["not_modified"] == 1 and cache.stats["parses_saved"] == 1
+    assert cache.stats["bytes_saved"] == len(b"<html>Kenia</html>")
+
+    # Neue Version beim Server: Body und Parser-Ergebnis werden nicht wiederverwendet
+    server.pages["https://example.com/kenia"] = ('"v2"', b"<html>Kenia neu</html>")
+    third = cache.fetch(server.get, "https://example.com/kenia")
+    assert not third.not_modified and third.text == "<html>Kenia neu</html>"
+    assert cache.get_derived(third, "impfungen") is None
+
+
+def test_derived_result_does_not_extend_ttl():
+    cache, server = make_cache(ttl=60), FakeServer()
+    url = "https://example.com/peru"
+    server.pages[url] = ('"v1"', b"Peru")
+    cache.fetch(server.get, url)
+
+    # Eintrag ist älter als die TTL; store_derived schreibt die .json danach neu
+    _, meta_path = cache._paths(url)
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    meta["stored_at"] = time.time() - 120
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    cache.store_derived(url, "impfungen", [])
+
+    cache.evict()
+    assert entry_files(cache) == [] and cache.stats["expired"] == 1
+
+
+def test_eviction_runs_on_threshold_and_drops_oldest_access():
+    cache, server = make_cache(max_bytes=25, evict_every=3, evict_interval=3600), FakeServer()
+    urls = [f"https://example.com/{i}" for i in range(4)]
+    for url in urls:
+        server.pages[url] = ('"v1"', b"x" * 10)
+
+    cache.fetch(server.get, urls[0])  # erstes Speichern räumt auf
+    cache.fetch(server.get, urls[1])
+    cache.fetch(server.get, urls[2])
+    # Noch kein Aufräumen: 30 Bytes liegen über max_bytes
+    assert len(entry_files(cache)) == 3 and cache.stats["evicted"] == 0
+
+    # urls[0] zuletzt benutzt, urls[1] am längsten nicht
+    now = time.time()
+    for offset, url in ((300, urls[1]), (200, urls[2]), (100, urls[0])):
+        body_path, _ = cache._paths(url)
+        os.utime(body_path, (now - offset, now - offset))
+
+    cache.fetch(server.get, urls[3])  # dritter Eintrag seit dem letzten Aufräumen
+    assert cache.stats["evicted"] == 2
+    remaining = {cache._key(url) + ".body" for url in (urls[0], urls[3])}
+    assert set(entry_files(cache)) == remaining
+
+
+if __name__ == "__main__":
+    test_not_modified_serves_body_and_derived_result()
+    test_derived_result_does_not_extend_ttl()
+    test_eviction_runs_on_threshold_and_drops_oldest_access()
+    print("OK")
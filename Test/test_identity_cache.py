@@ -0,0 +1,112 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import time
+
+from sqlalchemy import event
+
+import services.identity_cache as identity_cache
+from app import create_app, load_user
+from config import TestConfig
+from extensions import db
+from models import User
+
+
+def make_app(**overrides):
+    identity_cache.clear_identity_cache()
+    app = create_app(TestConfig)
+    app.config.update(overrides)
+    with app.app_context():
+        db.create_all()
+        user = User(first_name="Max", last_name="Mustermann", email="max@example.com")
+        user.set_password("geheim123")
+        db.session.add(user)
+        db.session.commit()
+    return app
+
+
+def count_queries(app, fn):
+    statements = []
+
+    def before(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", before)
+        try:
+            result = fn()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before)
+    return result, statements
+
+
+def test_cached_user_needs_no_query_and_stays_usable():
+    app = make_app()
+    user, statements = count_queries(app, lambda: load_user("1").email)
+    assert user == "max@example.com" and len(statements) == 1
+
+    def load_and_touch():
+        user = load_user("1")
+        # Im Cache-Objekt steht alles für Templates/Login bereit; Lazy-Loads gehen weiter
+        return user.email, user.mfa_enabled, user.is_authenticated, list(user.vaccinations)
+
+    result, statements = count_queries(app, load_and_touch)
+    assert result == ("max@example.com", False, True, [])
+    assert not any("FROM users" in s for s in statements)
+    assert identity_cache.get_identity_stats()["hits"] >= 1
+
+
+def test_account_changes_invalidate_cache():
+    app = make_app()
+    with app.app_context():
+        assert load_user("1").mfa_enabled is False
+
+    with app.app_context():
+        user = load_user("1")
+        user.mfa_enabled = True
+        user.mfa_secret = "JBSWY3DPEHPK3PXP"
+        db.session.commit()
+
+    with app.app_context():
+        assert load_user("1").mfa_enabled is True
+
+    with app.app_context():
+        db.session.delete(db.session.get(User, 1))
+        db.session.commit()
+    with app.app_context():
+        assert load_user("1") is None
+
+
+def test_verify_rate_measures_staleness():
+    app = make_app(IDENTITY_CACHE_VERIFY_RATE=1.0)
+    with app.app_context():
+        load_user("1")
+        # Änderung an der ORM-Schicht vorbei, wie sie ein anderer Worker sähe
+        db.session.execute(db.text("UPDATE users SET first_name = 'Moritz' WHERE id = 1"))
+        db.session.commit()
+    with app.app_context():
+        assert load_user("1").first_name == "Moritz"
+    stats = identity_cache.get_identity_stats()
+    assert stats["verified"] >= 1 and stats["stale_hits"] >= 1
+
+
+def test_expired_entry_counts_as_one_miss():
+    app = make_app(IDENTITY_CACHE_TTL=0.05)
+    identity_cache.identity_stats.update(dict.fromkeys(identity_cache.identity_stats, 0))
+    with app.app_context():
+        load_user("1")  # miss
+        load_user("1")  # hit
+        time.sleep(0.06)
+        load_user("1")  # abgelaufen -> miss
+    stats = identity_cache.get_identity_stats()
+    assert (stats["hits"], stats["misses"], stats["expired"]) == (1, 2, 1)
+    assert stats["hit_rate"] == round(1 / 3, 4)
+
+
+if __name__ == "__main__":
+    test_cached_user_needs_no_query_and_stays_usable()
+    test_account_changes_invalidate_cache()
+    test_verify_rate_measures_staleness()
+    test_expired_entry_counts_as_one_miss()
+    print("OK")
@@ -0,0 +1,57 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from crawler.illness_matcher import IllnessMatcher, extract_doses, extract_validity_months, normalize_text
+
+matcher = IllnessMatcher.from_sources(include_db=False)
+
+
+def illnesses(text):
+    return [e.illness for e in matcher.extract(text)]
+
+
+def test_short_name_needs_word_end():
+    assert illnesses("Nachweis einer Impfung gegen Hepatitis auch für Kinder.") == []
+    assert illnesses("Impfung gegen Hepatitis bei Langzeitaufenthalten.") == []
+    assert illnesses("Impfung gegen Hepatitis A und Hepatitis B.") == ["Hepatitis A", "Hepatitis B"]
+
+
+def test_compounds_and_genitive_still_match():
+    assert illnesses("Eine Gelbfieberimpfung ist Pflicht.") == ["Gelbfieber"]
+    assert illnesses("Tetanusschutz sollte aktuell sein.") == ["Tetanus"]
+    assert illnesses("Nachweis des Gelbfiebers.") == ["Gelbfieber"]
+    assert illnesses("Der Nachweis einer Polio-Impfung wird verlangt.") == ["Poliomyelitis (Kinderlähmung)"]
+
+
+def test_area_suffix_is_not_an_illness():
+    assert illnesses("Bei Einreise aus einem Gelbfiebergebiet wird ein Nachweis verlangt.") == []
+    assert illnesses("Reisende aus Gelbfieberinfektionsgebieten benötigen eine Gelbfieberimpfung.") == ["Gelbfieber"]
+
+
+def test_doses_and_validity():
+    assert extract_doses(normalize_text("Es werden zwei Impfdosen verlangt.")) == 2
+    assert extract_doses(normalize_text("Eine dreimalige Impfung.")) == 3
+    assert extract_validity_months(normalize_text("innerhalb von 12 Monaten")) == 12
+    assert extract_validity_months(normalize_text("nicht älter als zehn Jahre")) == 120
+    assert extract_validity_months(normalize_text("Impfung gegen Masern.")) is None
+
+    (extraction,) = matcher.extract("Zwei Impfdosen gegen Tollwut innerhalb der letzten 3 Jahre.")
+    assert (extraction.illness, extraction.required_doses, extraction.validity_period_months) == ("Tollwut", 2, 36)
+
+
+def test_validity_carries_over_from_previous_sentence():
+    result = matcher.extract("Impfung gegen Tetanus und Diphtherie. Auffrischimpfung nach zehn Jahren.")
+    assert {e.illness: e.validity_period_months for e in result} == {"Tetanus": 120, "Diphtherie": 120}
+    # Ein neuer Krankheitsname beendet die Übernahme
+    result = matcher.extract("Impfung gegen Masern. Cholera innerhalb von 6 Monaten.")
+    assert {e.illness: e.validity_period_months for e in result} == {"Masern": None, "Cholera": 6}
+
+
+if __name__ == "__main__":
+    test_short_name_needs_word_end()
+    test_compounds_and_genitive_still_match()
+    test_area_suffix_is_not_an_illness()
+    test_doses_and_validity()
+    test_validity_carries_over_from_previous_sentence()
+    print("OK")
@@ -0,0 +1,93 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import logging
+import tempfile
+
+from crawler.illness_matcher import IllnessMatcher, load_illness_names
+from crawler.illness_resolver import IllnessResolver, _same_qualifier, confirm
+
+NAMES = load_illness_names(include_db=False)
+
+
+def make_resolver(**kwargs):
+    return IllnessResolver(NAMES, **kwargs)
+
+
+def test_typos_resolve_to_catalog_names():
+    resolver = make_resolver()
+    result = resolver.resolve("Dengueieber")
+    assert (result.illness, result.alias, result.source) == ("Denguefieber", "denguefieber", "auto")
+    assert result.confidence >= resolver.min_confidence
+    assert resolver.resolve("Gelbfiber").illness == "Gelbfieber"
+    # Zweiter Aufruf kommt aus der Nachschlagetabelle
+    resolver.resolve("dengueieber")
+    assert resolver.stats["cache_hits"] == 1
+
+
+def test_short_qualifier_must_match_exactly():
+    assert not _same_qualifier("hepatitis c", "hepatitis a")
+    assert not _same_qualifier("hepatitis a", "hepatitis b")
+    assert _same_qualifier("hepatitis b", "hepatitis b")
+    assert _same_qualifier("gelbfiber", "gelbfieber")
+
+    resolver = make_resolver()
+    assert resolver.resolve("Hepatitis C").illness is None
+    assert resolver.resolve("Hepatits B").illness == "Hepatitis B"
+
+
+def test_near_miss_is_logged_once(caplog):
+    resolver = make_resolver()
+    with caplog.at_level(logging.WARNING, logger="crawler.illness_resolver"):
+        assert resolver.resolve("Pocken").illness is None
+        resolver.resolve("Pocken")
+    assert resolver.unresolved["pocken"]["count"] == 2
+    assert resolver.unresolved["pocken"]["best"] == "Varizellen (Windpocken)"
+    assert len([r for r in caplog.records if "pocken" in r.getMessage()]) == 1
+    # Völlig fremde Tokens landen nicht im Review-Protokoll
+    assert resolver.resolve("Sonnenbrand").illness is None
+    assert "sonnenbrand" not in resolver.unresolved
+
+
+def test_confirmed_entry_overrides_auto_resolution():
+    tmp = tempfile.mkdtemp()
+    lookup_file = os.path.join(tmp, "illness_lookup.json")
+    unresolved_file = os.path.join(tmp, "unresolved_illnesses.json")
+
+    resolver = make_resolver()
+    assert resolver.resolve("Pocken").illness is None
+    assert resolver.resolve("Gelbfiber").illness == "Gelbfieber"
+    resolver.save(lookup_file, unresolved_file)
+
+    confirm("Pocken", "Varizellen (Windpocken)", lookup_file, unresolved_file)
+    confirm("Gelbfiber", "Denguefieber", lookup_file, unresolved_file)  # kuratiert schlägt automatisch
+    with open(unresolved_file, encoding="utf-8") as f:
+        assert "pocken" not in json.load(f)
+
+    with open(lookup_file, encoding="utf-8") as f:
+        reloaded = make_resolver(lookup=json.load(f))
+    pocken, gelbfiber = reloaded.resolve("Pocken"), reloaded.resolve("gelbfiber")
+    assert (pocken.illness, pocken.source) == ("Varizellen (Windpocken)", "curated")
+    assert (gelbfiber.illness, gelbfiber.source) == ("Denguefieber", "curated")
+
+
+def test_resolve_unmatched_skips_exact_matches():
+    matcher, resolver = IllnessMatcher(NAMES), make_resolver()
+    sentence = "eine gelbfieberimpfung und eine dengueieberimpfung."
+    matches = matcher.find(sentence, normalized=True)
+    assert [m.illness for m in matches] == ["Gelbfieber"]
+
+    assert resolver.resolve_unmatched(sentence, matches) == ["Denguefieber"]
+    # Nur "dengueieber" wurde nachgeschlagen, "gelbfieber" war schon exakt gefunden
+    assert resolver.stats["lookups"] == 1
+    assert [e.illness for e in matcher.extract(sentence, resolver=resolver)] == ["Gelbfieber", "Denguefieber"]
+
+
+if __name__ == "__main__":
+    test_typos_resolve_to_catalog_names()
+    test_short_qualifier_must_match_exactly()
+    test_confirmed_entry_overrides_auto_resolution()
+    test_resolve_unmatched_skips_exact_matches()
+    print("OK")
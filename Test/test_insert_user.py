@@ -4,7 +4,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from models import User
 from extensions import db
-from app import app
+from app import create_app
 
 # Beispiel-Daten
 first_name = "Max"
@@ -13,6 +13,8 @@ username = "testuser"
 email = "testuser@example.com"
 password = "geheim123"
 
+app = create_app()
+
 with app.app_context():
     # Prüfen, ob der Benutzer schon existiert
     existing_user = User.query.filter_by(email=email).first()
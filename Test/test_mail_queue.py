@@ -0,0 +1,166 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import socket
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import create_app
+from config import TestConfig
+from extensions import db
+from models import OutboundMail
+from services.mail_queue import SmtpConnection, process_batch
+
+# Lokaler SMTP-Server für die Tests; nicht Teil von requirements.txt
+Controller = pytest.importorskip("aiosmtpd.controller").Controller
+
+
+class RecordingHandler:
+    """Lokaler SMTP-Server: zählt Verbindungen, nimmt Mails an oder lehnt sie (mit reject_reply) ab."""
+
+    def __init__(self, reject_reply="451 Bitte später erneut versuchen"):
+        self.messages = []
+        self.sessions = 0
+        self.reject_next = 0
+        self.reject_reply = reject_reply
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.reject_next:
+            self.reject_next -= 1
+            return self.reject_reply
+        self.messages.append(envelope.content.decode("utf-8", "replace"))
+        return "250 OK"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def make_app(port):
+    app = create_app(TestConfig)
+    app.config.update(
+        MAIL_SMTP_HOST="127.0.0.1",
+        MAIL_SMTP_PORT=port,
+        MAIL_SMTP_STARTTLS=False,
+        MAIL_BATCH_SIZE=10,
+        MAIL_BACKOFF_SECONDS=30,
+    )
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def post_contact(app, n):
+    client = app.test_client()
+    for i in range(n):
+        response = client.post("/contact", data={
+            "vorname": "Max", "name": f"Mustermann {i}", "email": "max@example.com", "message": "Hallo",
+        })
+        assert response.status_code == 302
+
+
+def test_contact_form_is_queued_and_sent_over_one_connection():
+    handler = RecordingHandler()
+    port = free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        app = make_app(port)
+        post_contact(app, 5)
+        assert handler.messages == []  # der Request selbst spricht nie mit dem Server
+
+        with app.app_context():
+            connection = SmtpConnection.from_config(app.config)
+            result = process_batch(connection)
+            connection.close()
+            assert result == {"sent": 5, "retried": 0, "deferred": 0, "failed": 0}
+            assert {m.status for m in OutboundMail.query.all()} == {"sent"}
+
+        assert len(handler.messages) == 5 and handler.sessions == 1
+        assert "Mustermann 3" in "".join(handler.messages)
+    finally:
+        controller.stop()
+
+
+def test_failed_delivery_is_retried_with_backoff():
+    handler = RecordingHandler()
+    handler.reject_next = 1
+    port = free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        app = make_app(port)
+        post_contact(app, 1)
+
+        with app.app_context():
+            connection = SmtpConnection.from_config(app.config)
+            now = datetime.utcnow()
+            assert process_batch(connection, now)["retried"] == 1
+            mail = OutboundMail.query.one()
+            assert mail.status == "pending" and mail.attempts == 1
+            assert mail.next_attempt_at >= now + timedelta(seconds=30)
+
+            # Vor Ablauf des Backoffs passiert nichts, danach wird zugestellt
+            assert process_batch(connection, now + timedelta(seconds=5))["sent"] == 0
+            assert process_batch(connection, now + timedelta(seconds=60))["sent"] == 1
+            connection.close()
+        assert len(handler.messages) == 1
+    finally:
+        controller.stop()
+
+
+def test_permanent_rejection_fails_only_that_mail():
+    handler = RecordingHandler(reject_reply="550 Postfach existiert nicht")
+    handler.reject_next = 1
+    port = free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        app = make_app(port)
+        post_contact(app, 3)
+
+        with app.app_context():
+            connection = SmtpConnection.from_config(app.config)
+            result = process_batch(connection)
+            # Die Verbindung bleibt nach der Ablehnung offen und wird weiterverwendet
+            assert connection.server is not None
+            connection.close()
+            assert result == {"sent": 2, "retried": 0, "deferred": 0, "failed": 1}
+            mails = OutboundMail.query.order_by(OutboundMail.id).all()
+            assert [m.status for m in mails] == ["failed", "sent", "sent"]
+            assert [m.attempts for m in mails] == [1, 1, 1]
+            assert "550" in mails[0].last_error
+
+        assert len(handler.messages) == 2 and handler.sessions == 1
+    finally:
+        controller.stop()
+
+
+def test_unreachable_server_reschedules_whole_batch():
+    app = make_app(free_port())  # dort lauscht niemand
+    post_contact(app, 3)
+    with app.app_context():
+        result = process_batch(SmtpConnection.from_config(app.config))
+        # Nur die erste Mail wurde versucht, der Rest ohne Versuch zurückgestellt
+        assert result == {"sent": 0, "retried": 1, "deferred": 2, "failed": 0}
+        mails = OutboundMail.query.order_by(OutboundMail.id).all()
+        assert [m.attempts for m in mails] == [1, 0, 0]
+        assert mails[0].last_error and not mails[1].last_error
+        assert {m.next_attempt_at for m in mails} == {mails[0].next_attempt_at}
+
+
+if __name__ == "__main__":
+    test_contact_form_is_queued_and_sent_over_one_connection()
+    test_failed_delivery_is_retried_with_backoff()
+    test_permanent_rejection_fails_only_that_mail()
+    test_unreachable_server_reschedules_whole_batch()
+    print("OK")
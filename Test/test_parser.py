@@ -0,0 +1,59 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from crawler.CrawlerImpfdaten import (
+    SectionNotFound, _slice_impfschutz_section, parse_recommendations, parse_recommendations_fast,
+)
+
+PAGE = """<html><body><main><div class="c-rte">
+<h2>Sicherheit</h2><p>Allgemeine Lage.</p>
+<h2>Gesundheit</h2>
+<h3>Aktuelles</h3><p>Keine Hinweise.</p>
+<h3>Impfschutz</h3>
+<p>Alle Reisenden müssen eine Gelbfieberimpfung nachweisen.</p>
+<div><h3>Hinweis</h3><p>Der Nachweis einer Polio-Impfung wird verlangt.</p></div>
+<ul><li>Als Reiseimpfungen werden Impfungen gegen Hepatitis A und Tollwut empfohlen.</li></ul>
+<h3>Malaria</h3><p>Einen Nachweis müssen Sie nicht erbringen.</p>
+</div></main></body></html>"""
+
+
+def assert_same(html):
+    # Der schnelle Parser muss den Abschnitt selbst ausschneiden, nicht zurückfallen
+    assert _slice_impfschutz_section(html) is not None
+    assert parse_recommendations_fast(html) == parse_recommendations(html)
+
+
+def test_nested_heading_belongs_to_section():
+    assert_same(PAGE)
+    voraussetzungen, empfehlungen = parse_recommendations_fast(PAGE)
+    assert "Polio-Impfung" in voraussetzungen and "Malaria" not in voraussetzungen
+    assert empfehlungen.startswith("Als Reiseimpfungen")
+
+
+def test_uppercase_tags():
+    assert_same(PAGE.replace("<h2>Gesundheit</h2>", '<H2 id="content_4">Gesundheit</H2>')
+                    .replace("<h3>Impfschutz</h3>", "<H3>Impfschutz</H3>")
+                    .replace("<h3>Malaria</h3>", "<H3>Malaria</H3>"))
+
+
+def test_section_ends_with_parent():
+    assert_same(PAGE.replace("<h3>Malaria</h3>", "</div><div><h3>Malaria</h3>"))
+
+
+def test_keywords_stay_case_sensitive():
+    html = PAGE.replace("<h3>Impfschutz</h3>", "<h3>IMPFSCHUTZ</h3>")
+    assert _slice_impfschutz_section(html) is None
+    for parser in (parse_recommendations, parse_recommendations_fast):
+        with pytest.raises(SectionNotFound):
+            parser(html)
+
+
+if __name__ == "__main__":
+    test_nested_heading_belongs_to_section()
+    test_uppercase_tags()
+    test_section_ends_with_parent()
+    test_keywords_stay_case_sensitive()
+    print("OK")
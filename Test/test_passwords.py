@@ -0,0 +1,75 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import threading
+
+import services.passwords as passwords
+from app import create_app
+from config import TestConfig
+from extensions import db
+from models import User
+
+
+def make_app():
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        user = User(first_name="Max", last_name="Mustermann", email="max@example.com")
+        user.set_password("geheim123")
+        db.session.add(user)
+        db.session.commit()
+    return app
+
+
+def stored_hash(app):
+    with app.app_context():
+        return User.query.filter_by(email="max@example.com").one().password_hash
+
+
+def test_outdated_hash_is_upgraded_on_login():
+    passwords._pool = None
+    app = make_app()
+    assert stored_hash(app).startswith("pbkdf2:sha256:1000$")
+
+    app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:2000"
+    response = app.test_client().post("/login", data={"email": "max@example.com", "password": "geheim123"})
+    assert response.status_code == 302
+    assert stored_hash(app).startswith("pbkdf2:sha256:2000$")
+
+    # Falsches Passwort: kein Login, Hash bleibt
+    before = stored_hash(app)
+    app.test_client().post("/login", data={"email": "max@example.com", "password": "falsch"})
+    assert stored_hash(app) == before
+
+
+def test_saturated_pool_answers_503():
+    app = make_app()
+    app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:200000"
+    with app.app_context():
+        user = User.query.one()
+        user.set_password("geheim123")
+        db.session.commit()
+
+    passwords._pool = passwords._VerifierPool(workers=1, queue=0, timeout=10)
+    responses = []
+
+    def login():
+        responses.append(app.test_client().post("/login", data={"email": "max@example.com", "password": "geheim123"}))
+
+    threads = [threading.Thread(target=login) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    passwords._pool = None
+
+    codes = sorted(r.status_code for r in responses)
+    assert 302 in codes and 503 in codes
+    assert all(r.headers.get("Retry-After") for r in responses if r.status_code == 503)
+
+
+if __name__ == "__main__":
+    test_outdated_hash_is_upgraded_on_login()
+    test_saturated_pool_answers_503()
+    print("OK")
@@ -0,0 +1,112 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload
+
+from app import create_app
+from config import TestConfig
+from extensions import db
+from models import Illness, User, Vaccination, VaccinationDate, Vaccine
+from services.profiles import BATCH_SIZE, build_illness_profile, build_illness_profiles
+
+USERS = BATCH_SIZE + 200  # mehr als ein IN-Batch
+
+
+def reference_profile(user_id: int) -> dict:
+    """Bisherige ORM-Variante aus routes/main.py (_build_user_illness_profile)."""
+    vaccinations = (
+        Vaccination.query
+        .filter_by(user_id=user_id)
+        .options(
+            joinedload(Vaccination.vaccine).joinedload(Vaccine.illness),
+            joinedload(Vaccination.dates)
+        )
+        .all()
+    )
+
+    profile = {}
+    for v in vaccinations:
+        if not v.vaccine:
+            continue
+        illness_id = v.vaccine.illness_id
+        if illness_id is None:
+            continue
+        entry = profile.setdefault(illness_id, {"dose_count": 0, "last_dose_date": None})
+        for d in (v.dates or []):
+            entry["dose_count"] += 1
+            if entry["last_dose_date"] is None or d.date > entry["last_dose_date"]:
+                entry["last_dose_date"] = d.date
+    return profile
+
+
+def make_app(seed=3):
+    rnd = random.Random(seed)
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        db.session.execute(insert(Illness), [{"id": i, "name": f"Krankheit {i}"} for i in range(1, 9)])
+        # Mehrere Impfstoffe pro Krankheit, damit pro illness_id über Impfungen summiert wird
+        db.session.execute(insert(Vaccine), [
+            {"id": v, "name": f"Impfstoff {v}", "manufacturer": "Test", "illness_id": (v - 1) % 8 + 1}
+            for v in range(1, 17)
+        ])
+        db.session.execute(insert(User), [
+            {"id": u, "first_name": "Test", "last_name": str(u), "email": f"user{u}@example.com", "password_hash": "x"}
+            for u in range(1, USERS + 1)
+        ])
+
+        vaccinations, dates = [], []
+        for user_id in range(1, USERS + 1):
+            if user_id % 10 == 0:
+                continue  # Nutzer ohne Impfungen
+            for _ in range(rnd.randint(1, 4)):
+                vaccination_id = len(vaccinations) + 1
+                vaccinations.append({"id": vaccination_id, "user_id": user_id,
+                                     "vaccine_id": rnd.randint(1, 16), "status": "erledigt"})
+                # Nutzer 7 hat Impfungen, aber keinen einzigen Termin
+                for _ in range(0 if user_id == 7 else rnd.randint(0, 3)):
+                    dates.append({"vaccination_id": vaccination_id,
+                                  "date": date(2020, 1, 1) + timedelta(days=rnd.randint(0, 2000))})
+        db.session.execute(insert(Vaccination), vaccinations)
+        db.session.execute(insert(VaccinationDate), dates)
+        db.session.commit()
+    return app
+
+
+def test_single_profile_matches_orm():
+    app = make_app()
+    with app.app_context():
+        for user_id in list(range(1, 60)) + [USERS]:
+            assert build_illness_profile(user_id) == reference_profile(user_id)
+
+
+def test_user_without_dates():
+    app = make_app()
+    with app.app_context():
+        profile = build_illness_profile(7)
+        assert profile and profile == reference_profile(7)
+        assert all(entry == {"dose_count": 0, "last_dose_date": None} for entry in profile.values())
+        assert build_illness_profile(10) == {} == reference_profile(10)
+
+
+def test_batch_over_many_chunks_matches_orm():
+    app = make_app()
+    with app.app_context():
+        user_ids = list(range(USERS, 0, -1)) + [5, USERS + 1]  # Duplikat und unbekannte id
+        profiles = build_illness_profiles(user_ids)
+        assert list(profiles) == list(dict.fromkeys(user_ids))
+        assert profiles[USERS + 1] == {}
+        for user_id in range(1, USERS + 1):
+            assert profiles[user_id] == reference_profile(user_id), user_id
+
+
+if __name__ == "__main__":
+    test_single_profile_matches_orm()
+    test_user_without_dates()
+    test_batch_over_many_chunks_matches_orm()
+    print("OK")
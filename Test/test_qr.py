@@ -0,0 +1,58 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+
+import services.qr as qr
+from app import create_app
+from config import TestConfig
+from extensions import db
+from models import User
+
+URI = "otpauth://totp/ImmunTrack:max%40example.com?secret=JBSWY3DPEHPK3PXP&issuer=ImmunTrack"
+
+
+def test_png_matches_matrix():
+    from PIL import Image
+
+    matrix = qr.qr_matrix(URI)
+    img = Image.open(io.BytesIO(qr.render_qr(URI, "png")))
+    box = qr.PNG_BOX_SIZE
+    assert img.size == (len(matrix) * box, len(matrix) * box)
+    for y, row in enumerate(matrix):
+        for x, cell in enumerate(row):
+            assert (img.getpixel((x * box, y * box)) == 0) == cell
+
+
+def test_setup_page_links_cached_qr_image():
+    qr.clear_qr_cache()
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        user = User(first_name="Max", last_name="Mustermann", email="max@example.com")
+        user.set_password("geheim123")
+        db.session.add(user)
+        db.session.commit()
+
+    client = app.test_client()
+    client.post("/login", data={"email": "max@example.com", "password": "geheim123"})
+    page = client.get("/mfa/setup")
+    assert b"/mfa/qr.svg" in page.data and b"base64" not in page.data
+
+    first = client.get("/mfa/qr.svg")
+    assert first.status_code == 200 and first.mimetype == "image/svg+xml"
+    assert first.headers["Cache-Control"].startswith("private")
+    assert client.get("/mfa/qr.svg").data == first.data
+    assert qr.qr_stats["hits"] >= 1
+
+    revalidated = client.get("/mfa/qr.svg", headers={"If-None-Match": first.headers["ETag"]})
+    assert revalidated.status_code == 304
+    assert client.get("/mfa/qr.png").mimetype == "image/png"
+    assert client.get("/mfa/qr.gif").status_code == 404
+
+
+if __name__ == "__main__":
+    test_png_matches_matrix()
+    test_setup_page_links_cached_qr_image()
+    print("OK")
@@ -0,0 +1,56 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event
+
+from app import create_app
+from config import TestConfig
+from extensions import db
+from services.rate_limit import Limit, MemoryBackend
+
+
+def test_bucket_refills_over_time():
+    backend = MemoryBackend()
+    limit = Limit.parse("2/10")
+    assert backend.consume("k", limit, now=0).allowed
+    assert backend.consume("k", limit, now=0).allowed
+    rejected = backend.consume("k", limit, now=1)
+    assert not rejected.allowed and rejected.retry_after == 4.0
+    assert backend.consume("k", limit, now=5).allowed
+
+
+def test_memory_backend_is_bounded():
+    backend = MemoryBackend(max_keys=100)
+    for i in range(1000):
+        backend.consume(f"ip:{i}", Limit(5, 60), now=i)
+    assert len(backend.buckets) == 100
+    assert "ip:999" in backend.buckets and "ip:0" not in backend.buckets
+
+
+def test_login_rejected_before_db_access():
+    app = create_app(TestConfig)
+    app.config["RATE_LIMIT_LOGIN_ACCOUNT"] = "3/300"
+    statements = []
+    with app.app_context():
+        db.create_all()
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    client = app.test_client()
+    for _ in range(3):
+        assert client.post("/login", data={"email": "max@example.com", "password": "x"}).status_code == 302
+    queries = len(statements)
+
+    response = client.post("/login", data={"email": "MAX@example.com ", "password": "x"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+    assert len(statements) == queries
+    # Anderes Konto von derselben IP ist weiterhin erlaubt
+    assert client.post("/login", data={"email": "erika@example.com", "password": "x"}).status_code == 302
+
+
+if __name__ == "__main__":
+    test_bucket_refills_over_time()
+    test_memory_backend_is_bounded()
+    test_login_rejected_before_db_access()
+    print("OK")
@@ -0,0 +1,121 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import csv
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from app import create_app
+from config import TestConfig
+from crawler import recrawl_scheduler
+from crawler.catalog_loader import RequirementRecord, load_catalog
+from crawler.illness_matcher import IllnessMatcher
+from crawler.recrawl_scheduler import BASE_INTERVAL, RecrawlScheduler
+from extensions import db
+from models import Country, Illness, VaccinationRequirement
+from services.catalog import _query_version
+
+NOW = datetime(2026, 10, 1, 12, 0)
+TEXTS = {}  # bezeichnung -> Impfschutz-Text, Standard "Gelbfieber verlangt."
+
+
+class FakeEngine:
+    def map(self, fn, items):
+        return [fn(item) for item in items]
+
+
+def fake_crawl(row, engine, cache):
+    text = TEXTS.get(row["bezeichnung"], "Gelbfieber verlangt.")
+    return [row["landid"], row["bezeichnung"], text, "Keine", row["generierter_link"]]
+
+
+@contextmanager
+def make_scheduler(names=("Kenia", "Peru", "Chile")):
+    original = recrawl_scheduler.crawl_country
+    recrawl_scheduler.crawl_country = fake_crawl
+    TEXTS.clear()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            links = os.path.join(tmp, "links.csv")
+            with open(links, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["landid", "bezeichnung", "generierter_link"])
+                for i, name in enumerate(names, 1):
+                    writer.writerow([i, name, f"https://example.org/{name}"])
+            yield RecrawlScheduler(links_csv=links, details_csv=os.path.join(tmp, "details.csv"),
+                                   state_file=os.path.join(tmp, "state.json"), engine=FakeEngine(), rebuild_every=2,
+                                   matcher=IllnessMatcher(["Gelbfieber", "Tollwut"]))
+    finally:
+        recrawl_scheduler.crawl_country = original
+
+
+def make_app():
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        load_catalog(["Gelbfieber"], ["Kenia", "Peru"],
+                     [RequirementRecord("Kenia", "Gelbfieber"), RequirementRecord("Peru", "Gelbfieber")],
+                     {"kenia": "KE", "peru": "PE"})
+    return app
+
+
+def test_unchanged_recrawl_keeps_catalog_version():
+    app = make_app()
+    with app.app_context(), make_scheduler() as scheduler:
+        last_set_before = [r.crawl_last_set for r in VaccinationRequirement.query.order_by(VaccinationRequirement.id)]
+        later = datetime.utcnow() + BASE_INTERVAL + timedelta(days=1)
+
+        succeeded, changed, _ = scheduler.tick(10, later)
+        assert len(succeeded) == 2 and len(changed) == 2
+        version = _query_version()
+
+        # Gleicher Inhalt eine Woche später: gecrawlt, aber weder DB noch Katalog-Version ändern sich
+        succeeded, changed, _ = scheduler.tick(10, later + BASE_INTERVAL)
+        assert len(succeeded) == 2 and changed == []
+        assert _query_version() == version
+        assert [r.crawl_last_set for r in VaccinationRequirement.query.order_by(VaccinationRequirement.id)] == last_set_before
+        assert scheduler.state["kenia"]["last_crawled"] == (later + BASE_INTERVAL).isoformat()
+
+
+def test_changed_text_is_imported():
+    app = make_app()
+    with app.app_context(), make_scheduler() as scheduler:
+        later = datetime.utcnow() + BASE_INTERVAL + timedelta(days=1)
+        scheduler.tick(10, later)
+        version = _query_version()
+
+        TEXTS["Kenia"] = "Eine Tollwutimpfung wird verlangt."
+        succeeded, changed, _ = scheduler.tick(10, later + BASE_INTERVAL)
+        assert [row[1] for row in changed] == ["Kenia"]
+        requirements = {
+            (r.country.name, r.illness.name)
+            for r in VaccinationRequirement.query.join(Country).join(Illness)
+        }
+        # Kenia verliert Gelbfieber, Peru bleibt unverändert
+        assert requirements == {("Kenia", "Tollwut"), ("Peru", "Gelbfieber")}
+        assert _query_version() != version
+
+
+def test_new_country_is_scheduled_after_rebuild():
+    app = make_app()
+    with app.app_context(), make_scheduler() as scheduler:
+        later = datetime.utcnow() + BASE_INTERVAL + timedelta(days=1)
+        scheduler.tick(10, later)
+
+        db.session.add(Country(name="Chile", iso_code="CL"))
+        db.session.commit()
+
+        succeeded, _, _ = scheduler.tick(10, later + timedelta(minutes=10))
+        assert succeeded == []  # Warteschlange noch nicht neu aufgebaut
+        succeeded, _, _ = scheduler.tick(10, later + timedelta(minutes=20))
+        chile = Country.query.filter_by(name="Chile").one()
+        assert succeeded == [chile.id]
+
+
+if __name__ == "__main__":
+    test_unchanged_recrawl_keeps_catalog_version()
+    test_changed_text_is_imported()
+    test_new_country_is_scheduled_after_rebuild()
+    print("OK")
@@ -0,0 +1,81 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import flash
+from sqlalchemy import event
+
+import services.catalog as catalog
+from app import create_app
+from config import TestConfig
+from extensions import db
+from models import Country, Illness, VaccinationRequirement
+from services.response_cache import response_cache_stats
+from services.template_cache import template_stats
+
+
+def make_app():
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        germany = Country(iso_code="DE", name="Deutschland")
+        measles = Illness(name="Masern")
+        db.session.add_all([germany, measles])
+        db.session.flush()
+        db.session.add(VaccinationRequirement(country_id=germany.id, illness_id=measles.id, required_doses=2))
+        db.session.commit()
+    return app
+
+
+def test_public_page_served_from_cache_with_etag_and_gzip():
+    app = make_app()
+    client = app.test_client()
+
+    first = client.get("/about")
+    assert first.status_code == 200 and first.headers["ETag"]
+    renders = template_stats["info/navigation-bar/about.html"]["renders"]
+
+    second = client.get("/about", headers={"Accept-Encoding": "gzip"})
+    assert second.headers.get("Content-Encoding") == "gzip"
+    assert template_stats["info/navigation-bar/about.html"]["renders"] == renders  # kein Jinja
+
+    not_modified = client.get("/about", headers={"If-None-Match": first.headers["ETag"]})
+    assert not_modified.status_code == 304 and not_modified.data == b""
+
+
+def test_pending_flash_bypasses_cache():
+    app = make_app()
+
+    @app.route("/flash-then-about")
+    def flash_then_about():
+        flash("Nachricht erfolgreich gesendet!", "success")
+        return "ok"
+
+    client = app.test_client()
+    client.get("/about")
+    client.get("/flash-then-about")
+    bypassed = response_cache_stats["bypassed"]
+    assert b"Nachricht erfolgreich gesendet!" in client.get("/about").data
+    assert response_cache_stats["bypassed"] == bypassed + 1
+    assert b"Nachricht erfolgreich gesendet!" not in client.get("/about").data
+
+
+def test_requirements_page_needs_no_query_until_catalog_changes():
+    app = make_app()
+    app.config["CATALOG_VERSION_CHECK_SECONDS"] = 3600
+    catalog.invalidate_catalog()
+    client = app.test_client()
+    assert b"Masern" in client.get("/impfrequirements").data
+
+    statements = []
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert b"Masern" in client.get("/impfrequirements").data
+    assert statements == []
+
+
+if __name__ == "__main__":
+    test_public_page_served_from_cache_with_etag_and_gzip()
+    test_pending_flash_bypasses_cache()
+    test_requirements_page_needs_no_query_until_catalog_changes()
+    print("OK")
@@ -1,20 +1,22 @@
+"""
+Lädt die Impfungen A–Z vom RKI und übernimmt sie als Krankheiten in einem Batch.
+Zum vollständigen Katalog-Import siehe crawler/catalog_loader.py.
+"""
 import requests
-from bs4 import BeautifulSoup
-from app import app, db
-from models import Impfung  # Passe ggf. den Modellnamen an
+
+from app import create_app
+from crawler.catalog_loader import after_catalog_load, load_catalog
+from crawler.http_cache import HttpCache
+from crawler.rki_crawler import parse_vaccine_tiles
 
 URL = "https://www.rki.de/DE/A-Z/impfungen-a-z-node.html"
-response = requests.get(URL)
-soup = BeautifulSoup(response.text, "html.parser")
 
-impfungen = set()
-for link in soup.select("ul.azliste li a"):
-    name = link.get_text(strip=True)
-    impfungen.add(name)
+cache = HttpCache()
+response = cache.fetch(requests.get, URL)
+response.raise_for_status()
+names = [name for _, name in parse_vaccine_tiles(response.content) or []]
 
-with app.app_context():
-    for name in impfungen:
-        if not Impfung.query.filter_by(name=name).first():
-            db.session.add(Impfung(name=name))
-    db.session.commit()
-print("Fertig!")
\ No newline at end of file
+with create_app().app_context():
+    report = load_catalog(names, [], [])
+    after_catalog_load(report)
+print(f"Fertig! Krankheiten: {report['illnesses']}, Impfstoffe: {report['vaccines']}")
@@ -1,143 +1,287 @@
+import argparse
 import csv
-import requests
+import os
+import sys
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin
 import re
-import time
- 
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import requests
+
+from crawler.crawl_engine import CrawlEngine
+from crawler.http_cache import HttpCache
+
 # --- Konfiguration ---
-INPUT_CSV = './laender_links.csv' 
-OUTPUT_CSV = './laender_impf_details.csv'
+CRAWLER_DIR = os.path.dirname(os.path.abspath(__file__))
+INPUT_CSV = os.path.join(CRAWLER_DIR, 'laender_links.csv')
+OUTPUT_CSV = os.path.join(CRAWLER_DIR, 'laender_impf_details.csv')
 BASE_URL = 'https://www.auswaertiges-amt.de'
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-}
+# Schlüssel für das geparste Ergebnis im HTTP-Cache; bei Änderungen am Parser erhöhen
+PARSER_CACHE_KEY = 'recommendations-v12'
+
+
+# Texte, die kein erfolgreiches Crawl-Ergebnis sind (siehe extract_recommendations / crawl_country)
+ERROR_PREFIXES = ("Fehler", "Netzwerkfehler", "Allgemeiner Parsing-Fehler", "Abschnitt", "Kein Text")
+
+
+def is_crawl_error(voraussetzungen: str) -> bool:
+    return (voraussetzungen or "").startswith(ERROR_PREFIXES)
 
-def extract_recommendations(security_url):
+
+class SectionNotFound(Exception):
+    """Erwarteter Abschnitt fehlt auf der Seite; die Nachricht landet in der CSV."""
+
+
+def extract_recommendations(security_url, engine, cache=None, parser='fast'):
     """
-    NEUE LOGIK (V11):
-    Sammelt den Text als ganzen Block, *bevor* er in Sätze aufgeteilt
-    und analysiert wird. Behebt das Problem mit getrennten Wörtern.
-    Sucht jetzt auch flexibler nach "nachweis" (statt "nachweisen").
+    Lädt die Sicherheitsseite über die gemeinsame Crawl-Engine (Session-Pool,
+    Rate-Limit pro Host) und wertet den Abschnitt 'Impfschutz' aus.
+    Mit `cache` wird per Conditional GET geladen; bei 304 entfällt das Parsen.
+    `parser` wählt zwischen 'fast' (nur Gesundheitsabschnitt) und 'full' (ganzer Baum).
     """
     try:
-        response = requests.get(security_url, headers=HEADERS, timeout=10)
+        if cache is None:
+            response = engine.get(security_url)
+        else:
+            response = cache.fetch(engine.get, security_url)
         if response.status_code != 200:
             return f"Fehler: Status-Code {response.status_code}", "", security_url
-        
-        soup_security = BeautifulSoup(response.text, 'lxml')
-        
-        # 1. Finde <h2>Gesundheit</h2>
-        h2_gesundheit = soup_security.find('h2', string=re.compile(r'Gesundheit'))
-        if not h2_gesundheit:
-            h2_gesundheit = soup_security.find('h2', id='content_4')
-            if not h2_gesundheit:
-                 return "Abschnitt 'Gesundheit' (h2) nicht gefunden", "", security_url
-        
-        # 2. Finde <h3>Impfschutz</h3> direkt danach
-        h3_impfschutz = h2_gesundheit.find_next('h3', string=re.compile(r'Impfschutz'))
-        if not h3_impfschutz:
-            return "Abschnitt 'Impfschutz' (h3) nicht gefunden", "", security_url
-
-        # 3. Sammle alle Textblöcke (aus <p>, <ul> und <div>) bis zum nächsten <h3>
-        text_blocks = []
-        for sibling in h3_impfschutz.next_siblings:
-            # Stoppe bei der nächsten Überschrift
-            if sibling.name == 'h3' or sibling.name == 'h2':
-                break
-            
-            # Sammle Text aus allen relevanten Tags
-            if sibling.name in ['p', 'ul', 'ol', 'div']:
-                # separator=' ' sorgt dafür, dass Wörter aus Links/Listen
-                # mit Leerzeichen verbunden werden, nicht aneinander kleben.
-                raw_text = sibling.get_text(separator=' ', strip=True)
-                text_blocks.append(raw_text)
-
-        if not text_blocks:
-            return "Kein Text unter 'Impfschutz' gefunden.", "", security_url
-
-        # 4. Kombiniere alle Blöcke zu einem einzigen Text
-        full_text = " ".join(text_blocks)
-        
-        # 5. Spalte den Text in Sätze auf (an Punkten oder Listenpunkten '•')
-        # Wir fügen die Trennzeichen temporär hinzu, um sie nicht zu verlieren
-        full_text = re.sub(r'([.•])', r'\1##SPLIT##', full_text)
-        sentences = full_text.split('##SPLIT##')
-
-        # 6. Analysiere die Sätze
-        voraussetzungen_saetze = []
-        empfehlungen_saetze = []
-
-        for sentence in sentences:
-            sentence_clean = sentence.strip()
-            if not sentence_clean:
-                continue
-                
-            sentence_lower = sentence_clean.lower()
-            
-            # --- KORRIGIERTE LOGIK ---
-            # Logik 1: Voraussetzungen (sucht jetzt nach "nachweis")
-            if "müssen" in sentence_lower or "nachweis" in sentence_lower:
-                voraussetzungen_saetze.append(sentence_clean)
-                
-            # Logik 2: Empfehlungen
-            if sentence_lower.startswith("als reiseimpfungen werden impfungen gegen") and "empfohlen" in sentence_lower:
-                empfehlungen_saetze.append(sentence_clean)
-
-        # 7. Formatiere den Output-Text
-        voraussetzungen_str = " ".join(voraussetzungen_saetze) if voraussetzungen_saetze else "Keine Angaben"
-        empfehlungen_str = " ".join(empfehlungen_saetze) if empfehlungen_saetze else "Keine Angaben"
 
+        cached = cache.get_derived(response, PARSER_CACHE_KEY) if cache else None
+        if cached is not None:
+            voraussetzungen_str, empfehlungen_str = cached
+            return voraussetzungen_str, empfehlungen_str, security_url
+
+        voraussetzungen_str, empfehlungen_str = PARSERS[parser](response.text)
+        if cache:
+            cache.store_derived(security_url, PARSER_CACHE_KEY, [voraussetzungen_str, empfehlungen_str])
         return voraussetzungen_str, empfehlungen_str, security_url
-        
+
+    except SectionNotFound as e:
+        return str(e), "", security_url
     except requests.exceptions.RequestException as e:
         return f"Netzwerkfehler: {e}", "", security_url
     except Exception as e:
         return f"Allgemeiner Parsing-Fehler: {e}", "", security_url
 
-# --- Hauptskript ---
-results = []
 
-try:
+def parse_recommendations(html):
+    """
+    NEUE LOGIK (V11):
+    Sammelt den Text als ganzen Block, *bevor* er in Sätze aufgeteilt
+    und analysiert wird. Behebt das Problem mit getrennten Wörtern.
+    Sucht jetzt auch flexibler nach "nachweis" (statt "nachweisen").
+    """
+    soup_security = BeautifulSoup(html, 'lxml')
+
+    # 1. Finde <h2>Gesundheit</h2>
+    h2_gesundheit = soup_security.find('h2', string=re.compile(r'Gesundheit'))
+    if not h2_gesundheit:
+        h2_gesundheit = soup_security.find('h2', id='content_4')
+        if not h2_gesundheit:
+            raise SectionNotFound("Abschnitt 'Gesundheit' (h2) nicht gefunden")
+
+    # 2. Finde <h3>Impfschutz</h3> direkt danach
+    h3_impfschutz = h2_gesundheit.find_next('h3', string=re.compile(r'Impfschutz'))
+    if not h3_impfschutz:
+        raise SectionNotFound("Abschnitt 'Impfschutz' (h3) nicht gefunden")
+
+    # 3. Sammle alle Textblöcke (aus <p>, <ul> und <div>) bis zum nächsten <h3>
+    text_blocks = []
+    for sibling in h3_impfschutz.next_siblings:
+        # Stoppe bei der nächsten Überschrift
+        if sibling.name == 'h3' or sibling.name == 'h2':
+            break
+
+        # Sammle Text aus allen relevanten Tags
+        if sibling.name in ['p', 'ul', 'ol', 'div']:
+            # separator=' ' sorgt dafür, dass Wörter aus Links/Listen
+            # mit Leerzeichen verbunden werden, nicht aneinander kleben.
+            raw_text = sibling.get_text(separator=' ', strip=True)
+            text_blocks.append(raw_text)
+
+    if not text_blocks:
+        raise SectionNotFound("Kein Text unter 'Impfschutz' gefunden.")
+
+    # 4. Kombiniere alle Blöcke zu einem einzigen Text
+    full_text = " ".join(text_blocks)
+
+    # 5. Spalte den Text in Sätze auf (an Punkten oder Listenpunkten '•')
+    # Wir fügen die Trennzeichen temporär hinzu, um sie nicht zu verlieren
+    full_text = re.sub(r'([.•])', r'\1##SPLIT##', full_text)
+    sentences = full_text.split('##SPLIT##')
+
+    # 6. Analysiere die Sätze
+    voraussetzungen_saetze = []
+    empfehlungen_saetze = []
+
+    for sentence in sentences:
+        sentence_clean = sentence.strip()
+        if not sentence_clean:
+            continue
+
+        sentence_lower = sentence_clean.lower()
+
+        # --- KORRIGIERTE LOGIK ---
+        # Logik 1: Voraussetzungen (sucht jetzt nach "nachweis")
+        if "müssen" in sentence_lower or "nachweis" in sentence_lower:
+            voraussetzungen_saetze.append(sentence_clean)
+
+        # Logik 2: Empfehlungen
+        if sentence_lower.startswith("als reiseimpfungen werden impfungen gegen") and "empfohlen" in sentence_lower:
+            empfehlungen_saetze.append(sentence_clean)
+
+    # 7. Formatiere den Output-Text
+    voraussetzungen_str = " ".join(voraussetzungen_saetze) if voraussetzungen_saetze else "Keine Angaben"
+    empfehlungen_str = " ".join(empfehlungen_saetze) if empfehlungen_saetze else "Keine Angaben"
+
+    return voraussetzungen_str, empfehlungen_str
+
+
+# --- Schneller Parser: nur der Abschnitt 'Impfschutz' wird zum Baum ---
+
+# Erste h2 bzw. h3, deren Inhalt das Stichwort enthält (egal mit welchem Markup).
+# Tag-Namen ohne Beachtung der Groß-/Kleinschreibung (lxml normalisiert sie auch),
+# die Stichwörter wie im vollständigen Parser mit.
+_H2_GESUNDHEIT_RE = re.compile(r'(?i:<h2\b)[^>]*>((?:(?!(?i:</h2)).)*?Gesundheit(?:(?!(?i:</h2)).)*)(?i:</h2)\s*>', re.S)
+_H3_IMPFSCHUTZ_RE = re.compile(r'(?i:<h3\b)[^>]*>((?:(?!(?i:</h3)).)*?Impfschutz(?:(?!(?i:</h3)).)*)(?i:</h3)\s*>', re.S)
+# Überschriften und Container, deren Verschachtelung beim Ausschneiden mitgezählt wird
+_SECTION_TAG_RE = re.compile(r'<(/?)(h2|h3|div|section|article|main|aside|body|td|ul|ol)\b[^>]*>', re.IGNORECASE)
+_SENTENCE_RE = re.compile(r'[^.•]*[.•]|[^.•]+')
+
+
+def _slice_impfschutz_section(html):
+    """
+    Schneidet <h3>Impfschutz</h3> plus seine Geschwister aus dem Roh-HTML – mit
+    denselben Regeln wie parse_recommendations: Schluss ist bei der nächsten h2/h3
+    auf Geschwisterebene oder wenn das Elternelement der h3 geschlossen wird.
+    Überschriften innerhalb eines Geschwisters (z.B. <div><h3>…</h3></div>) gehören
+    zu dessen Text. None, wenn die Überschriften fehlen oder verschachteltes Markup
+    enthalten – dann entscheidet der vollständige Parser (inkl. Fallback auf id="content_4").
+    """
+    h2 = _H2_GESUNDHEIT_RE.search(html)
+    if not h2 or '<' in h2.group(1):
+        return None
+    h3 = _H3_IMPFSCHUTZ_RE.search(html, h2.end())
+    if not h3 or '<' in h3.group(1):
+        return None
+
+    end = len(html)
+    depth = 0
+    for tag in _SECTION_TAG_RE.finditer(html, h3.end()):
+        closing, name = tag.group(1), tag.group(2).lower()
+        if name in ('h2', 'h3'):
+            if depth == 0 and not closing:
+                end = tag.start()
+                break
+            continue
+        depth += -1 if closing else 1
+        if depth < 0:
+            end = tag.start()
+            break
+    return html[h3.start():end]
+
+
+def parse_recommendations_fast(html):
+    """
+    Wie parse_recommendations, baut aber nur den Impfschutz-Abschnitt als Baum
+    auf und teilt die Sätze per finditer statt über einen ##SPLIT##-Marker.
+    Lässt sich der Abschnitt nicht eindeutig ausschneiden, wird auf den
+    vollständigen Parser zurückgefallen.
+    """
+    section = _slice_impfschutz_section(html)
+    if section is None:
+        return parse_recommendations(html)
+
+    fragment = BeautifulSoup(section, 'lxml')
+    h3_impfschutz = fragment.find('h3')
+    text_blocks = [
+        sibling.get_text(separator=' ', strip=True)
+        for sibling in h3_impfschutz.next_siblings
+        if sibling.name in ('p', 'ul', 'ol', 'div')
+    ]
+    if not text_blocks:
+        raise SectionNotFound("Kein Text unter 'Impfschutz' gefunden.")
+
+    voraussetzungen_saetze = []
+    empfehlungen_saetze = []
+    for match in _SENTENCE_RE.finditer(" ".join(text_blocks)):
+        sentence_clean = match.group().strip()
+        if not sentence_clean:
+            continue
+        sentence_lower = sentence_clean.lower()
+        if "müssen" in sentence_lower or "nachweis" in sentence_lower:
+            voraussetzungen_saetze.append(sentence_clean)
+        if sentence_lower.startswith("als reiseimpfungen werden impfungen gegen") and "empfohlen" in sentence_lower:
+            empfehlungen_saetze.append(sentence_clean)
+
+    voraussetzungen_str = " ".join(voraussetzungen_saetze) if voraussetzungen_saetze else "Keine Angaben"
+    empfehlungen_str = " ".join(empfehlungen_saetze) if empfehlungen_saetze else "Keine Angaben"
+    return voraussetzungen_str, empfehlungen_str
+
+
+PARSERS = {
+    'full': parse_recommendations,
+    'fast': parse_recommendations_fast,
+}
+
+
+def build_security_url(overview_url):
+    # URL-Logik (V7)
+    last_slash_index = overview_url.rfind('/')
+    page_id = overview_url[last_slash_index+1:]
+    base_node_url = overview_url[:last_slash_index]
+    slug = base_node_url.split('/')[-1].replace('-node', '')
+    return f"{base_node_url}/{slug}sicherheit/{page_id}"
+
+
+def crawl_country(row, engine, cache=None, parser='fast'):
+    landid = row['landid']
+    bezeichnung = row['bezeichnung']
+    overview_url = row['generierter_link']
+
+    try:
+        security_url = build_security_url(overview_url)
+        # Funktionsaufruf erwartet jetzt zwei Info-Strings
+        voraussetzungen, empfehlungen, final_url = extract_recommendations(security_url, engine, cache, parser)
+    except Exception as e:
+        voraussetzungen = f"Fehler beim Erstellen der URL: {e}"
+        empfehlungen = "" # Zweites Feld bleibt leer
+        final_url = overview_url
+
+    return [landid, bezeichnung, voraussetzungen, empfehlungen, final_url]
+
+
+def crawl_all(countries, workers=8, per_host_concurrency=4, per_host_rate=5.0, cache=None, parser='fast'):
+    """Crawlt alle Länder parallel; liefert (Ergebniszeilen, Statistik)."""
+    engine = CrawlEngine(workers=workers, per_host_concurrency=per_host_concurrency, per_host_rate=per_host_rate)
+    try:
+        results = engine.map(lambda row: crawl_country(row, engine, cache, parser), countries)
+    finally:
+        engine.close()
+    return results, engine.stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Impfschutz-Abschnitte aller Länderseiten des Auswärtigen Amts crawlen.")
+    parser.add_argument('--limit', type=int, default=None, help="Nur die ersten N Länder (Default: alle)")
+    parser.add_argument('--workers', type=int, default=8, help="Anzahl Worker-Threads")
+    parser.add_argument('--per-host', type=int, default=4, help="Max. gleichzeitige Requests pro Host")
+    parser.add_argument('--rate', type=float, default=5.0, help="Max. Requests pro Sekunde und Host")
+    parser.add_argument('--no-cache', action='store_true', help="HTTP-Cache (ETag/Last-Modified) nicht verwenden")
+    parser.add_argument('--parser', choices=sorted(PARSERS), default='fast', help="HTML-Parser-Modus")
+    args = parser.parse_args(argv)
+
     with open(INPUT_CSV, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         countries = list(reader)
-        
-    total_countries = len(countries)
-
-    for i, row in enumerate(countries):
-        # Begrenzung auf 5 Einträge, wie gewünscht
-        if i >= 5:
-            break 
-            
-        landid = row['landid']
-        bezeichnung = row['bezeichnung']
-        overview_url = row['generierter_link']
-        
-        voraussetzungen = ""
-        empfehlungen = ""
-        security_url = "" 
-        
-        try:
-            # URL-Logik (V7)
-            last_slash_index = overview_url.rfind('/')
-            page_id = overview_url[last_slash_index+1:]
-            base_node_url = overview_url[:last_slash_index] 
-            slug = base_node_url.split('/')[-1].replace('-node', '')
-            security_url = f"{base_node_url}/{slug}sicherheit/{page_id}"
-            
-            # Funktionsaufruf erwartet jetzt zwei Info-Strings
-            voraussetzungen, empfehlungen, final_url = extract_recommendations(security_url)
-            
-        except Exception as e:
-            voraussetzungen = f"Fehler beim Erstellen der URL: {e}"
-            empfehlungen = "" # Zweites Feld bleibt leer
-            final_url = overview_url
-        
-        # Füge die neuen Spalten zum Ergebnis hinzu
-        results.append([landid, bezeichnung, voraussetzungen, empfehlungen, final_url])
-        
-        time.sleep(0.5)
+
+    if args.limit is not None:
+        countries = countries[:args.limit]
+
+    cache = None if args.no_cache else HttpCache()
+    results, stats = crawl_all(countries, args.workers, args.per_host, args.rate, cache, args.parser)
 
     # Schreibe alle Ergebnisse in die neue CSV-Datei
     with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as f:
@@ -145,8 +289,12 @@ try:
         # Header-Spalten angepasst
         writer.writerow(['landid', 'bezeichnung', 'impf_voraussetzungen', 'impf_empfehlungen', 'quelle_url'])
         writer.writerows(results)
-        
-except FileNotFoundError:
-    pass # Keine Ausgabe
-except Exception as e:
-    pass # Keine Ausgabe
\ No newline at end of file
+
+    print(stats.format())
+    if cache:
+        print(cache.format_stats())
+
+
+# --- Hauptskript ---
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+"""
+Bulk-Import der Crawler-Ergebnisse in Illness/Vaccine/Country/VaccinationRequirement.
+
+Eingaben sind impfstoffe.csv, laender_links.csv und laender_impf_details.csv
+(oder dieselben Daten im Speicher). Pro Tabelle wird der Bestand mit einer
+einzigen Abfrage gelesen, in Python verglichen und anschließend nur das
+Geänderte in großen Batches per INSERT ... ON CONFLICT geschrieben – alles in
+einer Transaktion. Der Bericht enthält inserted/updated/unchanged pro Tabelle.
+Gab es Änderungen, wird in derselben Transaktion catalog_revision erhöht – das
+geht in die Datenversion des Katalog-Snapshots ein (services/catalog.py).
+
+    python crawler/catalog_loader.py
+    python crawler/catalog_loader.py --iso-csv laender_iso.csv --dry-run
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import delete, select, tuple_
+
+from crawler.CrawlerImpfdaten import is_crawl_error
+from services.names import normalize_name
+from crawler.illness_matcher import IllnessMatcher
+from crawler.illness_resolver import IllnessResolver
+from extensions import db
+from models import CatalogRevision, Country, Illness, VaccinationRequirement, Vaccine
+
+CRAWLER_DIR = os.path.dirname(os.path.abspath(__file__))
+ILLNESSES_CSV = os.path.join(CRAWLER_DIR, 'impfstoffe.csv')
+COUNTRIES_CSV = os.path.join(CRAWLER_DIR, 'laender_links.csv')
+DETAILS_CSV = os.path.join(CRAWLER_DIR, 'laender_impf_details.csv')
+
+BATCH_SIZE = 1000
+DEFAULT_MANUFACTURER = 'Unbekannt'
+
+
+class RequirementRecord(NamedTuple):
+    country_name: str
+    illness_name: str
+    required_doses: int = 1
+    validity_period_months: Optional[int] = None
+
+
+# =====================================================
+# Eingaben lesen
+# =====================================================
+
+def _read_csv(path):
+    with open(path, encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def read_illness_names(path=ILLNESSES_CSV):
+    return [row['name'].strip() for row in _read_csv(path) if row.get('name', '').strip()]
+
+
+def read_country_names(path=COUNTRIES_CSV):
+    return [row['bezeichnung'].strip() for row in _read_csv(path) if row.get('bezeichnung', '').strip()]
+
+
+def read_country_texts(path=DETAILS_CSV):
+    """bezeichnung -> impf_voraussetzungen (nur Pflicht-Nachweise werden zu Requirements)."""
+    return {row['bezeichnung'].strip(): row['impf_voraussetzungen'] for row in _read_csv(path)}
+
+
+def crawled_countries(country_texts):
+    """Länder, deren Seite erfolgreich gecrawlt wurde – auch wenn der Text keine Pflichtimpfung nennt."""
+    return [name for name, text in country_texts.items() if not is_crawl_error(text)]
+
+
+def read_iso_codes(path):
+    """Optionale Zuordnung bezeichnung -> ISO-Code (Spalten: bezeichnung, iso_code)."""
+    return {normalize_name(row['bezeichnung']): row['iso_code'].strip().upper() for row in _read_csv(path)}
+
+
+def derive_requirements(country_texts, illness_names, matcher=None, resolver=None):
+    """
+    Erkennt Krankheiten samt Dosen und Gültigkeit in den Voraussetzungstexten
+    (siehe crawler/illness_matcher.py). Der Automat wird einmal gebaut; mit
+    `resolver` werden auch Tippfehler aufgelöst (crawler/illness_resolver.py).
+    """
+    matcher = matcher or IllnessMatcher(illness_names)
+    records = []
+    for country_name, text in country_texts.items():
+        if is_crawl_error(text):
+            continue
+        for extraction in matcher.extract(text, resolver=resolver):
+            records.append(RequirementRecord(
+                country_name,
+                extraction.illness,
+                extraction.required_doses,
+                extraction.validity_period_months,
+            ))
+    return records
+
+
+# =====================================================
+# Schreiben
+# =====================================================
+
+def _dialect_insert(model):
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise RuntimeError(f"INSERT ... ON CONFLICT wird für {dialect} nicht unterstützt")
+    return insert(model)
+
+
+def _batches(rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        yield rows[start:start + BATCH_SIZE]
+
+
+def _counts():
+    return {'inserted': 0, 'updated': 0, 'unchanged': 0}
+
+
+def _load_illnesses(names, report):
+    existing = dict(db.session.execute(select(Illness.name, Illness.id)).all())
+    new = sorted({n for n in names if n not in existing})
+    report['unchanged'] = len(set(names)) - len(new)
+    for batch in _batches([{'name': n} for n in new]):
+        db.session.execute(_dialect_insert(Illness).values(batch).on_conflict_do_nothing(index_elements=['name']))
+    report['inserted'] = len(new)
+    return dict(db.session.execute(select(Illness.name, Illness.id)).all())
+
+
+def _load_vaccines(illness_ids, report):
+    """Ein generischer Impfstoff pro Krankheit, damit Nutzer sie erfassen können."""
+    covered = set(db.session.execute(select(Vaccine.illness_id).distinct()).scalars())
+    missing = [
+        {'name': name, 'manufacturer': DEFAULT_MANUFACTURER, 'illness_id': illness_id}
+        for name, illness_id in sorted(illness_ids.items())
+        if illness_id not in covered
+    ]
+    for batch in _batches(missing):
+        db.session.execute(_dialect_insert(Vaccine).values(batch))
+    report['inserted'] = len(missing)
+    report['unchanged'] = len(illness_ids) - len(missing)
+
+
+def _load_countries(names, iso_codes, report):
+    """Ordnet Namen bestehenden Ländern zu; neue Länder brauchen einen ISO-Code."""
+    existing = {
+        normalize_name(name): (country_id, iso_code)
+        for country_id, name, iso_code in db.session.execute(select(Country.id, Country.name, Country.iso_code)).all()
+    }
+    known_iso = {iso_code for _, iso_code in existing.values()}
+
+    rows, skipped = [], []
+    unique = {normalize_name(name): name for name in reversed(names)}
+    for key, name in unique.items():
+        if key in existing:
+            report['unchanged'] += 1
+            continue
+        iso_code = iso_codes.get(key)
+        if not iso_code or iso_code in known_iso:
+            skipped.append(name)
+            continue
+        rows.append({'name': name, 'iso_code': iso_code})
+        known_iso.add(iso_code)
+
+    for batch in _batches(rows):
+        db.session.execute(_dialect_insert(Country).values(batch).on_conflict_do_nothing(index_elements=['iso_code']))
+    report['inserted'] = len(rows)
+    report['skipped'] = len(skipped)
+
+    return {
+        normalize_name(name): country_id
+        for country_id, name in db.session.execute(select(Country.id, Country.name)).all()
+    }, skipped
+
+
+def _load_requirements(records, country_ids, illness_ids, crawled_country_ids, report):
+    """Upsert; mit `crawled_country_ids` entfallen dort nicht mehr genannte Anforderungen."""
+    req = VaccinationRequirement
+    existing = {
+        (country_id, illness_id): (doses, validity)
+        for country_id, illness_id, doses, validity in db.session.execute(
+            select(req.country_id, req.illness_id, req.required_doses, req.validity_period_months)
+        ).all()
+    }
+
+    now = datetime.utcnow()
+    wanted = {}
+    for record in records:
+        country_id = country_ids.get(normalize_name(record.country_name))
+        illness_id = illness_ids.get(record.illness_name)
+        if country_id is None or illness_id is None:
+            continue
+        wanted[(country_id, illness_id)] = (record.required_doses, record.validity_period_months)
+
+    upserts = []
+    for key, values in wanted.items():
+        if key not in existing:
+            report['inserted'] += 1
+        elif existing[key] != values:
+            report['updated'] += 1
+        else:
+            report['unchanged'] += 1
+            continue
+        upserts.append({
+            'country_id': key[0],
+            'illness_id': key[1],
+            'required_doses': values[0],
+            'validity_period_months': values[1],
+            'crawl_last_set': now,
+        })
+
+    for batch in _batches(upserts):
+        stmt = _dialect_insert(req).values(batch)
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=['country_id', 'illness_id'],
+            set_={
+                'required_doses': stmt.excluded.required_doses,
+                'validity_period_months': stmt.excluded.validity_period_months,
+                'crawl_last_set': stmt.excluded.crawl_last_set,
+            },
+        ))
+
+    # Für gecrawlte Länder sind die neuen Daten maßgeblich: nicht mehr genannte Anforderungen entfallen
+    obsolete = [key for key in existing if key[0] in crawled_country_ids and key not in wanted]
+    for batch in _batches(obsolete):
+        db.session.execute(delete(req).where(tuple_(req.country_id, req.illness_id).in_(batch)))
+    report['deleted'] = len(obsolete)
+
+
+def _catalog_changed(report):
+    return any(
+        counts.get('inserted') or counts.get('updated') or counts.get('deleted')
+        for counts in report.values() if isinstance(counts, dict)
+    )
+
+
+def _bump_revision():
+    stmt = _dialect_insert(CatalogRevision).values(id=1, revision=1, updated_at=datetime.utcnow())
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=['id'],
+        set_={'revision': CatalogRevision.revision + 1, 'updated_at': stmt.excluded.updated_at},
+    ))
+
+
+def load_catalog(illness_names, country_names, requirements, iso_codes=None, dry_run=False,
+                 crawled=(), delete_obsolete=False):
+    """
+    Schreibt alles in einer Transaktion; liefert den Bericht pro Tabelle
+    plus 'db_seconds' und die Liste übersprungener Länder (ohne ISO-Code).
+
+    Standard ist reines Upsert (z.B. manuelle Einzeleinträge). Mit
+    `delete_obsolete=True` ersetzen die Daten der Länder in `crawled` (Namen
+    erfolgreich gecrawlter Seiten, siehe `crawled_countries`) deren Bestand
+    vollständig – auch wenn ein Land keine Anforderungen mehr hat.
+    """
+    iso_codes = iso_codes or {}
+    report = {
+        'illnesses': _counts(),
+        'vaccines': _counts(),
+        'countries': _counts(),
+        'requirements': _counts(),
+    }
+    start = time.perf_counter()
+    try:
+        illness_ids = _load_illnesses(illness_names, report['illnesses'])
+        _load_vaccines(illness_ids, report['vaccines'])
+        country_ids, skipped = _load_countries(country_names, iso_codes, report['countries'])
+        crawled_ids = set()
+        if delete_obsolete:
+            crawled_ids = {country_ids[key] for key in map(normalize_name, crawled) if key in country_ids}
+        _load_requirements(requirements, country_ids, illness_ids, crawled_ids, report['requirements'])
+        if _catalog_changed(report):
+            _bump_revision()
+
+        if dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    report['db_seconds'] = round(time.perf_counter() - start, 4)
+    report['skipped_countries'] = skipped
+    return report
+
+
+def after_catalog_load(report):
+    """
+    Caches nach einem Import mit Änderungen aktualisieren; das Read-Model
+    user_country_compliance nur im Modus "materialized", die anderen lesen es nicht.
+    """
+    from flask import current_app
+    from services.catalog import invalidate_catalog
+    from services.compliance_store import refresh_all_user_compliance
+
+    changed = _catalog_changed(report)
+    if changed:
+        invalidate_catalog()
+        if current_app.config.get("COMPLIANCE_MODE", "python") == "materialized":
+            refresh_all_user_compliance()
+    return changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawler-Ergebnisse in die Katalogtabellen laden.")
+    parser.add_argument('--iso-csv', help="CSV mit bezeichnung,iso_code für noch unbekannte Länder")
+    parser.add_argument('--dry-run', action='store_true', help="Nur zählen, nichts schreiben")
+    args = parser.parse_args(argv)
+
+    from app import create_app
+
+    illness_names = read_illness_names()
+    country_names = read_country_names()
+    iso_codes = read_iso_codes(args.iso_csv) if args.iso_csv else {}
+
+    with create_app().app_context():
+        resolver = IllnessResolver.from_sources()
+        country_texts = read_country_texts()
+        requirements = derive_requirements(country_texts, illness_names, resolver=resolver)
+        resolver.save()
+        report = load_catalog(illness_names, country_names, requirements, iso_codes, dry_run=args.dry_run,
+                              crawled=crawled_countries(country_texts), delete_obsolete=True)
+        if not args.dry_run:
+            after_catalog_load(report)
+
+    for table in ('illnesses', 'vaccines', 'countries', 'requirements'):
+        counts = ", ".join(f"{k}={v}" for k, v in report[table].items())
+        print(f"{table:>13}: {counts}")
+    print(f"DB-Zeit: {report['db_seconds']} s")
+    if report['skipped_countries']:
+        print(f"{len(report['skipped_countries'])} Länder ohne ISO-Code übersprungen (--iso-csv).")
+    if resolver.unresolved:
+        print(f"{len(resolver.unresolved)} Krankheitsnamen nicht aufgelöst (crawler/illness_resolver.py unresolved).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Nebenläufige Crawl-Engine mit Connection-Pooling und Rate-Limit pro Host.
+
+Alle Worker-Threads teilen sich eine requests.Session (Keep-Alive, gepoolte
+Verbindungen). Pro Host begrenzen ein Semaphore die gleichzeitigen Requests
+und ein Mindestabstand zwischen zwei Requests die Rate – damit bleibt der
+Crawler auch bei vielen Threads höflich gegenüber der Quelle.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+class HostLimiter:
+    """Max. `concurrency` gleichzeitige Requests und höchstens `rate` Requests/s je Host."""
+
+    def __init__(self, concurrency=4, rate=5.0):
+        self.concurrency = concurrency
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_slot = {}
+
+    def _semaphore(self, host):
+        with self._lock:
+            sem = self._semaphores.get(host)
+            if sem is None:
+                sem = self._semaphores[host] = threading.BoundedSemaphore(self.concurrency)
+            return sem
+
+    def acquire(self, host):
+        self._semaphore(host).acquire()
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def release(self, host):
+        self._semaphores[host].release()
+
+
+class CrawlStats:
+    """Seiten, Fehler und Latenzen eines Crawl-Laufs (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.finished = None
+        self.pages = 0
+        self.errors = 0
+        self.bytes = 0
+        self.latencies = []
+
+    def record(self, latency, size=0, error=False):
+        with self._lock:
+            self.pages += 1
+            self.bytes += size
+            self.latencies.append(latency)
+            if error:
+                self.errors += 1
+
+    def stop(self):
+        self.finished = time.monotonic()
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.monotonic()) - self.started
+
+    def percentile(self, p):
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        idx = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+        return ordered[idx]
+
+    def summary(self):
+        elapsed = self.elapsed
+        return {
+            "pages": self.pages,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "elapsed_s": round(elapsed, 2),
+            "pages_per_s": round(self.pages / elapsed, 2) if elapsed else 0.0,
+            "latency_p50_ms": round(self.percentile(50) * 1000, 1),
+            "latency_p90_ms": round(self.percentile(90) * 1000, 1),
+            "latency_p99_ms": round(self.percentile(99) * 1000, 1),
+        }
+
+    def format(self):
+        s = self.summary()
+        return (
+            f"{s['pages']} Seiten in {s['elapsed_s']} s ({s['pages_per_s']} Seiten/s), "
+            f"{s['errors']} Fehler, Latenz p50/p90/p99: "
+            f"{s['latency_p50_ms']}/{s['latency_p90_ms']}/{s['latency_p99_ms']} ms"
+        )
+
+
+def make_session(pool_size=8, retries=2, headers=None):
+    """Session mit gepoolten Keep-Alive-Verbindungen und Retry bei 429/5xx."""
+    session = requests.Session()
+    session.headers.update(headers or DEFAULT_HEADERS)
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class CrawlEngine:
+    """
+    engine = CrawlEngine(workers=8, per_host_concurrency=4, per_host_rate=5)
+    results = engine.map(lambda url: parse(engine.get(url)), urls)
+    print(engine.stats.format())
+    """
+
+    def __init__(self, workers=8, per_host_concurrency=4, per_host_rate=5.0, timeout=10, session=None):
+        self.workers = workers
+        self.timeout = timeout
+        self.limiter = HostLimiter(per_host_concurrency, per_host_rate)
+        self.session = session or make_session(pool_size=max(workers, per_host_concurrency))
+        self.stats = CrawlStats()
+
+    def get(self, url, **kwargs):
+        host = urlsplit(url).netloc
+        kwargs.setdefault("timeout", self.timeout)
+        self.limiter.acquire(host)
+        start = time.monotonic()
+        try:
+            response = self.session.get(url, **kwargs)
+        except requests.exceptions.RequestException:
+            self.stats.record(time.monotonic() - start, error=True)
+            raise
+        finally:
+            self.limiter.release(host)
+        self.stats.record(
+            time.monotonic() - start,
+            size=len(response.content),
+            error=response.status_code >= 400,
+        )
+        return response
+
+    def map(self, func, items):
+        """Wendet `func` parallel auf alle Elemente an; Ergebnisreihenfolge bleibt erhalten."""
+        self.stats = CrawlStats()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            results = list(pool.map(func, items))
+        self.stats.stop()
+        return results
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,230 @@
+"""
+HTTP-Cache auf der Festplatte für die Crawler (Conditional GET).
+
+Gespeichert werden Body und Validatoren (ETag / Last-Modified) pro URL. Beim
+nächsten Abruf sendet der Cache If-None-Match / If-Modified-Since; bei 304
+kommt der Body von der Platte und – falls vorhanden – auch das bereits
+geparste Ergebnis, sodass der Aufrufer gar nicht erst parsen muss.
+Einträge verfallen nach `ttl` Sekunden ab dem Speichern, der Cache ist auf
+`max_bytes` begrenzt (älteste Zugriffe fliegen zuerst). Aufgeräumt wird nicht bei
+jedem Speichern, sondern nach `evict_every` neuen Einträgen oder spätestens alle
+`evict_interval` Sekunden.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.http_cache')
+DEFAULT_TTL = 14 * 24 * 3600
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+DEFAULT_EVICT_EVERY = 100
+DEFAULT_EVICT_INTERVAL = 300
+
+
+class CachedResponse:
+    """Minimaler Ersatz für requests.Response, egal ob frisch geladen oder aus dem Cache."""
+
+    def __init__(self, url, status_code, content, encoding='utf-8', not_modified=False, derived=None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding or 'utf-8'
+        self.not_modified = not_modified
+        self.derived = derived
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors='replace')
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} für {self.url}")
+
+
+class HttpCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES,
+                 evict_every=DEFAULT_EVICT_EVERY, evict_interval=DEFAULT_EVICT_INTERVAL):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self.evict_interval = evict_interval
+        self._lock = threading.Lock()
+        self._stores_since_evict = 0
+        self._last_evict = None  # erstes Speichern räumt Reste früherer Läufe auf
+        self.stats = {
+            "requests": 0,
+            "not_modified": 0,    # 304 – Body kam von der Platte
+            "stored": 0,
+            "bytes_saved": 0,     # nicht erneut übertragene Bytes
+            "parses_saved": 0,    # Parser-Ergebnis aus dem Cache übernommen
+            "expired": 0,
+            "evicted": 0,
+        }
+        os.makedirs(directory, exist_ok=True)
+
+    # --- Dateiablage ---
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _paths(self, url):
+        base = os.path.join(self.directory, self._key(url))
+        return base + '.body', base + '.json'
+
+    def _load_meta(self, url):
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if time.time() - meta.get('stored_at', 0) > self.ttl or not os.path.exists(body_path):
+            self._remove_key(self._key(url))
+            self._count("expired")
+            return None
+        return meta
+
+    def _write_atomic(self, path, data, mode='wb'):
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    # --- Öffentliche API ---
+
+    def fetch(self, get, url, **kwargs):
+        """
+        `get` ist z.B. `requests.get`, `session.get` oder `CrawlEngine.get`.
+        Liefert immer eine CachedResponse; `not_modified` ist True bei einem 304.
+        """
+        self._count("requests")
+        meta = self._load_meta(url)
+        headers = dict(kwargs.pop('headers', None) or {})
+        if meta:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = get(url, headers=headers, **kwargs)
+
+        body_path, meta_path = self._paths(url)
+        if response.status_code == 304 and meta:
+            with open(body_path, 'rb') as f:
+                content = f.read()
+            os.utime(body_path)  # Zugriff merken (Eviction nach ältestem Zugriff)
+            self._count("not_modified")
+            self._count("bytes_saved", len(content))
+            return CachedResponse(url, 200, content, meta.get('encoding'), not_modified=True,
+                                  derived=meta.get('derived'))
+
+        content = response.content
+        if response.status_code == 200:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self._write_atomic(body_path, content)
+                self._write_atomic(meta_path, json.dumps({
+                    'url': url,
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'encoding': response.encoding,
+                    'stored_at': time.time(),
+                    'size': len(content),
+                    'derived': {},
+                }), mode='w')
+                self._count("stored")
+                self._maybe_evict()
+        return CachedResponse(url, response.status_code, content, response.encoding)
+
+    def get_derived(self, response, key):
+        """Zuvor gespeichertes Parser-Ergebnis, aber nur wenn der Server 304 geliefert hat."""
+        if not response.not_modified or not response.derived or key not in response.derived:
+            return None
+        self._count("parses_saved")
+        return response.derived[key]
+
+    def store_derived(self, url, key, value):
+        """Hängt ein Parser-Ergebnis (JSON-serialisierbar) an den Cache-Eintrag."""
+        _, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        meta.setdefault('derived', {})[key] = value
+        self._write_atomic(meta_path, json.dumps(meta), mode='w')
+
+    def _maybe_evict(self):
+        with self._lock:
+            self._stores_since_evict += 1
+            due = (
+                self._last_evict is None
+                or self._stores_since_evict >= self.evict_every
+                or time.monotonic() - self._last_evict >= self.evict_interval
+            )
+        if due:
+            self.evict()
+
+    def evict(self):
+        """
+        Abgelaufene Einträge löschen und den Cache unter max_bytes halten.
+        Alter = `stored_at` aus der .json (wie in _load_meta; store_derived schreibt
+        die Datei neu, ändert den Speicherzeitpunkt aber nicht), LRU = mtime des
+        .body (letzter Zugriff).
+        """
+        with self._lock:
+            self._stores_since_evict = 0
+            self._last_evict = time.monotonic()
+            entries = []
+            total = 0
+            now = time.time()
+            for name in os.listdir(self.directory):
+                if not name.endswith('.body'):
+                    continue
+                key = name[:-5]
+                try:
+                    st = os.stat(os.path.join(self.directory, name))
+                    with open(os.path.join(self.directory, key + '.json'), encoding='utf-8') as f:
+                        stored = json.load(f).get('stored_at', 0)
+                except (FileNotFoundError, ValueError):
+                    self._remove_key(key)
+                    continue
+                if now - stored > self.ttl:
+                    self._remove_key(key)
+                    self.stats["expired"] += 1
+                    continue
+                entries.append((st.st_mtime, st.st_size, key))
+                total += st.st_size
+
+            entries.sort()
+            while total > self.max_bytes and entries:
+                _, size, key = entries.pop(0)
+                self._remove_key(key)
+                total -= size
+                self.stats["evicted"] += 1
+
+    def _remove_key(self, key):
+        for suffix in ('.body', '.json'):
+            try:
+                os.remove(os.path.join(self.directory, key + suffix))
+            except FileNotFoundError:
+                pass
+
+    def format_stats(self):
+        s = self.stats
+        return (
+            f"HTTP-Cache: {s['requests']} Abrufe, {s['not_modified']}x 304, "
+            f"{s['bytes_saved'] / 1024:.1f} KiB gespart, {s['parses_saved']} Parser-Läufe gespart, "
+            f"{s['evicted']} verdrängt, {s['expired']} abgelaufen"
+        )
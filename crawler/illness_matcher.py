@@ -0,0 +1,289 @@
+"""
+Wörterbuch-Matcher für Krankheitsnamen in gecrawlten Impftexten.
+
+Alle Namen und Synonyme werden einmal zu einem Aho-Corasick-Automaten
+kompiliert (als DFA: Fehlerübergänge sind bereits in die Übergangstabelle
+eingerechnet). Ein Durchlauf über den Text kostet damit O(Textlänge + Treffer),
+unabhängig davon, wie viele Krankheiten im Katalog stehen.
+
+Zusätzlich werden pro Satz Dosisangaben ("zwei Impfdosen", "zweimalig") und
+Gültigkeitsangaben ("innerhalb von 12 Monaten", "nach zehn Jahren") erkannt.
+
+    matcher = IllnessMatcher.from_sources()
+    matcher.extract("Der Nachweis einer Polio-Impfung innerhalb von 12 Monaten ...")
+"""
+import csv
+import os
+import re
+from typing import NamedTuple, Optional
+
+CRAWLER_DIR = os.path.dirname(os.path.abspath(__file__))
+ILLNESSES_CSV = os.path.join(CRAWLER_DIR, 'impfstoffe.csv')
+
+# Kanonischer Name (wie in Illness.name / impfstoffe.csv) -> zusätzliche Schreibweisen.
+# Name ohne Klammerzusatz und der Klammerinhalt selbst werden automatisch ergänzt.
+SYNONYMS = {
+    'Poliomyelitis (Kinderlähmung)': ['Polio'],
+    'Meningokokken': ['Meningokokken-Krankheit', 'Meningokokken (ACWY)', 'Meningokokken-ACWY', 'Meningitis'],
+    'Denguefieber': ['Dengue'],
+    'COVID-19': ['COVID', 'Corona', 'SARS-CoV-2'],
+    'Tuberkulose': ['BCG'],
+    'Haemophilus influenzae Typ b (Hib)': ['Haemophilus influenzae'],
+    'FSME (Frühsommer-Meningoenzephalitis)': ['Zeckenenzephalitis'],
+    'Varizellen (Windpocken)': ['Varicella'],
+    'Pertussis (Keuchhusten)': ['Pertussis'],
+    'Mpox': ['Affenpocken'],
+}
+
+# Ein Treffer direkt gefolgt von diesen Wortresten beschreibt ein Gebiet, keine Impfung
+# ("Gelbfiebergebiet", "Gelbfieberinfektionsgebiet").
+AREA_SUFFIXES = ('gebiet', 'infektionsgebiet', 'endemiegebiet', 'risikogebiet', 'land', 'länder', 'region')
+
+# Nur diese Wortreste dürfen direkt an einen Treffer anschließen ("Gelbfieberimpfung",
+# "Tetanusschutz"); sonst muss das Wort enden ("Hepatitis A" nicht in "Hepatitis auch").
+COMPOUND_SUFFIXES = ('impf', 'schutz', 'erkrankung', 'infektion', 'erreger', 'virus', 'viren')
+
+NUMBER_WORDS = {
+    'ein': 1, 'eine': 1, 'einer': 1, 'einem': 1, 'einen': 1, 'einmal': 1,
+    'zwei': 2, 'drei': 3, 'vier': 4, 'fünf': 5, 'sechs': 6, 'sieben': 7, 'acht': 8,
+    'neun': 9, 'zehn': 10, 'elf': 11, 'zwölf': 12, 'fünfzehn': 15, 'achtzehn': 18,
+    'zwanzig': 20, 'dreißig': 30, 'sechsunddreißig': 36,
+}
+_NUMBER = r'(\d+|' + '|'.join(sorted(NUMBER_WORDS, key=len, reverse=True)) + r')'
+_UNIT = r'(tag(?:e|en)?|woche(?:n)?|monat(?:e|en)?|jahr(?:e|en)?)'
+
+VALIDITY_PATTERNS = [
+    re.compile(r'innerhalb (?:von |der letzten |des letzten )?' + _NUMBER + r'?\s*' + _UNIT),
+    re.compile(r'nicht (?:älter|länger zurück) als ' + _NUMBER + r'\s+' + _UNIT),
+    re.compile(r'nach (?:' + _NUMBER + r'\s+)?' + _UNIT),
+    re.compile(_NUMBER + r'\s+' + _UNIT + r' gültig'),
+    re.compile(r'gültig(?:keit)? (?:für |von )?' + _NUMBER + r'\s+' + _UNIT),
+]
+DOSE_PATTERNS = [
+    re.compile(_NUMBER + r'\s+(?:impf)?(?:dosen|dosis|teilimpfungen|impfungen)'),
+    re.compile(r'(\w+?)malige?[rn]?\b'),
+]
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?;])\s+')
+_SOFT_HYPHEN = '\u00ad'
+
+
+def normalize_text(text):
+    """Kleinschreibung, weiche Trennstriche entfernen – gleiche Form für Muster und Text."""
+    return (text or '').replace(_SOFT_HYPHEN, '').lower()
+
+
+def parse_number(token):
+    if token is None:
+        return 1
+    if token.isdigit():
+        return int(token)
+    return NUMBER_WORDS.get(token)
+
+
+def _to_months(amount, unit):
+    if amount is None:
+        return None
+    if unit.startswith('jahr'):
+        return amount * 12
+    if unit.startswith('monat'):
+        return amount
+    if unit.startswith('woche'):
+        return max(1, round(amount / 4.345))
+    return max(1, round(amount / 30.4))
+
+
+def extract_validity_months(sentence):
+    """Erste Gültigkeitsangabe eines (normalisierten) Satzes in Monaten oder None."""
+    for pattern in VALIDITY_PATTERNS:
+        match = pattern.search(sentence)
+        if match:
+            return _to_months(parse_number(match.group(1)), match.group(2))
+    return None
+
+
+def extract_doses(sentence):
+    """Geforderte Dosenzahl eines (normalisierten) Satzes oder None."""
+    for pattern in DOSE_PATTERNS:
+        match = pattern.search(sentence)
+        if match:
+            amount = parse_number(match.group(1))
+            if amount:
+                return amount
+    return None
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick-Automat über normalisierte Muster. Jeder Zustand hat eine
+    vollständige Übergangstabelle (Zeichen -> Zustand); Zeichen außerhalb des
+    Alphabets führen in den Startzustand.
+    """
+
+    def __init__(self, patterns):
+        """patterns: Iterable von (muster, wert)."""
+        goto = [{}]
+        outputs = [[]]
+        for pattern, value in patterns:
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append((len(pattern), value))
+
+        # Breitensuche: Fehlerlinks bestimmen und in die Übergänge einrechnen
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        i = 0
+        while i < len(queue):
+            state = queue[i]
+            i += 1
+            delta[state] = dict(delta[fail[state]])
+            delta[state].update(goto[state])
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for ch, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(ch, 0)
+                queue.append(child)
+
+        self.delta = delta
+        self.outputs = [tuple(out) for out in outputs]
+        self.size = len(goto)
+
+    def iter_matches(self, text):
+        """Alle (start, ende, wert) in Reihenfolge der Endposition, inkl. Überlappungen."""
+        delta, outputs = self.delta, self.outputs
+        state = 0
+        for end, ch in enumerate(text, 1):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for length, value in outputs[state]:
+                    yield end - length, end, value
+
+
+class IllnessMatch(NamedTuple):
+    illness: str
+    start: int
+    end: int
+    surface: str
+
+
+class Extraction(NamedTuple):
+    illness: str
+    required_doses: int
+    validity_period_months: Optional[int]
+    sentence: str
+
+
+def name_variants(name, synonyms=()):
+    variants = {name}
+    base = re.sub(r'\s*\(.*?\)', '', name).strip()
+    if base:
+        variants.add(base)
+    variants.update(inner.strip() for inner in re.findall(r'\((.*?)\)', name) if len(inner.strip()) > 2)
+    variants.update(synonyms)
+    return {normalize_text(v) for v in variants if v}
+
+
+def load_illness_names(csv_path=ILLNESSES_CSV, include_db=True):
+    """Namen aus impfstoffe.csv und – falls ein App-Kontext aktiv ist – der Illness-Tabelle."""
+    names = set()
+    if csv_path and os.path.exists(csv_path):
+        with open(csv_path, encoding='utf-8') as f:
+            names.update(row['name'].strip() for row in csv.DictReader(f) if row.get('name'))
+    if include_db:
+        from flask import has_app_context
+        if has_app_context():
+            from extensions import db
+            from models import Illness
+            names.update(db.session.execute(db.select(Illness.name)).scalars())
+    return names
+
+
+def _ends_word(text, end):
+    """Treffer endet am Wortende, vor einem Genitiv-s oder vor einem erlaubten Kompositum-Rest."""
+    if end == len(text) or not text[end].isalnum():
+        return True
+    if text[end] == 's' and (end + 1 == len(text) or not text[end + 1].isalnum()):
+        return True
+    return text.startswith(COMPOUND_SUFFIXES, end)
+
+
+class IllnessMatcher:
+    def __init__(self, illness_names, synonyms=None):
+        synonyms = SYNONYMS if synonyms is None else synonyms
+        self.illness_names = sorted(set(illness_names))
+        patterns = []
+        for name in self.illness_names:
+            for variant in name_variants(name, synonyms.get(name, ())):
+                patterns.append((variant, name))
+        self.patterns = patterns
+        self.pattern_count = len(patterns)
+        self.automaton = AhoCorasick(patterns)
+
+    @classmethod
+    def from_sources(cls, csv_path=ILLNESSES_CSV, synonyms=None, include_db=True):
+        """Matcher über alle bekannten Namen (siehe load_illness_names)."""
+        return cls(load_illness_names(csv_path, include_db), synonyms)
+
+    def find(self, text, normalized=False):
+        """
+        Nicht überlappende Treffer (am weitesten links, bei Gleichstand der
+        längste) mit Wortanfang davor und Wortende bzw. Kompositum danach
+        (siehe COMPOUND_SUFFIXES); Gebietsangaben werden verworfen.
+        """
+        if not normalized:
+            text = normalize_text(text)
+        candidates = []
+        for start, end, illness in self.automaton.iter_matches(text):
+            if start and text[start - 1].isalnum():
+                continue
+            if text.startswith(AREA_SUFFIXES, end) or not _ends_word(text, end):
+                continue
+            candidates.append((start, -end, illness))
+        candidates.sort()
+
+        matches, covered = [], 0
+        for start, neg_end, illness in candidates:
+            if start < covered:
+                continue
+            matches.append(IllnessMatch(illness, start, -neg_end, text[start:-neg_end]))
+            covered = -neg_end
+        return matches
+
+    def extract(self, text, resolver=None):
+        """
+        Satzweise Krankheiten samt Dosen und Gültigkeit. Eine Gültigkeitsangabe
+        ohne eigenen Krankheitsnamen ("Auffrischimpfung nach zehn Jahren")
+        gilt für die Krankheiten des vorigen Satzes. Mit `resolver`
+        (crawler/illness_resolver.py) werden auch Tippfehler aufgelöst.
+        """
+        results = {}
+        previous = []
+        for sentence in _SENTENCE_SPLIT.split(normalize_text(text)):
+            matches = self.find(sentence, normalized=True)
+            illnesses = [m.illness for m in matches]
+            if resolver is not None:
+                illnesses += resolver.resolve_unmatched(sentence, matches)
+            illnesses = list(dict.fromkeys(illnesses))
+            validity = extract_validity_months(sentence)
+            doses = extract_doses(sentence)
+            if not illnesses:
+                for illness in previous:
+                    current = results[illness]
+                    results[illness] = current._replace(
+                        validity_period_months=current.validity_period_months or validity,
+                        required_doses=max(current.required_doses, doses or 1),
+                    )
+                continue
+            for illness in illnesses:
+                if illness in results:
+                    continue
+                results[illness] = Extraction(illness, doses or 1, validity, sentence)
+            previous = illnesses
+        return list(results.values())
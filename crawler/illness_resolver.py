@@ -0,0 +1,280 @@
+"""
+Unscharfe Auflösung gecrawlter Krankheitsnamen ("Dengueieber" -> Denguefieber).
+
+Alle Namen und Aliase (siehe crawler/illness_matcher.py) liegen in einem
+Trigramm-Index. Eine Suche zählt gemeinsame Trigramme über die Posting-Listen,
+nur die ähnlichsten Kandidaten werden mit der Levenshtein-Distanz bewertet:
+
+    Konfidenz = 1 - Distanz / max(len(token), len(alias))
+
+Namen, die sich nur im letzten Kurzwort unterscheiden (Hepatitis A/B), werden
+nie unscharf aufeinander abgebildet.
+
+Ergebnisse landen in einer Nachschlagetabelle (illness_lookup.json), die
+Loader und Review-Werkzeug gemeinsam nutzen: kuratierte Einträge haben Vorrang,
+automatisch aufgelöste werden im Speicher zwischengespeichert. Knapp
+verfehlte Tokens werden protokolliert und können bestätigt werden:
+
+    python crawler/illness_resolver.py resolve Dengueieber Gelbfiber
+    python crawler/illness_resolver.py unresolved
+    python crawler/illness_resolver.py confirm "Gelbfiber" Gelbfieber
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+from typing import NamedTuple, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from crawler.illness_matcher import ILLNESSES_CSV, SYNONYMS, load_illness_names, name_variants, normalize_text
+
+logger = logging.getLogger(__name__)
+
+CRAWLER_DIR = os.path.dirname(os.path.abspath(__file__))
+LOOKUP_FILE = os.path.join(CRAWLER_DIR, 'illness_lookup.json')
+UNRESOLVED_FILE = os.path.join(CRAWLER_DIR, 'unresolved_illnesses.json')
+
+MIN_CONFIDENCE = 0.8
+NEAR_MISS_CONFIDENCE = 0.6
+MIN_TOKEN_LENGTH = 4
+
+# Kandidaten im Satz: Komposita auf "-impfung" und Aufzählungen nach "gegen"
+_COMPOUND = re.compile(r'\b([a-zäöüß][a-zäöüß\-]{2,}?)-?(?:schutz)?impfung(?:en)?\b')
+_AGAINST = re.compile(r'\bgegen ([^.;:]+)')
+_LIST_SPLIT = re.compile(r',\s*|\s+(?:und|oder|sowie|bzw\.)\s+|\s+(?:bei|auch|gegen)\s+')
+_NOT_ILLNESS = {'auffrisch', 'reise', 'pflicht', 'grund', 'kombinations', 'mehrfach', 'standard', 'nachhol', 'einzel'}
+
+
+def levenshtein(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Invertierter Index Trigramm -> Aliase; liefert die ähnlichsten Kandidaten (Dice)."""
+
+    def __init__(self, items=()):
+        self.aliases = []
+        self.grams = []
+        self.postings = {}
+        for word, value in items:
+            self.add(word, value)
+
+    def add(self, word, value):
+        alias_id = len(self.aliases)
+        grams = trigrams(word)
+        self.aliases.append((word, value))
+        self.grams.append(len(grams))
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(alias_id)
+
+    def candidates(self, word, limit=5, min_dice=0.3):
+        """Bis zu `limit` (dice, alias, wert), absteigend nach Ähnlichkeit."""
+        grams = trigrams(word)
+        shared = {}
+        for gram in grams:
+            for alias_id in self.postings.get(gram, ()):
+                shared[alias_id] = shared.get(alias_id, 0) + 1
+        scored = []
+        for alias_id, count in shared.items():
+            dice = 2 * count / (len(grams) + self.grams[alias_id])
+            if dice >= min_dice:
+                scored.append((dice, *self.aliases[alias_id]))
+        scored.sort(reverse=True)
+        return scored[:limit]
+
+
+class Resolution(NamedTuple):
+    token: str
+    illness: Optional[str]
+    confidence: float
+    alias: Optional[str] = None
+    source: str = 'auto'
+
+
+def candidate_tokens(sentence):
+    """(start, ende, token) möglicher Krankheitsnamen in einem normalisierten Satz."""
+    for match in _COMPOUND.finditer(sentence):
+        token = match.group(1).strip('-')
+        if token not in _NOT_ILLNESS:
+            yield match.start(1), match.start(1) + len(token), token
+    for match in _AGAINST.finditer(sentence):
+        offset = match.start(1)
+        for part in _LIST_SPLIT.split(match.group(1)):
+            token = re.sub(r'\s*\(.*', '', part).strip()
+            start = sentence.find(token, offset) if token else -1
+            if start != -1 and len(token) >= MIN_TOKEN_LENGTH:
+                yield start, start + len(token), token
+                offset = start + len(token)
+
+
+def _same_qualifier(token, alias):
+    """Kurze Schlusswörter ("a", "b", "typ b") müssen exakt übereinstimmen."""
+    token_last, alias_last = token.rsplit(' ', 1)[-1], alias.rsplit(' ', 1)[-1]
+    if len(token_last) <= 2 or len(alias_last) <= 2:
+        return token_last == alias_last
+    return True
+
+
+class IllnessResolver:
+    def __init__(self, illness_names, synonyms=None, lookup=None,
+                 min_confidence=MIN_CONFIDENCE, near_miss=NEAR_MISS_CONFIDENCE):
+        synonyms = SYNONYMS if synonyms is None else synonyms
+        self.illness_names = sorted(set(illness_names))
+        self.min_confidence = min_confidence
+        self.near_miss = near_miss
+        self.index = TrigramIndex(
+            (alias, name)
+            for name in self.illness_names
+            for alias in sorted(name_variants(name, synonyms.get(name, ())))
+        )
+        self.lookup = {}
+        for token, entry in (lookup or {}).items():
+            if entry.get('illness') in self.illness_names:
+                self.lookup[normalize_text(token)] = Resolution(
+                    normalize_text(token), entry['illness'], entry.get('confidence', 1.0),
+                    entry.get('alias'), entry.get('source', 'curated'),
+                )
+        self.unresolved = {}
+        self.stats = {'lookups': 0, 'cache_hits': 0, 'resolved': 0, 'unresolved': 0}
+
+    @classmethod
+    def from_sources(cls, csv_path=ILLNESSES_CSV, lookup_file=LOOKUP_FILE, include_db=True, **kwargs):
+        """Namen wie IllnessMatcher.from_sources, dazu die gespeicherte Nachschlagetabelle."""
+        return cls(load_illness_names(csv_path, include_db), lookup=_read_json(lookup_file), **kwargs)
+
+    def resolve(self, token):
+        """Beste Krankheit für ein Token; illness=None, wenn die Konfidenz nicht reicht."""
+        key = normalize_text(token).strip()
+        self.stats['lookups'] += 1
+        cached = self.lookup.get(key)
+        if cached is not None:
+            self.stats['cache_hits'] += 1
+            if key in self.unresolved:
+                self.unresolved[key]['count'] += 1
+            return cached
+
+        result = Resolution(key, None, 0.0)
+        if len(key) >= MIN_TOKEN_LENGTH:
+            for _, alias, illness in self.index.candidates(key):
+                if not _same_qualifier(key, alias):
+                    continue
+                confidence = round(1 - levenshtein(key, alias) / max(len(key), len(alias)), 3)
+                if confidence > result.confidence:
+                    result = Resolution(key, illness, confidence, alias)
+
+        if result.confidence >= self.min_confidence:
+            self.stats['resolved'] += 1
+        else:
+            self.stats['unresolved'] += 1
+            if result.confidence >= self.near_miss:
+                self._record_near_miss(result)
+            result = result._replace(illness=None)
+        self.lookup[key] = result
+        return result
+
+    def resolve_unmatched(self, sentence, matches):
+        """Krankheiten für Kandidaten-Tokens, die nicht schon exakt gefunden wurden."""
+        covered = [(m.start, m.end) for m in matches]
+        illnesses = []
+        for start, end, token in candidate_tokens(sentence):
+            if any(start < m_end and m_start < end for m_start, m_end in covered):
+                continue
+            result = self.resolve(token)
+            if result.illness:
+                illnesses.append(result.illness)
+        return illnesses
+
+    def _record_near_miss(self, result):
+        entry = self.unresolved.setdefault(result.token, {'count': 0, 'best': result.illness, 'confidence': result.confidence})
+        entry['count'] += 1
+        if entry['count'] == 1:
+            logger.warning("Krankheitsname nicht aufgelöst: %r (bester Kandidat %s, Konfidenz %.2f)",
+                           result.token, result.illness, result.confidence)
+
+    def save(self, lookup_file=LOOKUP_FILE, unresolved_file=UNRESOLVED_FILE):
+        """Aufgelöste Tokens in die Nachschlagetabelle, Beinahe-Treffer ins Review-Protokoll."""
+        _write_json(lookup_file, {
+            token: {'illness': r.illness, 'confidence': r.confidence, 'alias': r.alias, 'source': r.source}
+            for token, r in sorted(self.lookup.items()) if r.illness
+        })
+        if self.unresolved:
+            pending = _read_json(unresolved_file)
+            for token, entry in self.unresolved.items():
+                merged = pending.setdefault(token, dict(entry, count=0))
+                merged['count'] += entry['count']
+            _write_json(unresolved_file, pending)
+
+
+def _read_json(path):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def confirm(token, illness, lookup_file=LOOKUP_FILE, unresolved_file=UNRESOLVED_FILE):
+    """Kuratiert ein Token (Review) und entfernt es aus dem Protokoll."""
+    lookup = _read_json(lookup_file)
+    lookup[normalize_text(token)] = {'illness': illness, 'confidence': 1.0, 'alias': None, 'source': 'curated'}
+    _write_json(lookup_file, lookup)
+    pending = _read_json(unresolved_file)
+    if pending.pop(normalize_text(token), None) is not None:
+        _write_json(unresolved_file, pending)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Krankheitsnamen unscharf auflösen und Beinahe-Treffer prüfen.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    resolve_cmd = sub.add_parser('resolve', help="Tokens auflösen")
+    resolve_cmd.add_argument('tokens', nargs='+')
+    sub.add_parser('unresolved', help="Protokollierte Beinahe-Treffer anzeigen")
+    confirm_cmd = sub.add_parser('confirm', help="Token einer Krankheit fest zuordnen")
+    confirm_cmd.add_argument('token')
+    confirm_cmd.add_argument('illness')
+    args = parser.parse_args(argv)
+
+    if args.command == 'resolve':
+        resolver = IllnessResolver.from_sources(include_db=False)
+        for token in args.tokens:
+            r = resolver.resolve(token)
+            print(f"{token!r:>28} -> {r.illness or '–'} ({r.confidence:.2f}, {r.source})")
+        resolver.save()
+    elif args.command == 'unresolved':
+        pending = _read_json(UNRESOLVED_FILE)
+        if not pending:
+            print("Keine offenen Beinahe-Treffer.")
+        for token, entry in sorted(pending.items(), key=lambda item: -item[1]['count']):
+            print(f"{entry['count']:>5}x {token!r:>28}  bester Kandidat: {entry['best']} ({entry['confidence']:.2f})")
+    elif args.command == 'confirm':
+        resolver = IllnessResolver.from_sources(include_db=False)
+        if args.illness not in resolver.illness_names:
+            parser.error(f"Unbekannte Krankheit: {args.illness}")
+        confirm(args.token, args.illness)
+        print(f"{args.token!r} -> {args.illness} gespeichert.")
+
+
+if __name__ == "__main__":
+    main()
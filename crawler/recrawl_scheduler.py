@@ -0,0 +1,229 @@
+"""
+Inkrementeller Recrawl nach Veraltung statt periodischer Vollläufe.
+
+Alle Länder liegen in einer Prioritätswarteschlange (heapq), sortiert nach dem
+Zeitpunkt, an dem sie wieder fällig sind:
+
+    fällig = zuletzt gecrawlt + Intervall
+
+Zuletzt gecrawlt steht in der Zustandsdatei (`last_crawled`); nur für Länder
+ohne Eintrag dient `min(VaccinationRequirement.crawl_last_set)` als Startwert.
+Länder mit geändertem Text werden in laender_impf_details.csv ersetzt und sofort
+über crawler/catalog_loader.py importiert. Unveränderte Länder fassen die
+Datenbank nicht an: `crawl_last_set` und die Katalog-Version (services/catalog.py)
+ändern sich nur, wenn der Import tatsächlich andere Anforderungen schreibt.
+Länder, deren Impfschutz-Text sich innerhalb von RECENT_CHANGE_WINDOW geändert
+hat, bekommen das kürzere CHANGED_INTERVAL. Pro Tick werden höchstens `budget`
+fällige Länder geholt. Alle REBUILD_EVERY Ticks wird die Warteschlange neu
+aufgebaut, damit neu angelegte Länder eingeplant werden.
+
+    python crawler/recrawl_scheduler.py --budget 10
+    python crawler/recrawl_scheduler.py --budget 10 --loop --sleep 600
+"""
+import argparse
+import csv
+import hashlib
+import heapq
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import func, select
+
+from crawler.CrawlerImpfdaten import INPUT_CSV, OUTPUT_CSV, crawl_country, is_crawl_error
+from crawler.catalog_loader import after_catalog_load, derive_requirements, load_catalog
+from services.names import normalize_name
+from crawler.crawl_engine import CrawlEngine
+from crawler.http_cache import HttpCache
+from crawler.illness_matcher import IllnessMatcher
+from crawler.illness_resolver import IllnessResolver
+from extensions import db
+from models import Country, VaccinationRequirement
+
+STATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recrawl_state.json')
+
+BASE_INTERVAL = timedelta(days=7)
+CHANGED_INTERVAL = timedelta(days=1)
+RECENT_CHANGE_WINDOW = timedelta(days=30)
+RETRY_DELAY = timedelta(hours=1)
+REBUILD_EVERY = 12  # Ticks
+
+
+def _load_state(path=STATE_FILE):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _save_state(state, path=STATE_FILE):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _parse_ts(value):
+    return datetime.fromisoformat(value) if value else None
+
+
+class RecrawlScheduler:
+    def __init__(self, links_csv=INPUT_CSV, details_csv=OUTPUT_CSV, state_file=STATE_FILE,
+                 engine=None, cache=None, rebuild_every=REBUILD_EVERY, matcher=None, resolver=None):
+        self.details_csv = details_csv
+        self.state_file = state_file
+        self.state = _load_state(state_file)
+        self.engine = engine or CrawlEngine(workers=4, per_host_concurrency=2, per_host_rate=2.0)
+        self.cache = cache
+        self.matcher = matcher
+        self.resolver = resolver
+        self.queue = []
+        self.rebuild_every = rebuild_every
+        self.ticks_since_build = 0
+
+        with open(links_csv, encoding='utf-8') as f:
+            self.links = {normalize_name(row['bezeichnung']): row for row in csv.DictReader(f)}
+
+    # --- Warteschlange ---
+
+    def interval_for(self, key, now):
+        last_changed = _parse_ts(self.state.get(key, {}).get('last_changed'))
+        if last_changed and now - last_changed <= RECENT_CHANGE_WINDOW:
+            return CHANGED_INTERVAL
+        return BASE_INTERVAL
+
+    def build_queue(self, now=None):
+        """Füllt die Warteschlange aus Zustandsdatei und DB (crawl_last_set als Startwert)."""
+        now = now or datetime.utcnow()
+        last_set = dict(db.session.execute(
+            select(VaccinationRequirement.country_id, func.min(VaccinationRequirement.crawl_last_set))
+            .group_by(VaccinationRequirement.country_id)
+        ).all())
+
+        self.queue = []
+        for country_id, name in db.session.execute(select(Country.id, Country.name)).all():
+            key = normalize_name(name)
+            if key not in self.links:
+                continue
+            entry = self.state.get(key, {})
+            last_crawled = _parse_ts(entry.get('last_crawled')) or last_set.get(country_id)
+            retry_at = _parse_ts(entry.get('retry_at'))
+            if retry_at:
+                due = retry_at
+            elif last_crawled is None:
+                due = datetime.min  # nie gecrawlt -> sofort fällig
+            else:
+                due = last_crawled + self.interval_for(key, now)
+            heapq.heappush(self.queue, (due, country_id, key))
+        self.ticks_since_build = 0
+        return len(self.queue)
+
+    def due_countries(self, budget, now):
+        picked = []
+        while self.queue and len(picked) < budget and self.queue[0][0] <= now:
+            picked.append(heapq.heappop(self.queue))
+        return picked
+
+    # --- Ein Tick ---
+
+    def tick(self, budget=10, now=None):
+        """Crawlt höchstens `budget` fällige Länder; liefert (erfolgreich, geändert, fehlgeschlagen)."""
+        now = now or datetime.utcnow()
+        if not self.queue or self.ticks_since_build >= self.rebuild_every:
+            self.build_queue(now)
+        self.ticks_since_build += 1
+        picked = self.due_countries(budget, now)
+        if not picked:
+            return [], [], []
+
+        rows = self.engine.map(
+            lambda item: crawl_country(self.links[item[2]], self.engine, self.cache), picked
+        )
+
+        succeeded, changed, failed = [], [], []
+        for (_, country_id, key), row in zip(picked, rows):
+            entry = self.state.setdefault(key, {})
+            voraussetzungen, empfehlungen = row[2], row[3]
+            if is_crawl_error(voraussetzungen):
+                entry['retry_at'] = (now + RETRY_DELAY).isoformat()
+                failed.append(key)
+                heapq.heappush(self.queue, (now + RETRY_DELAY, country_id, key))
+                continue
+
+            digest = hashlib.sha256(f"{voraussetzungen}\n{empfehlungen}".encode('utf-8')).hexdigest()
+            if entry.get('hash') != digest:
+                if entry.get('hash') is not None:
+                    entry['last_changed'] = now.isoformat()
+                changed.append(row)
+            entry.update(hash=digest, last_crawled=now.isoformat(), retry_at=None)
+            succeeded.append(country_id)
+            heapq.heappush(self.queue, (now + self.interval_for(key, now), country_id, key))
+
+        if changed:
+            self.write_changed_rows(changed)
+            self.import_changed_rows(changed)
+        _save_state(self.state, self.state_file)
+        return succeeded, changed, failed
+
+    def import_changed_rows(self, changed_rows):
+        """
+        Anforderungen der geänderten Länder in die Datenbank übernehmen. Die
+        Länder gelten als gecrawlt: nicht mehr genannte Anforderungen entfallen.
+        """
+        if self.matcher is None:
+            self.matcher = IllnessMatcher.from_sources()
+        texts = {row[1]: row[2] for row in changed_rows}
+        requirements = derive_requirements(texts, self.matcher.illness_names, self.matcher, self.resolver)
+        report = load_catalog(self.matcher.illness_names, [], requirements,
+                              crawled=list(texts), delete_obsolete=True)
+        after_catalog_load(report)
+        return report
+
+    def write_changed_rows(self, changed_rows):
+        """Ersetzt die geänderten Länder in laender_impf_details.csv (Eingabe für den Import)."""
+        header = ['landid', 'bezeichnung', 'impf_voraussetzungen', 'impf_empfehlungen', 'quelle_url']
+        rows = {}
+        try:
+            with open(self.details_csv, encoding='utf-8') as f:
+                reader = csv.reader(f)
+                header = next(reader, header)
+                rows = {row[0]: row for row in reader if row}
+        except FileNotFoundError:
+            pass
+        for row in changed_rows:
+            rows[str(row[0])] = row
+        with open(self.details_csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(sorted(rows.values(), key=lambda r: int(r[0])))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Veraltete Länder inkrementell neu crawlen.")
+    parser.add_argument('--budget', type=int, default=10, help="Max. Länder pro Tick")
+    parser.add_argument('--loop', action='store_true', help="Dauerhaft laufen statt eines einzelnen Ticks")
+    parser.add_argument('--sleep', type=int, default=600, help="Sekunden zwischen zwei Ticks (mit --loop)")
+    args = parser.parse_args(argv)
+
+    from app import create_app
+
+    with create_app().app_context():
+        scheduler = RecrawlScheduler(cache=HttpCache(), resolver=IllnessResolver.from_sources())
+        print(f"{scheduler.build_queue()} Länder in der Warteschlange.")
+        while True:
+            succeeded, changed, failed = scheduler.tick(args.budget)
+            scheduler.resolver.save()
+            print(f"Tick: {len(succeeded)} aktualisiert, {len(changed)} geändert, {len(failed)} fehlgeschlagen. "
+                  f"{scheduler.engine.stats.format()}")
+            if not args.loop:
+                break
+            time.sleep(args.sleep)
+
+
+if __name__ == "__main__":
+    main()
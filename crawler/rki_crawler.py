@@ -1,52 +1,37 @@
 import csv
+import os
+import sys
 import requests
 from bs4 import BeautifulSoup
 import urllib3
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from crawler.http_cache import HttpCache
+
 # Unsichere Verbindungen zulassen (Selbstverantwortung!)
 urllib3.disable_warnings()
 
-def crawl_rki_vaccines():
-    """
-    Crawlt die RKI-Webseite, extrahiert Impfstoffnamen und speichert sie in einer CSV.
-    """
-    
-    URL = "https://www.rki.de/DE/A-Z/impfungen-a-z-node.html"
-    CSV_FILE = "impfstoffe.csv"
-    
-    print(f"Rufe Webseite auf: {URL}")
-    
-    try:
-        # 1. Webseite herunterladen
-        # response = requests.get(URL, verify=False)  # Nur verwenden, wenn Sie der Quelle vertrauen!
-        response = requests.get(URL)
-        
-        # Nach dem requests.get():
-        print(f"Status Code: {response.status_code}")
-        print("HTML Inhalt der ersten 500 Zeichen:")
-        print(response.text[:500])
-        
-        # Fehler werfen, falls die Seite nicht erfolgreich geladen wurde (z.B. 404, 500)
-        response.raise_for_status() 
-    except requests.RequestException as e:
-        print(f"Fehler beim Abrufen der Webseite: {e}")
-        return
+# Schlüssel für das geparste Ergebnis im HTTP-Cache
+PARSER_CACHE_KEY = 'rki-vaccines-v1'
+
 
-    # 2. HTML-Inhalt analysieren (parsen)
+def parse_vaccine_tiles(content):
+    """Liest die Impfstoffnamen aus der Kachel-Liste der RKI-Seite."""
     # Wir verwenden BeautifulSoup, um die HTML-Struktur zu durchsuchen
-    soup = BeautifulSoup(response.content, 'html.parser')
+    soup = BeautifulSoup(content, 'html.parser')
 
     # Suche nach dem Tiles-Container
     tiles_container = soup.find('div', class_='c-tiles')
     if not tiles_container:
         print("Konnte den 'c-tiles' Bereich nicht finden. Möglicherweise hat sich die Seitenstruktur geändert.")
-        return
+        return None
 
     # Suche nach der Tiles-Liste
     tiles_list = tiles_container.find('ul', class_='c-tiles__list')
     if not tiles_list:
         print("Konnte die 'c-tiles__list' nicht finden. Möglicherweise hat sich die Seitenstruktur geändert.")
-        return
+        return None
 
     vaccine_data = []
     seen_names = set()
@@ -68,8 +53,49 @@ def crawl_rki_vaccines():
 
     if not vaccine_data:
         print("Keine Impfstoffdaten gefunden. Möglicherweise hat sich die Seitenstruktur geändert.")
+        return None
+
+    return vaccine_data
+
+
+def crawl_rki_vaccines(cache=None):
+    """
+    Crawlt die RKI-Webseite, extrahiert Impfstoffnamen und speichert sie in einer CSV.
+    Mit HTTP-Cache wird per Conditional GET geladen; bei 304 entfällt das Parsen.
+    """
+    cache = cache or HttpCache()
+    
+    URL = "https://www.rki.de/DE/A-Z/impfungen-a-z-node.html"
+    CSV_FILE = "impfstoffe.csv"
+    
+    print(f"Rufe Webseite auf: {URL}")
+    
+    try:
+        # 1. Webseite herunterladen
+        # response = requests.get(URL, verify=False)  # Nur verwenden, wenn Sie der Quelle vertrauen!
+        response = cache.fetch(requests.get, URL)
+        
+        # Nach dem requests.get():
+        print(f"Status Code: {response.status_code}")
+        print("HTML Inhalt der ersten 500 Zeichen:")
+        print(response.text[:500])
+        
+        # Fehler werfen, falls die Seite nicht erfolgreich geladen wurde (z.B. 404, 500)
+        response.raise_for_status() 
+    except requests.RequestException as e:
+        print(f"Fehler beim Abrufen der Webseite: {e}")
         return
 
+    # 2. Bei 304 das gespeicherte Ergebnis übernehmen, sonst parsen
+    vaccine_data = cache.get_derived(response, PARSER_CACHE_KEY)
+    if vaccine_data is not None:
+        print("Seite unverändert (304) – Parsen übersprungen.")
+    else:
+        vaccine_data = parse_vaccine_tiles(response.content)
+        if not vaccine_data:
+            return
+        cache.store_derived(URL, PARSER_CACHE_KEY, vaccine_data)
+
     # 7. Daten in eine CSV-Datei schreiben
     try:
         with open(CSV_FILE, 'w', newline='', encoding='utf-8') as f:
@@ -83,6 +109,7 @@ def crawl_rki_vaccines():
             writer.writerows(vaccine_data)
             
         print(f"Erfolg! {len(vaccine_data)} Impfstoffe wurden in '{CSV_FILE}' gespeichert.")
+        print(cache.format_stats())
         
     except IOError as e:
         print(f"Fehler beim Schreiben der CSV-Datei: {e}")
@@ -0,0 +1,255 @@
+"""
+Connection-Pooling und Lese-/Schreib-Routing für die Datenbank.
+
+- `engine_options_from_env()` liefert SQLALCHEMY_ENGINE_OPTIONS aus IMT_DB_*-Variablen
+  (Poolgröße, Overflow, Pre-Ping, Recycle, Timeout).
+- `TimedQueuePool` misst, wie lange ein Request auf eine freie Verbindung wartet.
+  Damit lässt sich die Poolgröße passend zur Anzahl der Worker/Threads wählen.
+- `RoutingSession` schickt Lesezugriffe von mit `@read_only` markierten Routen an
+  die optionale Replica (DB_REPLICA_URL). Alles andere geht an die Primary: Flushes,
+  INSERT/UPDATE/DELETE-Statements, Sessions mit ausstehenden Änderungen, alles nach
+  dem ersten Schreibzugriff im Request, Blöcke unter `use_primary()` und der Fall,
+  dass die Replica nicht erreichbar ist (dann wird sie REPLICA_RETRY_SECONDS lang
+  gemieden).
+
+    IMT_DATABASE_URL=postgresql://...@primary/immuntrack
+    IMT_DATABASE_REPLICA_URL=postgresql://...@replica/immuntrack
+    IMT_DB_POOL_SIZE=10 IMT_DB_MAX_OVERFLOW=5 IMT_DB_POOL_RECYCLE=1800
+"""
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.pool import QueuePool
+
+REPLICA_KEY = "replica"
+
+# Nach einem Verbindungsfehler wird die Replica so lange gemieden
+REPLICA_RETRY_SECONDS = 30
+
+
+def _env_bool(name, default):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def engine_options_from_env(url: str) -> dict:
+    """Pool-Einstellungen für eine URL; In-Memory-SQLite behält seinen Standardpool."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": TimedQueuePool,
+        "pool_size": int(os.getenv("IMT_DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("IMT_DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("IMT_DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("IMT_DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": _env_bool("IMT_DB_POOL_PRE_PING", True),
+    }
+
+
+# =====================================================
+# Pool mit Wartezeit-Messung
+# =====================================================
+
+class TimedQueuePool(QueuePool):
+    """QueuePool, der die Wartezeit jedes Checkouts festhält."""
+
+    SAMPLE_SIZE = 1000
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._wait_lock = threading.Lock()
+        self.reset_wait_stats()
+
+    def reset_wait_stats(self):
+        with self._wait_lock:
+            self.checkouts = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+            self.timeouts = 0
+            self.samples = deque(maxlen=self.SAMPLE_SIZE)
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with self._wait_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._wait_lock:
+                self.checkouts += 1
+                self.total_wait += waited
+                self.max_wait = max(self.max_wait, waited)
+                self.samples.append(waited)
+
+    def wait_stats(self) -> dict:
+        with self._wait_lock:
+            samples = sorted(self.samples)
+            stats = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+        for name, q in (("p50_wait_ms", 0.50), ("p95_wait_ms", 0.95), ("p99_wait_ms", 0.99)):
+            stats[name] = round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1000, 3) if samples else 0.0
+        return stats
+
+
+def pool_stats(engines) -> dict:
+    """Name -> Poolzustand (size/checked_out/overflow) plus Wartezeiten, falls gemessen."""
+    result = {}
+    for name, engine in engines.items():
+        pool = engine.pool
+        entry = {"pool": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            entry.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow())
+        if isinstance(pool, TimedQueuePool):
+            entry.update(pool.wait_stats())
+        result[name] = entry
+    return result
+
+
+# =====================================================
+# Lese-/Schreib-Routing
+# =====================================================
+
+routing_stats = {
+    "replica": 0,    # Lesezugriffe an die Replica
+    "primary": 0,    # Zugriffe an die Primary (inkl. aller Schreibzugriffe)
+    "fallbacks": 0,  # Replica gewünscht, aber nicht erreichbar
+}
+
+_replica_down_until = 0.0
+_replica_lock = threading.Lock()
+
+
+def mark_replica_down(seconds: float = REPLICA_RETRY_SECONDS):
+    global _replica_down_until
+    with _replica_lock:
+        _replica_down_until = time.monotonic() + seconds
+
+
+def replica_available() -> bool:
+    """Nach einem Fehler wird die Replica REPLICA_RETRY_SECONDS lang gemieden."""
+    return time.monotonic() >= _replica_down_until
+
+
+def _on_replica_error(context):
+    if context.is_disconnect or context.connection is None:
+        mark_replica_down()
+
+
+def init_routing(app):
+    """
+    Legt die Replica-Engine aus DB_REPLICA_URL an. Bewusst kein SQLALCHEMY_BINDS-
+    Eintrag: Binds sind für eigene Modellgruppen gedacht, create_all und
+    Migrationen sollen die Replica nicht anfassen.
+    """
+    url = app.config.get("DB_REPLICA_URL")
+    if not url:
+        return None
+    options = app.config.get("DB_REPLICA_ENGINE_OPTIONS") or engine_options_from_env(url)
+    engine = create_engine(url, **options)
+    event.listen(engine, "handle_error", _on_replica_error)
+    app.extensions[REPLICA_KEY] = engine
+    return engine
+
+
+def get_replica_engine():
+    return current_app.extensions.get(REPLICA_KEY)
+
+
+def routing_engines(db) -> dict:
+    """Primary und (falls konfiguriert) Replica der aktuellen App."""
+    engines = {"primary": db.engine}
+    replica = get_replica_engine()
+    if replica is not None:
+        engines[REPLICA_KEY] = replica
+    return engines
+
+
+def read_only(view):
+    """Markiert eine Route als reinen Lesezugriff – ihre Abfragen dürfen an die Replica."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.db_read_only = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def use_primary():
+    """Abfragen im Block gehen auch in `@read_only`-Routen an die Primary (z.B. Lesen, um zu schreiben)."""
+    previous = g.get("db_read_only", False)
+    g.db_read_only = False
+    try:
+        yield
+    finally:
+        g.db_read_only = previous
+
+
+class RoutingSession(Session):
+    """
+    Flask-SQLAlchemy-Session, die in `@read_only`-Routen von der Replica liest.
+    Hat die Session im laufenden Request bereits geschrieben, bleiben auch die
+    folgenden Lesezugriffe auf der Primary (read-your-writes) – über Commits
+    hinweg bis zum Ende des Requests, wenn Flask-SQLAlchemy die Session schließt.
+    """
+
+    _wrote = False
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if getattr(clause, "is_dml", False):
+            self._wrote = True
+        elif bind is None and self._wants_replica():
+            replica = get_replica_engine()
+            if replica is not None:
+                if replica_available() and self._connect_replica(replica):
+                    routing_stats["replica"] += 1
+                    return replica
+                routing_stats["fallbacks"] += 1
+        routing_stats["primary"] += 1
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _wants_replica(self) -> bool:
+        if self._flushing or self._wrote or self.new or self.dirty or self.deleted:
+            return False
+        return has_app_context() and g.get("db_read_only", False) \
+            and current_app.config.get("DB_READ_REPLICA_ENABLED", True)
+
+    def _connect_replica(self, replica) -> bool:
+        """
+        Verbindung zur Replica in der laufenden Transaktion herstellen (danach
+        wiederverwendet). Schlägt das fehl, geht die Abfrage an die Primary.
+        """
+        try:
+            self.connection(bind_arguments={"bind": replica})
+        except DBAPIError:
+            mark_replica_down()
+            return False
+        return True
+
+    def flush(self, objects=None):
+        if self.new or self.dirty or self.deleted:
+            self._wrote = True
+        super().flush(objects)
+
+    def close(self):
+        # Teardown des Requests (scoped_session.remove)
+        super().close()
+        self._wrote = False
@@ -1,5 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 
-db = SQLAlchemy()
+from db_routing import RoutingSession
+
+# RoutingSession: Lesezugriffe aus @read_only-Routen dürfen an die Replica (db_routing.py)
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()  # HINZUGEFÜGT
\ No newline at end of file
@@ -1,30 +1,34 @@
-from models import Impfrequirements
-from extensions import db
-from flask import Flask
-from app import app  # ✅ korrekt, weil app.py im Root liegt
+from app import create_app  # ✅ korrekt, weil app.py im Root liegt
+from crawler.catalog_loader import RequirementRecord, after_catalog_load, load_catalog
+
 
 def main():
     print(">>> Skript gestartet <<<")
 
-    with app.app_context():
-        land = input("Land: ")
-        impfstoff = input("Impfstoff: ")
-        gueltigkeit_input = input("Gültigkeit in Monaten (leer lassen, wenn unbekannt): ")
-
-        gueltigkeitsdauer = int(gueltigkeit_input) if gueltigkeit_input else None
+    land = input("Land: ")
+    krankheit = input("Krankheit: ")
+    dosen_input = input("Benötigte Dosen (leer lassen für 1): ")
+    gueltigkeit_input = input("Gültigkeit in Monaten (leer lassen, wenn unbekannt): ")
 
-        neue_voraussetzung = Impfrequirements(
-            land=land,
-            impfstoff=impfstoff,
-            gueltigkeitsdauer=gueltigkeitsdauer
-        )
+    record = RequirementRecord(
+        country_name=land,
+        illness_name=krankheit,
+        required_doses=int(dosen_input) if dosen_input else 1,
+        validity_period_months=int(gueltigkeit_input) if gueltigkeit_input else None,
+    )
 
+    with create_app().app_context():
         try:
-            db.session.add(neue_voraussetzung)
-            db.session.commit()
-            print("✅ Impfvoraussetzung erfolgreich gespeichert!")
+            # Über den Batch-Loader, damit Caches und Read-Model konsistent bleiben
+            report = load_catalog([krankheit], [land], [record])
+            after_catalog_load(report)
+            if report['skipped_countries']:
+                print("❌ Unbekanntes Land:", land)
+            else:
+                print("✅ Impfvoraussetzung erfolgreich gespeichert!", report['requirements'])
         except Exception as e:
             print("❌ Fehler beim Speichern:", e)
 
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,34 @@
+"""Unique requirement per country and illness
+
+Revision ID: 8b1e6f0c4d2a
+Revises: 3f9c2a7d1e04
+Create Date: 2026-10-18 11:03:27.918245
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b1e6f0c4d2a'
+down_revision = '3f9c2a7d1e04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Doppelte (country_id, illness_id) vorher auflösen – die neueste Zeile bleibt
+    op.execute("""
+        DELETE FROM vaccination_requirements a
+        USING vaccination_requirements b
+        WHERE a.country_id = b.country_id
+          AND a.illness_id = b.illness_id
+          AND a.id < b.id
+    """)
+    with op.batch_alter_table('vaccination_requirements', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_vaccination_requirements_country_illness', ['country_id', 'illness_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('vaccination_requirements', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_vaccination_requirements_country_illness', type_='unique')
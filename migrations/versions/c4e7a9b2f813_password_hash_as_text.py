@@ -0,0 +1,28 @@
+"""password_hash as TEXT
+
+Revision ID: c4e7a9b2f813
+Revises: 8b1e6f0c4d2a
+Create Date: 2026-10-18 14:20:05.311842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e7a9b2f813'
+down_revision = '8b1e6f0c4d2a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Ersetzt den DO-Block, der bisher bei jedem Import von app.py lief:
+    # scrypt-Hashes passen nicht in die alte VARCHAR-Spalte.
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('password_hash', existing_type=sa.String(), type_=sa.Text(), existing_nullable=False)
+
+
+def downgrade():
+    # Bewusst kein Zurück auf VARCHAR: vorhandene Hashes könnten abgeschnitten werden
+    pass
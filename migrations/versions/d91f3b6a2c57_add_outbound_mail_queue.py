@@ -0,0 +1,40 @@
+"""Add outbound_mail queue
+
+Revision ID: d91f3b6a2c57
+Revises: c4e7a9b2f813
+Create Date: 2026-10-18 16:05:12.417388
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd91f3b6a2c57'
+down_revision = 'c4e7a9b2f813'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('outbound_mail',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('sender', sa.String(length=255), nullable=False),
+    sa.Column('recipient', sa.String(length=255), nullable=False),
+    sa.Column('reply_to', sa.String(length=255), nullable=True),
+    sa.Column('subject', sa.String(length=255), nullable=False),
+    sa.Column('body', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbound_mail_status_next_attempt', 'outbound_mail', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_outbound_mail_status_next_attempt', table_name='outbound_mail')
+    op.drop_table('outbound_mail')
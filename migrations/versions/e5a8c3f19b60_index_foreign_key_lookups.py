@@ -0,0 +1,54 @@
+"""Index foreign-key lookup paths
+
+Revision ID: e5a8c3f19b60
+Revises: d91f3b6a2c57
+Create Date: 2026-10-18 17:32:48.902615
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a8c3f19b60'
+down_revision = 'd91f3b6a2c57'
+branch_labels = None
+depends_on = None
+
+
+# PostgreSQL legt für Fremdschlüssel keine Indizes an. vaccination_requirements.country_id
+# ist bereits über uq_vaccination_requirements_country_illness (country_id, illness_id) abgedeckt,
+# user_country_compliance.country_id legt schon 3f9c2a7d1e04 an.
+INDEXES = [
+    # Impfungen eines Nutzers (Dashboard, Impfpass, Löschen) samt Join auf vaccines
+    ('ix_vaccinations_user_id_vaccine_id', 'vaccinations', ['user_id', 'vaccine_id']),
+    # Termine einer Impfung; COUNT/MAX(date) im Impfprofil als Index-Only-Scan
+    ('ix_vaccination_dates_vaccination_id_date', 'vaccination_dates', ['vaccination_id', 'date']),
+    ('ix_vaccination_requirements_illness_id', 'vaccination_requirements', ['illness_id']),
+    ('ix_vaccines_illness_id', 'vaccines', ['illness_id']),
+]
+
+
+def upgrade():
+    if op.get_context().dialect.name != 'postgresql':
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False)
+        return
+
+    # CONCURRENTLY sperrt keine Schreibzugriffe, darf aber nicht in einer Transaktion laufen.
+    # Bricht ein Build ab, bleibt ein INVALID-Index zurück: per DROP INDEX CONCURRENTLY
+    # entfernen und die Migration erneut ausführen (bereits fertige Indizes werden übersprungen).
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    if op.get_context().dialect.name != 'postgresql':
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table)
+        return
+
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,32 @@
+"""Add catalog_revision
+
+Revision ID: f7c1d3e8a924
+Revises: e5a8c3f19b60
+Create Date: 2026-10-18 19:12:40.331907
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7c1d3e8a924'
+down_revision = 'e5a8c3f19b60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    catalog_revision = op.create_table('catalog_revision',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('revision', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(catalog_revision, [{'id': 1, 'revision': 0, 'updated_at': datetime.utcnow()}])
+
+
+def downgrade():
+    op.drop_table('catalog_revision')
@@ -1,8 +1,10 @@
 from extensions import db
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
 from datetime import datetime
 
+from services.passwords import hash_password
+
 
 # =====================
 # User
@@ -25,7 +27,8 @@ class User(db.Model, UserMixin):
     )
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        # Verfahren/Kosten aus PASSWORD_HASH_METHOD (services/passwords.py)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
@@ -61,7 +64,7 @@ class Vaccine(db.Model):
     name = db.Column(db.String(100), nullable=False)
     manufacturer = db.Column(db.String(100), nullable=False)
 
-    illness_id = db.Column(db.Integer, db.ForeignKey('illnesses.id'), nullable=False)
+    illness_id = db.Column(db.Integer, db.ForeignKey('illnesses.id'), nullable=False, index=True)
     illness = db.relationship("Illness", back_populates="vaccines")
 
 
@@ -70,6 +73,10 @@ class Vaccine(db.Model):
 # =====================
 class Vaccination(db.Model):
     __tablename__ = 'vaccinations'
+    __table_args__ = (
+        # Impfungen eines Nutzers; vaccine_id mit drin für den Join im Impfprofil (services/profiles.py)
+        db.Index('ix_vaccinations_user_id_vaccine_id', 'user_id', 'vaccine_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     status = db.Column(db.String(50), nullable=False)
@@ -92,6 +99,10 @@ class Vaccination(db.Model):
 # =====================
 class VaccinationDate(db.Model):
     __tablename__ = 'vaccination_dates'
+    __table_args__ = (
+        # Termine einer Impfung; deckt COUNT/MAX(date) im Impfprofil ohne Tabellenzugriff ab
+        db.Index('ix_vaccination_dates_vaccination_id_date', 'vaccination_id', 'date'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False)
@@ -126,6 +137,10 @@ class Country(db.Model):
 # =====================
 class VaccinationRequirement(db.Model):
     __tablename__ = 'vaccination_requirements'
+    __table_args__ = (
+        # Ziel für INSERT ... ON CONFLICT im Katalog-Import (crawler/catalog_loader.py)
+        db.UniqueConstraint('country_id', 'illness_id', name='uq_vaccination_requirements_country_illness'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -134,10 +149,12 @@ class VaccinationRequirement(db.Model):
         db.ForeignKey('countries.id'),
         nullable=False
     )
+    # country_id ist über uq_vaccination_requirements_country_illness (country_id, illness_id) indiziert
     illness_id = db.Column(
         db.Integer,
         db.ForeignKey('illnesses.id'),
-        nullable=False
+        nullable=False,
+        index=True
     )
 
     validity_period_months = db.Column(db.Integer, nullable=True)
@@ -148,6 +165,72 @@ class VaccinationRequirement(db.Model):
     illness = db.relationship("Illness", back_populates="requirements")
 
 
+# =====================
+# CatalogRevision (eine Zeile; Zähler für Änderungen am Katalog, services/catalog.py)
+# =====================
+class CatalogRevision(db.Model):
+    __tablename__ = 'catalog_revision'
+
+    id = db.Column(db.Integer, primary_key=True)
+    # Wird von crawler/catalog_loader.py in derselben Transaktion wie die Änderungen erhöht
+    revision = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+# =====================
+# UserCountryCompliance (Read-Model für Dashboard/Einreise-Karte)
+# =====================
+class UserCountryCompliance(db.Model):
+    __tablename__ = 'user_country_compliance'
+
+    user_id = db.Column(
+        db.Integer,
+        db.ForeignKey('users.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    # Eigener Index für ON DELETE CASCADE beim Löschen eines Landes (der PK beginnt mit user_id)
+    country_id = db.Column(
+        db.Integer,
+        db.ForeignKey('countries.id', ondelete='CASCADE'),
+        primary_key=True,
+        index=True
+    )
+
+    iso_code = db.Column(db.String(3), nullable=False)
+    met = db.Column(db.Integer, nullable=False)
+    total = db.Column(db.Integer, nullable=False)
+    # Bis einschließlich diesem Tag bleibt `met` gültig (NULL = läuft nicht ab)
+    valid_until = db.Column(db.Date, nullable=True)
+    catalog_version = db.Column(db.String(40), nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+# =====================
+# OutboundMail (Warteschlange für ausgehende Mails, services/mail_queue.py)
+# =====================
+class OutboundMail(db.Model):
+    __tablename__ = 'outbound_mail'
+    __table_args__ = (
+        # Worker sucht fällige Mails: WHERE status = 'pending' AND next_attempt_at <= now
+        db.Index('ix_outbound_mail_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    sender = db.Column(db.String(255), nullable=False)
+    recipient = db.Column(db.String(255), nullable=False)
+    reply_to = db.Column(db.String(255), nullable=True)
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+
+    # pending -> sent, oder failed nach MAIL_MAX_ATTEMPTS bzw. dauerhafter Ablehnung
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+
 # Backwards-compatibility aliases for older German names used elsewhere in the codebase
 # `Impfpass` mapped to `Vaccination` and `Impfrequirements` mapped to `VaccinationRequirement`
 Impfpass = Vaccination
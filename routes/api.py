@@ -0,0 +1,106 @@
+import hashlib
+import json
+from datetime import date
+
+from flask import Blueprint, Response, abort, current_app, request
+from flask_login import login_required, current_user
+
+from db_routing import pool_stats, read_only, routing_engines, routing_stats
+from extensions import db
+from services.catalog import get_catalog_snapshot
+from services.compliance import compute_compliance
+from services.country_index import DEFAULT_LIMIT, MAX_LIMIT, get_country_index
+from services.identity_cache import get_identity_stats
+from services.profiles import vaccination_version
+
+api_bp = Blueprint("api_bp", __name__, url_prefix="/api")
+
+
+def _json_response(payload) -> Response:
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    return Response(body, mimetype="application/json")
+
+
+# =====================================================
+# Compliance pro Land (für Dashboard-/Einreise-Karte)
+# =====================================================
+
+def _compliance_etag(vaccinations: tuple, catalog_tag: str, today: date, mode: str) -> str:
+    """
+    Starker ETag aus allem, was das Ergebnis beeinflusst: Stand der Impfungen des
+    Nutzers (services.profiles.vaccination_version), Katalogversion, Stichtag
+    (Gültigkeitsfristen) und Compliance-Modus.
+    """
+    raw = repr((vaccinations, catalog_tag, today.isoformat(), mode)).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
+
+
+@api_bp.route("/compliance")
+@login_required
+@read_only
+def compliance():
+    """
+    {"countries": {"DEU": [met, total], ...}} – Prozent und fehlende Anforderungen
+    rechnet der Client daraus. Bei passendem If-None-Match gibt es 304 nach
+    einer einzigen Zählabfrage, ohne Impfprofil und ohne Auswertung.
+    """
+    today = date.today()
+    mode = current_app.config.get("COMPLIANCE_MODE", "python")
+    snapshot = get_catalog_snapshot()
+    etag = _compliance_etag(vaccination_version(current_user.id), snapshot.tag, today, mode)
+
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        result = compute_compliance(current_user.id, today)
+        response = _json_response({
+            "countries": {
+                iso_code: [met, total]
+                for iso_code, met, total in zip(result.iso_codes, result.met.tolist(), result.total.tolist())
+            }
+        })
+
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+# =====================================================
+# Länder-Autocomplete
+# =====================================================
+
+@api_bp.route("/countries/search")
+@read_only
+def country_search():
+    """
+    {"results": [{"label", "iso_code", "alias"}, ...]} – Präfixsuche über
+    Ländernamen und Aliase aus dem Speicher, ohne Datenbankzugriff pro Anfrage.
+    """
+    query = request.args.get("q", "")
+    limit = min(request.args.get("limit", DEFAULT_LIMIT, type=int), MAX_LIMIT)
+    matches = get_country_index().search(query, limit=max(limit, 1))
+
+    response = _json_response({"results": [match._asdict() for match in matches]})
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return response
+
+
+# =====================================================
+# Pool-Statistik (nur mit DB_POOL_STATS_ENABLED)
+# =====================================================
+
+@api_bp.route("/db/pool")
+def db_pool():
+    """
+    Checkout-Wartezeiten und Auslastung pro Bind, zum Dimensionieren der Pools;
+    dazu Trefferquote und Alter des User-Caches (gesparte Identitätsabfragen).
+    """
+    if not current_app.config.get("DB_POOL_STATS_ENABLED", False):
+        abort(404)
+    response = _json_response({
+        "pools": pool_stats(routing_engines(db)),
+        "routing": routing_stats,
+        "identity": get_identity_stats(),
+    })
+    response.headers["Cache-Control"] = "no-store"
+    return response
@@ -1,14 +1,21 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session
+from flask import Blueprint, Response, abort, current_app, render_template, request, redirect, url_for, flash, session
 from models import User
 from extensions import db
 from flask_login import login_user, login_required, current_user, logout_user
+from werkzeug.exceptions import ServiceUnavailable
+from services.passwords import PasswordVerifierBusy, check_and_upgrade
+from services.qr import DEFAULT_CACHE_MAX, FORMATS, qr_etag, render_qr_cached
+from services.rate_limit import enforce as enforce_rate_limit
 import pyotp
-import qrcode
-import io
-import base64
 
 auth_bp = Blueprint('auth_bp', __name__)
 
+# Antwort bei ausgelastetem Hash-Pool: 503 mit Retry-After
+LOGIN_RETRY_AFTER_SECONDS = 2
+
+# QR-Bild im Browser-Cache halten (enthält das Secret, daher nur "private")
+QR_MAX_AGE_SECONDS = 600
+
 @auth_bp.route('/register', methods=['GET', 'POST'])
 def register():
     print("Register route accessed")
@@ -59,13 +66,20 @@ def login():
     if request.method == 'POST':
         email = request.form['email']
         password = request.form['password']
+        # Drosselung pro IP und E-Mail – vor jeder DB-Abfrage und Hash-Prüfung
+        enforce_rate_limit("login", account=email)
         print("Login-POST empfangen")
         print("E-Mail:", email)
-        print("Passwort:", password)
 
         user = User.query.filter_by(email=email).first()
         print("User aus der Datenbank:", user)
-        if user and user.check_password(password):
+        try:
+            # Prüfung auf dem begrenzten Hash-Pool; veraltete Hashes werden dabei erneuert
+            password_ok = check_and_upgrade(user, password)
+        except PasswordVerifierBusy:
+            raise ServiceUnavailable(retry_after=LOGIN_RETRY_AFTER_SECONDS)
+        if password_ok:
+            db.session.commit()
             if user.mfa_enabled:
                 print("User has MFA enabled, redirecting to challenge")
                 session['preauth_user_id'] = user.id
@@ -89,6 +103,9 @@ def mfa_challenge():
     user_id = session.get("preauth_user_id")
     if not user_id:
         return redirect(url_for("auth_bp.login"))
+    if request.method == "POST":
+        # Drosselung pro IP und Konto – vor DB-Abfrage und TOTP-Prüfung
+        enforce_rate_limit("mfa", account=str(user_id))
     user = User.query.get(user_id)
     print("Rendering MFA challenge for user:", user.email)
     if not user or not user.mfa_enabled or not user.mfa_secret:
@@ -120,16 +137,27 @@ def mfa_setup():
     if not current_user.mfa_secret:
         current_user.mfa_secret = pyotp.random_base32()
         db.session.commit()
-    totp = pyotp.TOTP(current_user.mfa_secret)
-    provisioning_uri = totp.provisioning_uri(
-        name=current_user.email,
-        issuer_name="ImmunTrack"
-    )
-    img = qrcode.make(provisioning_uri)
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    qr_b64 = base64.b64encode(buf.getvalue()).decode("utf-8")
-    return render_template("mfa_setup.html", qr_b64=qr_b64)
+    return render_template("mfa_setup.html")
+
+def _provisioning_uri(user) -> str:
+    return pyotp.TOTP(user.mfa_secret).provisioning_uri(name=user.email, issuer_name="ImmunTrack")
+
+@auth_bp.route("/mfa/qr.<fmt>")
+@login_required
+def mfa_qr(fmt):
+    """QR-Code zum laufenden MFA-Setup als eigenes, im Browser cachebares Bild."""
+    if fmt not in FORMATS or current_user.mfa_enabled or not current_user.mfa_secret:
+        abort(404)
+    provisioning_uri = _provisioning_uri(current_user)
+    etag = qr_etag(provisioning_uri, fmt)
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        max_entries = current_app.config.get("QR_CACHE_MAX", DEFAULT_CACHE_MAX)
+        response = Response(render_qr_cached(provisioning_uri, fmt, max_entries), mimetype=FORMATS[fmt])
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = f"private, max-age={QR_MAX_AGE_SECONDS}"
+    return response
 
 @auth_bp.route("/mfa/verify-setup", methods=["POST"])
 @login_required
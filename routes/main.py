@@ -1,14 +1,15 @@
 from datetime import date, datetime, timedelta
 
-import os
-import smtplib
-from email.message import EmailMessage
-
 from flask import Blueprint, render_template, request, redirect, flash, url_for
 from flask_login import login_required, current_user
 from sqlalchemy.orm import joinedload
 
+from db_routing import read_only
 from extensions import db
+from services.catalog import RequirementEntry, get_catalog_snapshot
+from services.compliance_store import stage_user_compliance
+from services.mail_queue import enqueue_mail
+from services.response_cache import cached_page
 from models import (
     User,
     Impfpass,                 # Alias -> Vaccination
@@ -26,39 +27,48 @@ main_bp = Blueprint("main_bp", __name__)
 # =====================================================
 # Öffentliche Seiten
 # =====================================================
+# @cached_page: fertiges HTML pro Deploy im Speicher (services/response_cache.py);
+# nur für Seiten ohne nutzerabhängigen Inhalt.
 
 @main_bp.route("/")
 @main_bp.route("/landingpage")
+@cached_page()
 def landingpage():
     return render_template("info/navigation-bar/landingpage.html")
 
 
 @main_bp.route("/about")
+@cached_page()
 def about():
     return render_template("info/navigation-bar/about.html")
 
 
 @main_bp.route("/security")
+@cached_page()
 def security():
     return render_template("info/navigation-bar/security.html")
 
 
 @main_bp.route("/legal-notice")
+@cached_page()
 def legal_notice():
     return render_template("info/footer/legal-notice.html")
 
 
 @main_bp.route("/privacy-policy")
+@cached_page()
 def privacy_policy():
     return render_template("info/footer/privacy-policy.html")
 
 
 @main_bp.route("/terms-of-use")
+@cached_page()
 def terms_of_use():
     return render_template("info/footer/terms-of-use.html")
 
 
 @main_bp.route("/copyright")
+@cached_page()
 def copyright():
     return render_template("info/footer/copyright.html")
 
@@ -75,29 +85,19 @@ def contact():
         email = request.form.get("email")
         message = request.form.get("message")
 
-        msg = EmailMessage()
-        msg["Subject"] = "Neue Kontaktanfrage bei ImmunTrack"
-        msg["From"] = os.getenv("IMT_MAIL_FROM", "mail@immuntrack.de")
-        msg["To"] = os.getenv("IMT_MAIL_TO", "mail@immuntrack.de")
-        msg.set_content(f"Von: {vorname} {name}\nE-Mail: {email}\n\nNachricht:\n{message}")
-
-        # Bitte SMTP-Zugangsdaten NICHT hardcoden:
-        smtp_host = os.getenv("IMT_SMTP_HOST", "smtp.ionos.de")
-        smtp_port = int(os.getenv("IMT_SMTP_PORT", "587"))
-        smtp_user = os.getenv("IMT_SMTP_USER")  # z.B. mail@immuntrack.de
-        smtp_pass = os.getenv("IMT_SMTP_PASS")  # Passwort aus ENV
-
+        # Nur in die Warteschlange; verschickt wird von `flask mail worker` (services/mail_queue.py)
         try:
-            with smtplib.SMTP(smtp_host, smtp_port) as server:
-                server.starttls()
-                if smtp_user and smtp_pass:
-                    server.login(smtp_user, smtp_pass)
-                server.send_message(msg)
+            enqueue_mail(
+                "Neue Kontaktanfrage bei ImmunTrack",
+                f"Von: {vorname} {name}\nE-Mail: {email}\n\nNachricht:\n{message}",
+            )
+            db.session.commit()
 
             flash("Nachricht erfolgreich gesendet!", "success")
             return redirect(url_for("main_bp.thank_you"))
 
         except Exception:
+            db.session.rollback()
             flash(
                 "Fehler beim Senden der Nachricht. Bitte versuchen Sie es erneut oder wenden Sie sich direkt an support@immuntrack.de",
                 "error"
@@ -108,6 +108,7 @@ def contact():
 
 
 @main_bp.route("/thank-you")
+@cached_page()
 def thank_you():
     return render_template("info/navigation-bar/contact/thank-you.html")
 
@@ -142,43 +143,11 @@ def forgot_password():
 # Hilfsfunktionen für Requirements-Check
 # =====================================================
 
-def _build_user_illness_profile(user_id: int) -> dict:
+def _requirement_satisfied(req: RequirementEntry, illness_profile: dict) -> bool:
     """
-    Aggregiert userbezogene Impf-Daten pro Krankheit (illness_id):
-    - dose_count: Summe aller gespeicherten Termine (VaccinationDate)
-    - last_dose_date: letztes Datum (max)
-    """
-    vaccinations = (
-        Vaccination.query
-        .filter_by(user_id=user_id)
-        .options(
-            joinedload(Vaccination.vaccine).joinedload(Vaccine.illness),
-            joinedload(Vaccination.dates)
-        )
-        .all()
-    )
-
-    profile = {}
-    for v in vaccinations:
-        if not v.vaccine:
-            continue
-
-        illness_id = v.vaccine.illness_id
-        if illness_id is None:
-            continue
-
-        entry = profile.setdefault(illness_id, {"dose_count": 0, "last_dose_date": None})
-
-        for d in (v.dates or []):
-            entry["dose_count"] += 1
-            if entry["last_dose_date"] is None or d.date > entry["last_dose_date"]:
-                entry["last_dose_date"] = d.date
-
-    return profile
+    Referenzlogik für ein einzelnes Requirement; die Routen nutzen
+    services/compliance.py (vektorisiert bzw. SQL) mit identischem Ergebnis.
 
-
-def _requirement_satisfied(req: VaccinationRequirement, illness_profile: dict) -> bool:
-    """
     Erfüllt, wenn:
     - Dosen >= required_doses
     - und (falls validity_period_months gesetzt) letzte Dosis nicht "zu alt" ist
@@ -207,26 +176,16 @@ def _requirement_satisfied(req: VaccinationRequirement, illness_profile: dict) -
 # Dashboard (nur für eingeloggte Nutzer)
 # =====================================================
 
+# @read_only steht unter @login_required: der Nutzer selbst wird noch von der
+# Primary geladen (frisch registrierte Konten fehlen evtl. noch auf der Replica).
+
 @main_bp.route("/dashboard", endpoint="dashboard")
 @login_required
+@read_only
 def dashboard():
-    illness_profile = _build_user_illness_profile(current_user.id)
-
-    countries = Country.query.options(joinedload(Country.requirements)).all()
-    impfstatus = {}
-
-    # Ziel: wie vorher – pro Land "fehlende Anforderungen" (als Zahl) für die Karte/Übersicht
-    for c in countries:
-        missing = 0
-        for req in (c.requirements or []):
-            if not _requirement_satisfied(req, illness_profile):
-                missing += 1
-
-        # Country.iso_code ist 3-stellig (z.B. "DEU"). Falls eure SVG 2-stellig nutzt,
-        # müsst ihr entweder die DB anpassen oder im Template mappen.
-        impfstatus[c.iso_code] = missing
-
-    return render_template("dashboard/dashboard.html", impfstatus=impfstatus)
+    # Der Impfstatus pro Land wird clientseitig über /api/compliance geladen
+    # (JSON mit ETag), damit die Seite selbst nichts auswerten muss.
+    return render_template("dashboard/dashboard.html")
 
 
 @main_bp.route("/account-settings", methods=["GET", "POST"])
@@ -286,6 +245,7 @@ def add_vaccine():
                 return render_template("add_vaccine.html", vaccines=vaccines)
 
         db.session.add(v)
+        stage_user_compliance(current_user.id)
         db.session.commit()
 
         flash("Impfung erfolgreich hinzugefügt!", "success")
@@ -304,6 +264,7 @@ def delete_impfung(impfung_id):
         return redirect(url_for("main_bp.manage_vaccine_records"))
 
     db.session.delete(impfung)
+    stage_user_compliance(current_user.id)
     db.session.commit()
     flash("Impfung wurde gelöscht.", "success")
     return redirect(url_for("main_bp.manage_vaccine_records"))
@@ -325,14 +286,21 @@ def meine_impfungen():
 # Requirements-Ansicht
 # =====================================================
 
+def _catalog_tag():
+    return get_catalog_snapshot().tag
+
+
+# Hängt nur vom Katalog ab: neue Katalogversion = neuer Cache-Eintrag
 @main_bp.route("/impfrequirements")
+@cached_page(version=_catalog_tag)
+@read_only
 def impfrequirements():
     requirements = (
         Impfrequirements.query
         .options(joinedload(VaccinationRequirement.country), joinedload(VaccinationRequirement.illness))
         .all()
     )
-    return render_template("impfrequirements.html", requirements=requirements)
+    return render_template("dashboard/impfrequirements.html", requirements=requirements)
 
 
 # =====================================================
@@ -341,27 +309,10 @@ def impfrequirements():
 
 @main_bp.route("/einreise_map")
 @login_required
+@read_only
 def einreise_map():
-    illness_profile = _build_user_illness_profile(current_user.id)
-
-    countries = Country.query.options(joinedload(Country.requirements)).all()
-    impfstatus = {}
-
-    for c in countries:
-        reqs = c.requirements or []
-        if not reqs:
-            impfstatus[c.iso_code] = 100
-            continue
-
-        met = 0
-        for req in reqs:
-            if _requirement_satisfied(req, illness_profile):
-                met += 1
-
-        percent = round((met / len(reqs)) * 100)
-        impfstatus[c.iso_code] = percent
-
-    return render_template("dashboard/einreise_map.html", impfstatus=impfstatus)
+    # Prozent erfüllt pro Land kommt per fetch aus /api/compliance
+    return render_template("dashboard/einreise_map.html")
 
 
 # =====================================================
@@ -381,4 +332,9 @@ def einreise_map():
 @main_bp.app_errorhandler(504)
 def handle_error(error):
     error_code = getattr(error, "code", 500)
-    return render_template("error.html", error_code=error_code), error_code
+    headers = {}
+    # z.B. 503 bei ausgelastetem Passwort-Pool: Clients sollen später erneut versuchen
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after:
+        headers["Retry-After"] = str(retry_after)
+    return render_template("error.html", error_code=error_code), error_code, headers
@@ -0,0 +1,147 @@
+"""
+Fingerprinted, vorkomprimierte statische Assets für die Weltkarte.
+
+`flask assets build` schreibt für jedes Asset in FINGERPRINTED_ASSETS eine
+Kopie mit Content-Hash im Dateinamen nach static/dist/ (plus .gz und .br; ohne
+das Paket `brotli` aus requirements.txt nur .gz) und ein manifest.json.
+Ausgeliefert werden die Dateien über /assets/ mit immutable Cache-Headern;
+in Templates liefert `asset_url(...)` den fingerprinted Namen.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+
+import click
+from flask import Blueprint, abort, current_app, request, send_file, url_for
+from flask.cli import AppGroup
+
+try:
+    import brotli
+except ImportError:  # in requirements.txt; fehlt es doch, werden nur .gz-Varianten erzeugt
+    brotli = None
+
+FINGERPRINTED_ASSETS = (
+    "map/mapdata.js",
+    "map/worldmap.js",
+    "images/world.svg",
+    "js/script.js",
+)
+
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+assets_bp = Blueprint("assets_bp", __name__)
+
+_manifest_cache = {}  # static_folder -> (mtime_ns, manifest)
+
+
+def _dist_path(static_folder: str, *parts) -> str:
+    return os.path.join(static_folder, DIST_DIR, *parts)
+
+
+def build_assets(static_folder: str) -> dict:
+    """Erzeugt fingerprinted Dateien samt .gz/.br und gibt das Manifest zurück."""
+    manifest = {}
+    for logical_name in FINGERPRINTED_ASSETS:
+        with open(os.path.join(static_folder, logical_name), "rb") as f:
+            content = f.read()
+
+        digest = hashlib.sha256(content).hexdigest()[:12]
+        stem, ext = os.path.splitext(logical_name)
+        hashed_name = f"{stem}.{digest}{ext}"
+        target = _dist_path(static_folder, hashed_name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+
+        with open(target, "wb") as f:
+            f.write(content)
+        # mtime=0, damit identischer Inhalt identische .gz-Dateien ergibt
+        with open(target + ".gz", "wb") as f:
+            f.write(gzip.compress(content, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(target + ".br", "wb") as f:
+                f.write(brotli.compress(content, quality=11))
+
+        manifest[logical_name] = hashed_name
+
+    with open(_dist_path(static_folder, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    _manifest_cache.pop(static_folder, None)
+    return manifest
+
+
+def load_manifest(static_folder: str) -> dict:
+    """
+    Manifest pro Worker cachen und nur neu lesen, wenn sich die Datei geändert hat
+    (`flask assets build` nach dem Start). Fehlt es, wird auf /static/ zurückgefallen,
+    ohne das zu cachen.
+    """
+    path = _dist_path(static_folder, MANIFEST_NAME)
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        _manifest_cache.pop(static_folder, None)
+        return {}
+    cached = _manifest_cache.get(static_folder)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    _manifest_cache[static_folder] = (mtime_ns, manifest)
+    return manifest
+
+
+@assets_bp.app_template_global()
+def asset_url(filename: str) -> str:
+    """url_for-Ersatz für Assets: fingerprinted Name, sonst normales /static/."""
+    hashed_name = load_manifest(current_app.static_folder).get(filename)
+    if hashed_name is None:
+        return url_for("static", filename=filename)
+    return url_for("assets_bp.asset", filename=hashed_name)
+
+
+@assets_bp.route("/assets/<path:filename>")
+def asset(filename):
+    """Liefert die vorkomprimierte Variante passend zu Accept-Encoding aus."""
+    path = os.path.realpath(_dist_path(current_app.static_folder, filename))
+    dist_root = os.path.realpath(_dist_path(current_app.static_folder))
+    if filename == MANIFEST_NAME or not path.startswith(dist_root + os.sep) or not os.path.isfile(path):
+        abort(404)
+
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    accepted = request.accept_encodings
+    encoding = None
+    for candidate, suffix in (("br", ".br"), ("gzip", ".gz")):
+        if accepted[candidate] and os.path.isfile(path + suffix):
+            encoding, path = candidate, path + suffix
+            break
+
+    response = send_file(path, mimetype=mimetype, conditional=True, etag=True)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+# =====================================================
+# CLI: flask assets build
+# =====================================================
+
+assets_cli = AppGroup("assets", help="Statische Assets fingerprinten und vorkomprimieren.")
+
+
+@assets_cli.command("build")
+def build_command():
+    """Schreibt static/dist/ inkl. manifest.json neu."""
+    manifest = build_assets(current_app.static_folder)
+    for logical_name, hashed_name in sorted(manifest.items()):
+        click.echo(f"{logical_name} -> {DIST_DIR}/{hashed_name}")
+    if brotli is None:
+        click.echo("Hinweis: Paket 'brotli' nicht installiert, nur .gz-Varianten erzeugt.")
@@ -0,0 +1,163 @@
+"""
+Prozesslokaler Snapshot des Länder-/Requirement-Katalogs.
+
+Der Katalog ändert sich nur, wenn der Crawler neue Daten lädt. Statt bei jedem
+Seitenaufruf hunderte ORM-Objekte zu hydrieren, wird pro Worker ein
+unveränderlicher Snapshot aus schlanken Tupeln gehalten und nur neu gebaut,
+wenn sich die Datenversion ändert.
+"""
+import hashlib
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from flask import current_app
+from sqlalchemy import func, select
+
+from extensions import db
+from models import CatalogRevision, Country, VaccinationRequirement
+
+
+class RequirementEntry(NamedTuple):
+    id: int
+    illness_id: int
+    required_doses: int
+    validity_period_months: Optional[int]
+
+
+class CountryEntry(NamedTuple):
+    id: int
+    iso_code: str
+    name: str
+    requirements: tuple
+
+
+class CatalogSnapshot(NamedTuple):
+    version: tuple
+    countries: tuple
+    built_at: float
+
+    @property
+    def tag(self) -> str:
+        """Kompakte, stabile Kennung der Datenversion (z.B. für Read-Models und ETags)."""
+        return catalog_tag(self.version)
+
+
+def catalog_tag(version: tuple) -> str:
+    return hashlib.sha1(repr(version).encode("utf-8")).hexdigest()
+
+
+_lock = threading.Lock()
+_snapshot: Optional[CatalogSnapshot] = None
+_last_version_check = 0.0
+
+catalog_stats = {
+    "hits": 0,            # Snapshot ohne Neuaufbau ausgeliefert
+    "misses": 0,          # kein Snapshot vorhanden (Kaltstart / nach invalidate)
+    "rebuilds": 0,        # Neuaufbau wegen geänderter Datenversion
+    "version_checks": 0,  # Abfragen der Datenversion gegen die DB
+}
+
+
+def _query_version() -> tuple:
+    """
+    Datenversion des Katalogs in einem einzigen Statement: der Zähler aus
+    catalog_revision (erhöht bei jedem Import mit Änderungen, auch wenn sich nur
+    Inhalte wie required_doses ändern) plus max(crawl_last_set) und Anzahl/max(id)
+    beider Tabellen für Änderungen außerhalb des Imports.
+    """
+    row = db.session.execute(
+        select(
+            select(func.max(CatalogRevision.revision)).scalar_subquery(),
+            select(func.max(VaccinationRequirement.crawl_last_set)).scalar_subquery(),
+            select(func.count(VaccinationRequirement.id)).scalar_subquery(),
+            select(func.max(VaccinationRequirement.id)).scalar_subquery(),
+            select(func.count(Country.id)).scalar_subquery(),
+            select(func.max(Country.id)).scalar_subquery(),
+        )
+    ).one()
+    return tuple(row)
+
+
+def _build_snapshot(version: tuple) -> CatalogSnapshot:
+    req_rows = db.session.execute(
+        select(
+            VaccinationRequirement.country_id,
+            VaccinationRequirement.id,
+            VaccinationRequirement.illness_id,
+            VaccinationRequirement.required_doses,
+            VaccinationRequirement.validity_period_months,
+        ).order_by(VaccinationRequirement.country_id, VaccinationRequirement.id)
+    ).all()
+
+    by_country = {}
+    for country_id, req_id, illness_id, required_doses, validity in req_rows:
+        by_country.setdefault(country_id, []).append(
+            RequirementEntry(req_id, illness_id, required_doses, validity)
+        )
+
+    country_rows = db.session.execute(
+        select(Country.id, Country.iso_code, Country.name).order_by(Country.id)
+    ).all()
+
+    countries = tuple(
+        CountryEntry(cid, iso_code, name, tuple(by_country.get(cid, ())))
+        for cid, iso_code, name in country_rows
+    )
+    return CatalogSnapshot(version=version, countries=countries, built_at=time.time())
+
+
+def get_catalog_snapshot() -> CatalogSnapshot:
+    """
+    Liefert den aktuellen Katalog-Snapshot.
+
+    Die Datenversion wird höchstens alle CATALOG_VERSION_CHECK_SECONDS Sekunden
+    geprüft; dazwischen laufen warme Requests komplett ohne DB-Zugriff.
+    """
+    global _snapshot, _last_version_check
+
+    interval = current_app.config.get("CATALOG_VERSION_CHECK_SECONDS", 30)
+    now = time.monotonic()
+
+    snapshot = _snapshot
+    if snapshot is not None and now - _last_version_check < interval:
+        catalog_stats["hits"] += 1
+        return snapshot
+
+    with _lock:
+        snapshot = _snapshot
+        if snapshot is not None and now - _last_version_check < interval:
+            catalog_stats["hits"] += 1
+            return snapshot
+
+        catalog_stats["version_checks"] += 1
+        version = _query_version()
+        _last_version_check = now
+
+        if snapshot is not None and snapshot.version == version:
+            catalog_stats["hits"] += 1
+            return snapshot
+
+        if snapshot is None:
+            catalog_stats["misses"] += 1
+        else:
+            catalog_stats["rebuilds"] += 1
+
+        _snapshot = _build_snapshot(version)
+        return _snapshot
+
+
+def invalidate_catalog():
+    """Verwirft den Snapshot, z.B. direkt nachdem der Crawler Daten geladen hat."""
+    global _snapshot, _last_version_check
+    with _lock:
+        _snapshot = None
+        _last_version_check = 0.0
+
+
+def get_catalog_stats() -> dict:
+    stats = dict(catalog_stats)
+    snapshot = _snapshot
+    stats["version"] = snapshot.version if snapshot else None
+    stats["countries"] = len(snapshot.countries) if snapshot else 0
+    return stats
@@ -0,0 +1,235 @@
+"""
+Vektorisierte Auswertung der Einreise-Anforderungen.
+
+Die Requirements des Katalog-Snapshots werden einmalig als spaltenweise
+NumPy-Arrays abgelegt (Land-Index, illness_id, required_doses, Gültigkeit).
+Ein Nutzerprofil wird dann in einem einzigen Durchlauf gegen alle Anforderungen
+aller Länder geprüft – dieselbe Logik wie `_requirement_satisfied`, aber ohne
+Python-Schleife pro Requirement.
+
+Alternativ (COMPLIANCE_MODE = "sql") rechnet die Datenbank das komplette
+Ergebnis in einem Statement und liefert nur (iso_code, met, total) pro Land.
+"""
+import threading
+from datetime import date
+from typing import Optional
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import and_, case, func, literal, or_, select
+from sqlalchemy.types import Date
+
+from extensions import db
+from models import Country, VaccinationRequirement
+from services.catalog import CatalogSnapshot, get_catalog_snapshot
+from services.profiles import build_illness_profile, illness_profile_select
+
+# Vereinfachte Monatsrechnung wie in routes/main.py: 30 Tage pro Monat
+DAYS_PER_MONTH = 30
+
+# Platzhalter für "kein Datum" – liegt vor jedem realen Schwellwert
+_NO_DATE = np.iinfo(np.int64).min // 2
+
+
+# Platzhalter für "läuft nicht ab" beim Gültigkeitsende
+_NO_EXPIRY = np.iinfo(np.int64).max
+
+
+class ComplianceResult:
+    """
+    Ergebnis pro Land: erfüllte (`met`) und gesamte (`total`) Anforderungen.
+    `valid_until` (optional, Ordinaltage) gibt an, bis wann `met` spätestens
+    unverändert bleibt, weil danach eine erfüllte Anforderung abläuft.
+    """
+
+    __slots__ = ("iso_codes", "met", "total", "valid_until")
+
+    def __init__(self, iso_codes: tuple, met: np.ndarray, total: np.ndarray,
+                 valid_until: Optional[np.ndarray] = None):
+        self.iso_codes = iso_codes
+        self.met = met
+        self.total = total
+        self.valid_until = valid_until
+
+    def missing(self) -> dict:
+        """ISO-Code -> Anzahl fehlender Anforderungen (Dashboard)."""
+        return dict(zip(self.iso_codes, (self.total - self.met).tolist()))
+
+    def percent(self) -> dict:
+        """ISO-Code -> Prozent erfüllt, Länder ohne Anforderungen = 100 (Einreise-Karte)."""
+        total = self.total
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.rint((self.met / total) * 100)
+        percent = np.where(total == 0, 100, ratio).astype(np.int64)
+        return dict(zip(self.iso_codes, percent.tolist()))
+
+    def valid_until_dates(self) -> list:
+        """Gültigkeitsende pro Land als date (None = läuft nicht ab)."""
+        if self.valid_until is None:
+            return [None] * len(self.iso_codes)
+        return [None if v == _NO_EXPIRY else date.fromordinal(v) for v in self.valid_until.tolist()]
+
+
+class RequirementMatrix:
+    """Spaltenweise Darstellung aller Requirements eines Katalog-Snapshots."""
+
+    __slots__ = (
+        "version", "country_ids", "iso_codes", "country_idx", "illness_pos", "required_doses",
+        "validity_days", "has_validity", "totals", "illness_ids", "_illness_lookup",
+    )
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.version = snapshot.version
+        self.country_ids = tuple(c.id for c in snapshot.countries)
+        self.iso_codes = tuple(c.iso_code for c in snapshot.countries)
+
+        country_idx, illness_ids, doses, validity = [], [], [], []
+        for idx, country in enumerate(snapshot.countries):
+            for req in country.requirements:
+                country_idx.append(idx)
+                illness_ids.append(req.illness_id)
+                doses.append(req.required_doses)
+                validity.append(-1 if req.validity_period_months is None else int(req.validity_period_months))
+
+        validity = np.asarray(validity, dtype=np.int64)
+        self.country_idx = np.asarray(country_idx, dtype=np.intp)
+        self.required_doses = np.asarray(doses, dtype=np.int64)
+        self.has_validity = validity >= 0
+        self.validity_days = np.where(self.has_validity, validity * DAYS_PER_MONTH, 0)
+        self.totals = np.bincount(self.country_idx, minlength=len(self.iso_codes)).astype(np.int64)
+
+        # illness_id -> kompakte Position, damit das Profil als dichtes Array vorliegt
+        self.illness_ids, self.illness_pos = np.unique(
+            np.asarray(illness_ids, dtype=np.int64), return_inverse=True
+        )
+        self._illness_lookup = {int(i): pos for pos, i in enumerate(self.illness_ids)}
+
+    def evaluate(self, illness_profile: dict, today: Optional[date] = None) -> ComplianceResult:
+        """
+        Bewertet ein Profil aus `_build_user_illness_profile` gegen alle Requirements.
+        """
+        today = today or date.today()
+        n_illnesses = len(self.illness_ids)
+
+        known = np.zeros(n_illnesses, dtype=bool)
+        dose_count = np.zeros(n_illnesses, dtype=np.int64)
+        last_dose = np.full(n_illnesses, _NO_DATE, dtype=np.int64)
+        for illness_id, entry in illness_profile.items():
+            pos = self._illness_lookup.get(illness_id)
+            if pos is None:
+                continue
+            known[pos] = True
+            dose_count[pos] = entry["dose_count"]
+            if entry["last_dose_date"] is not None:
+                last_dose[pos] = entry["last_dose_date"].toordinal()
+
+        pos = self.illness_pos
+        satisfied = known[pos] & (dose_count[pos] >= self.required_doses)
+        threshold = today.toordinal() - self.validity_days
+        satisfied &= ~self.has_validity | (last_dose[pos] >= threshold)
+
+        met = np.bincount(
+            self.country_idx, weights=satisfied, minlength=len(self.iso_codes)
+        ).astype(np.int64)
+
+        # Frühestes Ablaufdatum einer erfüllten, befristeten Anforderung pro Land
+        expiring = satisfied & self.has_validity
+        valid_until = np.full(len(self.iso_codes), _NO_EXPIRY, dtype=np.int64)
+        np.minimum.at(
+            valid_until,
+            self.country_idx[expiring],
+            last_dose[pos][expiring] + self.validity_days[expiring],
+        )
+        return ComplianceResult(self.iso_codes, met, self.totals, valid_until)
+
+
+_matrix_lock = threading.Lock()
+_matrix: Optional[RequirementMatrix] = None
+
+
+def get_requirement_matrix(snapshot: Optional[CatalogSnapshot] = None) -> RequirementMatrix:
+    """Matrix zum aktuellen Snapshot; wird nur bei neuer Katalogversion neu gebaut."""
+    global _matrix
+    snapshot = snapshot or get_catalog_snapshot()
+    matrix = _matrix
+    if matrix is not None and matrix.version == snapshot.version:
+        return matrix
+    with _matrix_lock:
+        if _matrix is None or _matrix.version != snapshot.version:
+            _matrix = RequirementMatrix(snapshot)
+        return _matrix
+
+
+def evaluate_compliance(illness_profile: dict, today: Optional[date] = None) -> ComplianceResult:
+    return get_requirement_matrix().evaluate(illness_profile, today)
+
+
+# =====================================================
+# SQL-Modus: komplette Auswertung in der Datenbank
+# =====================================================
+
+def _validity_threshold(today: date, months):
+    """today - 30 * months Tage als SQL-Ausdruck (PostgreSQL bzw. SQLite als Stand-in)."""
+    days = months * DAYS_PER_MONTH
+    if db.session.get_bind().dialect.name == "sqlite":
+        return func.date(today.isoformat(), "-" + func.cast(days, db.String) + " days")
+    return literal(today, Date) - days
+
+
+def compute_compliance_sql(user_id: int, today: Optional[date] = None) -> ComplianceResult:
+    """
+    Ein Statement: Requirements aller Länder gegen die aggregierten Dosen und das
+    letzte Datum pro Krankheit des Nutzers; zurück kommen nur ~200 kleine Zeilen.
+    """
+    today = today or date.today()
+    req = VaccinationRequirement
+    profile = illness_profile_select(user_id).subquery("profile")
+
+    satisfied = and_(
+        profile.c.illness_id.isnot(None),
+        profile.c.dose_count >= req.required_doses,
+        or_(
+            req.validity_period_months.is_(None),
+            profile.c.last_dose_date >= _validity_threshold(today, req.validity_period_months),
+        ),
+    )
+    stmt = (
+        select(
+            Country.iso_code,
+            func.coalesce(func.sum(case((satisfied, 1), else_=0)), 0),
+            func.count(req.id),
+        )
+        .select_from(Country)
+        .outerjoin(req, req.country_id == Country.id)
+        .outerjoin(profile, profile.c.illness_id == req.illness_id)
+        .group_by(Country.id, Country.iso_code)
+        .order_by(Country.id)
+    )
+    rows = db.session.execute(stmt).all()
+
+    return ComplianceResult(
+        tuple(iso_code for iso_code, _, _ in rows),
+        np.fromiter((met for _, met, _ in rows), dtype=np.int64, count=len(rows)),
+        np.fromiter((total for _, _, total in rows), dtype=np.int64, count=len(rows)),
+    )
+
+
+COMPLIANCE_MODES = ("python", "sql", "materialized")
+
+
+def compute_compliance(user_id: int, today: Optional[date] = None) -> ComplianceResult:
+    """
+    Einstiegspunkt für die Routen. COMPLIANCE_MODE wählt die Engine:
+    - "python": Profil per GROUP BY + vektorisierte Auswertung im Worker
+    - "sql":    komplette Auswertung in einem SQL-Statement
+    - "materialized": Lookup in user_country_compliance (services/compliance_store.py)
+    """
+    mode = current_app.config.get("COMPLIANCE_MODE", "python")
+    if mode == "sql":
+        return compute_compliance_sql(user_id, today)
+    if mode == "materialized":
+        from services.compliance_store import get_user_compliance
+        return get_user_compliance(user_id, today)
+    if mode != "python":
+        raise ValueError(f"Unbekannter COMPLIANCE_MODE: {mode!r} (erlaubt: {COMPLIANCE_MODES})")
+    return evaluate_compliance(build_illness_profile(user_id), today)
@@ -0,0 +1,147 @@
+"""
+Persistiertes Read-Model `user_country_compliance`.
+
+Pro Nutzer und Land liegen (met, total, valid_until) vorberechnet in der DB.
+Aktualisiert wird bei Schreibzugriffen (add_vaccine, delete_impfung), nach
+Crawler-Imports (`refresh_all_user_compliance`) und lazy beim Lesen, wenn
+`valid_until` überschritten ist oder sich die Katalogversion geändert hat.
+"""
+from datetime import date, datetime
+from typing import Optional
+
+import click
+import numpy as np
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import delete, insert, select
+
+from db_routing import use_primary
+from extensions import db
+from models import User, UserCountryCompliance
+from services.catalog import catalog_tag, get_catalog_snapshot
+from services.compliance import ComplianceResult, RequirementMatrix, get_requirement_matrix
+from services.profiles import build_illness_profile, build_illness_profiles
+
+store_stats = {
+    "hits": 0,              # Ergebnis direkt aus dem Read-Model
+    "lazy_refreshes": 0,    # beim Lesen neu berechnet (abgelaufen / neue Katalogversion / fehlt)
+    "user_refreshes": 0,    # Neuberechnungen einzelner Nutzer insgesamt
+}
+
+
+def _write_results(results: dict, matrix: RequirementMatrix):
+    """Ersetzt die Zeilen der übergebenen Nutzer durch die neuen Ergebnisse."""
+    tag = catalog_tag(matrix.version)
+    now = datetime.utcnow()
+
+    rows = []
+    for user_id, result in results.items():
+        for country_id, iso_code, met, total, valid_until in zip(
+            matrix.country_ids, result.iso_codes, result.met.tolist(),
+            result.total.tolist(), result.valid_until_dates(),
+        ):
+            rows.append({
+                "user_id": user_id,
+                "country_id": country_id,
+                "iso_code": iso_code,
+                "met": met,
+                "total": total,
+                "valid_until": valid_until,
+                "catalog_version": tag,
+                "computed_at": now,
+            })
+
+    db.session.execute(
+        delete(UserCountryCompliance).where(UserCountryCompliance.user_id.in_(list(results)))
+    )
+    if rows:
+        db.session.execute(insert(UserCountryCompliance), rows)
+    store_stats["user_refreshes"] += len(results)
+
+
+def refresh_user_compliance(user_id: int, today: Optional[date] = None, commit: bool = True) -> ComplianceResult:
+    """Berechnet das Read-Model eines Nutzers neu; mit commit=False bleibt die Transaktion offen."""
+    matrix = get_requirement_matrix()
+    result = matrix.evaluate(build_illness_profile(user_id), today)
+    _write_results({user_id: result}, matrix)
+    if commit:
+        db.session.commit()
+    return result
+
+
+def stage_user_compliance(user_id: int) -> None:
+    """
+    Für add_vaccine/delete_impfung vor deren Commit: im Modus "materialized" wird das
+    Read-Model in derselben Transaktion wie die Impfung geschrieben. Die anderen Modi
+    lesen nicht aus user_country_compliance, dort bleibt es bei der Impfung allein.
+    """
+    if current_app.config.get("COMPLIANCE_MODE", "python") != "materialized":
+        return
+    db.session.flush()
+    refresh_user_compliance(user_id, commit=False)
+
+
+def refresh_all_user_compliance(batch_size: int = 500, today: Optional[date] = None) -> int:
+    """Baut das Read-Model für alle Nutzer neu auf (nach Crawler-Imports oder per CLI)."""
+    matrix = get_requirement_matrix()
+    user_ids = db.session.execute(select(User.id).order_by(User.id)).scalars().all()
+
+    for start in range(0, len(user_ids), batch_size):
+        profiles = build_illness_profiles(user_ids[start:start + batch_size])
+        results = {
+            user_id: matrix.evaluate(profile, today)
+            for user_id, profile in profiles.items()
+        }
+        _write_results(results, matrix)
+        db.session.commit()
+
+    return len(user_ids)
+
+
+def get_user_compliance(user_id: int, today: Optional[date] = None) -> ComplianceResult:
+    """
+    Ein indizierter Lookup pro Nutzer (PK user_id, country_id). Ist ein Eintrag
+    abgelaufen oder gehört er zu einer alten Katalogversion, wird neu berechnet.
+    """
+    today = today or date.today()
+    snapshot = get_catalog_snapshot()
+    ucc = UserCountryCompliance
+
+    rows = db.session.execute(
+        select(ucc.iso_code, ucc.met, ucc.total, ucc.valid_until, ucc.catalog_version)
+        .where(ucc.user_id == user_id)
+        .order_by(ucc.country_id)
+    ).all()
+
+    tag = snapshot.tag
+    stale = (not rows and snapshot.countries) or any(
+        row.catalog_version != tag or (row.valid_until is not None and row.valid_until < today)
+        for row in rows
+    )
+    if stale:
+        store_stats["lazy_refreshes"] += 1
+        # Schreibt: Profil und Katalog für die Neuberechnung nicht von der (evtl. nachhinkenden) Replica
+        with use_primary():
+            return refresh_user_compliance(user_id, today)
+
+    store_stats["hits"] += 1
+    return ComplianceResult(
+        tuple(row.iso_code for row in rows),
+        np.fromiter((row.met for row in rows), dtype=np.int64, count=len(rows)),
+        np.fromiter((row.total for row in rows), dtype=np.int64, count=len(rows)),
+    )
+
+
+# =====================================================
+# CLI: flask compliance rebuild
+# =====================================================
+
+compliance_cli = AppGroup("compliance", help="Read-Model user_country_compliance verwalten.")
+
+
+@compliance_cli.command("rebuild")
+@click.option("--batch-size", default=500, show_default=True, help="Nutzer pro Transaktion.")
+def rebuild_command(batch_size):
+    """Berechnet user_country_compliance für alle Nutzer neu."""
+    count = refresh_all_user_compliance(batch_size=batch_size)
+    click.echo(f"user_country_compliance für {count} Nutzer neu aufgebaut.")
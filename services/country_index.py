@@ -0,0 +1,137 @@
+"""
+Alias- und Präfixindex über die Länderliste des Auswärtigen Amts.
+
+`crawler/traveladvice.json` enthält pro Land mehrere Einträge (Umlaut- und
+Transkriptionsvarianten, "Dubai: siehe Vereinigte Arabische Emirate", ...),
+die über `value` zusammengehören; `label` ist der kanonische Name. Alle Namen,
+Klammerzusätze und Wortanfänge werden mit `normalize_name` normalisiert und als
+sortiertes Array abgelegt – eine Präfixsuche ist damit ein `bisect` plus ein
+kurzer Scan, ganz ohne Datenbankzugriff.
+
+Das kanonische Land wird über den Namen dem `Country` des Katalog-Snapshots
+zugeordnet (ISO-Code); der Index wird neu gebaut, wenn sich der Katalog ändert.
+"""
+import json
+import os
+import re
+import threading
+from bisect import bisect_left
+from typing import NamedTuple, Optional
+
+from services.names import normalize_name
+from services.catalog import get_catalog_snapshot
+
+TRAVELADVICE_JSON = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "crawler", "traveladvice.json"
+)
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+
+class CountryMatch(NamedTuple):
+    label: str
+    iso_code: Optional[str]
+    alias: Optional[str]  # gefundener Alias, falls nicht der kanonische Name
+
+
+def _alias_names(name: str) -> list:
+    """'Balearen (Balearische Inseln): siehe Spanien' -> ['Balearen', 'Balearische Inseln']."""
+    name = name.split(":", 1)[0]
+    if ";" in name:
+        # 'Barbuda; Antigua und' ist eine umgestellte Schreibweise
+        tail, head = (part.strip() for part in name.split(";", 1))
+        name = f"{head} {tail}"
+    names = [re.sub(r"\(.*?\)", "", name).strip()]
+    names += [inner.strip() for inner in re.findall(r"\((.*?)\)", name)]
+    return [n for n in names if n]
+
+
+class CountryIndex:
+    """
+    Zwei sortierte Schlüssellisten: `primary` enthält ganze Namen, `secondary`
+    die übrigen Wortanfänge ("emirate" -> Vereinigte Arabische Emirate). Treffer
+    auf ganze Namen werden zuerst geliefert.
+    """
+
+    def __init__(self, entries, countries=()):
+        by_name = {normalize_name(c.name): c.iso_code for c in countries}
+
+        groups = {}
+        for entry in entries:
+            label = entry["label"].rstrip("*").strip()
+            group = groups.setdefault(entry["value"], {"label": label, "names": set()})
+            group["names"].add(label)
+            group["names"].update(_alias_names(entry["name"]))
+
+        self.labels = []
+        self.iso_codes = []
+        primary, secondary = {}, {}
+        for value in sorted(groups, key=lambda v: groups[v]["label"]):
+            group_id = len(self.labels)
+            label = groups[value]["label"]
+            keys = {name: normalize_name(name) for name in groups[value]["names"]}
+            iso_code = next((by_name[k] for k in [normalize_name(label), *keys.values()] if k in by_name), None)
+            self.labels.append(label)
+            self.iso_codes.append(iso_code)
+
+            # Kanonischer Name zuerst, damit gleich normalisierte Aliase ihn nicht verdecken
+            for name, key in sorted(keys.items(), key=lambda item: item[0] != label):
+                alias = None if name == label else name
+                primary.setdefault((key, group_id), alias)
+                for pos in (m.end() for m in re.finditer("-", key)):
+                    secondary.setdefault((key[pos:], group_id), alias)
+
+        # Bei gleichem Schlüssel kanonische Namen vor Aliasen ("Hongkong" vor "Hongkong: siehe China")
+        self.primary = sorted((key, alias is not None, group_id, alias) for (key, group_id), alias in primary.items())
+        self.secondary = sorted((key, alias is not None, group_id, alias) for (key, group_id), alias in secondary.items())
+        self._primary_keys = [item[0] for item in self.primary]
+        self._secondary_keys = [item[0] for item in self.secondary]
+
+    def __len__(self):
+        return len(self.labels)
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> list:
+        prefix = normalize_name(query).strip("-")
+        if not prefix:
+            return []
+
+        results, seen = [], set()
+        for keys, items in ((self._primary_keys, self.primary), (self._secondary_keys, self.secondary)):
+            i = bisect_left(keys, prefix)
+            while i < len(keys) and keys[i].startswith(prefix) and len(results) < limit:
+                _, _, group_id, alias = items[i]
+                if group_id not in seen:
+                    seen.add(group_id)
+                    results.append(CountryMatch(self.labels[group_id], self.iso_codes[group_id], alias))
+                i += 1
+        return results
+
+
+def load_entries(path: str = TRAVELADVICE_JSON) -> list:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+_lock = threading.Lock()
+_index: Optional[CountryIndex] = None
+_index_tag: Optional[str] = None
+_entries: Optional[list] = None
+
+
+def get_country_index() -> CountryIndex:
+    """Index zum aktuellen Katalog-Snapshot; wird nur bei neuer Katalogversion neu gebaut."""
+    global _index, _index_tag, _entries
+
+    snapshot = get_catalog_snapshot()
+    index = _index
+    if index is not None and _index_tag == snapshot.tag:
+        return index
+
+    with _lock:
+        if _index is None or _index_tag != snapshot.tag:
+            if _entries is None:
+                _entries = load_entries()
+            _index = CountryIndex(_entries, snapshot.countries)
+            _index_tag = snapshot.tag
+        return _index
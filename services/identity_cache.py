@@ -0,0 +1,156 @@
+"""
+Prozesslokaler Cache für den Flask-Login-User-Loader.
+
+Statt bei jedem Request `User.query.get(id)` auszuführen, werden die Spaltenwerte
+des Nutzers für IDENTITY_CACHE_TTL Sekunden gehalten (LRU, höchstens
+IDENTITY_CACHE_MAX Einträge). Bei einem Treffer wird daraus ein detached
+User gebaut und mit `merge(load=False)` ohne Abfrage in die Session gehängt –
+jeder Request bekommt so ein eigenes Objekt, Lazy-Loads funktionieren wie gewohnt.
+
+Änderungen am User (MFA aktivieren, Passwort ändern, Löschen) entfernen den
+Eintrag über ORM-Events sofort; andere Worker sehen sie spätestens nach Ablauf
+der TTL. Wie oft das passiert, misst IDENTITY_CACHE_VERIFY_RATE: ein Anteil der
+Treffer wird zusätzlich gegen die DB geprüft und als `stale_hits` gezählt.
+"""
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached, object_session
+
+from db_routing import RoutingSession
+from extensions import db
+from models import User
+
+DEFAULT_TTL = 60
+DEFAULT_MAX_ENTRIES = 10_000
+
+_COLUMNS = tuple(column.key for column in User.__mapper__.column_attrs)
+
+identity_stats = {
+    "hits": 0,
+    "misses": 0,
+    "expired": 0,      # Teilmenge von misses: Eintrag vorhanden, aber älter als die TTL
+    "invalidations": 0,
+    "evicted": 0,
+    "verified": 0,     # Treffer, die stichprobenartig gegen die DB geprüft wurden
+    "stale_hits": 0,   # ... und dabei veraltet waren
+    "age_total": 0.0,  # Summe des Alters ausgelieferter Einträge (für Ø-Alter)
+    "age_max": 0.0,
+}
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # user_id -> (geladen_um, {spalte: wert})
+
+
+def _snapshot(user) -> dict:
+    return {key: getattr(user, key) for key in _COLUMNS}
+
+
+def _store(user_id: int, values: dict):
+    max_entries = current_app.config.get("IDENTITY_CACHE_MAX", DEFAULT_MAX_ENTRIES)
+    with _lock:
+        _entries.pop(user_id, None)
+        _entries[user_id] = (time.monotonic(), values)
+        while len(_entries) > max_entries:
+            _entries.popitem(last=False)
+            identity_stats["evicted"] += 1
+
+
+def invalidate_user(user_id):
+    with _lock:
+        if _entries.pop(user_id, None) is not None:
+            identity_stats["invalidations"] += 1
+
+
+def clear_identity_cache():
+    with _lock:
+        _entries.clear()
+
+
+def _from_snapshot(values: dict):
+    user = User(**values)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
+
+def load_cached_user(user_id: int):
+    ttl = current_app.config.get("IDENTITY_CACHE_TTL", DEFAULT_TTL)
+    if ttl <= 0:
+        return db.session.get(User, user_id)
+
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(user_id)
+        if entry is not None:
+            if now - entry[0] < ttl:
+                _entries.move_to_end(user_id)
+            else:
+                del _entries[user_id]
+                identity_stats["expired"] += 1
+                entry = None
+
+    if entry is None:
+        identity_stats["misses"] += 1
+        user = db.session.get(User, user_id)
+        if user is not None:
+            _store(user_id, _snapshot(user))
+        return user
+
+    loaded_at, values = entry
+    age = now - loaded_at
+    identity_stats["hits"] += 1
+    identity_stats["age_total"] += age
+    identity_stats["age_max"] = max(identity_stats["age_max"], age)
+
+    if random.random() < current_app.config.get("IDENTITY_CACHE_VERIFY_RATE", 0.0):
+        return _verify(user_id, values)
+    return _from_snapshot(values)
+
+
+def _verify(user_id: int, values: dict):
+    """Stichprobe: Treffer gegen die DB prüfen; die DB-Version wird ausgeliefert."""
+    identity_stats["verified"] += 1
+    user = db.session.get(User, user_id)
+    if user is None or _snapshot(user) != values:
+        identity_stats["stale_hits"] += 1
+        invalidate_user(user_id)
+        if user is not None:
+            _store(user_id, _snapshot(user))
+    return user
+
+
+def get_identity_stats() -> dict:
+    """
+    Zähler dieses Prozesses samt Trefferquote (hits / (hits + misses); abgelaufene
+    Einträge zählen bereits als miss). Auch die Invalidierung wirkt nur hier: ändert
+    ein anderer Worker Passwort oder Status eines Nutzers, liefert dieser Prozess
+    den alten Stand bis zum Ablauf der TTL aus.
+    """
+    stats = dict(identity_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    stats["avg_age_seconds"] = round(stats["age_total"] / stats["hits"], 3) if stats["hits"] else 0.0
+    stats["stale_rate"] = round(stats["stale_hits"] / stats["verified"], 4) if stats["verified"] else 0.0
+    stats["entries"] = len(_entries)
+    return stats
+
+
+# Jede Änderung am User verwirft den Eintrag – beim Flush und nach dem Commit
+# (sonst könnte ein paralleler Request dazwischen den alten Stand neu cachen).
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target):
+    invalidate_user(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("identity_invalidate", set()).add(target.id)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _invalidate_after_commit(session):
+    for user_id in session.info.pop("identity_invalidate", ()):
+        invalidate_user(user_id)
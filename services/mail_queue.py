@@ -0,0 +1,282 @@
+"""
+Ausgehende Mails über eine Warteschlange in der Datenbank (Tabelle outbound_mail).
+
+Routen legen Mails nur mit `enqueue_mail()` ab – das ist ein INSERT, der Request
+wartet nie auf den Mailserver. Verschickt wird von einem eigenen Prozess:
+
+    flask mail worker            # Dauerbetrieb
+    flask mail worker --once     # einen Durchlauf, z.B. per Cron
+    flask mail status
+
+Der Worker holt fällige Mails in Batches (MAIL_BATCH_SIZE), hält die
+SMTP-Verbindung über Batches hinweg offen (nach MAIL_IDLE_SECONDS ohne Arbeit wird
+sie geschlossen) und plant fehlgeschlagene Zustellungen mit exponentiellem
+Backoff neu ein. Ist der Server nicht erreichbar, wird der Rest des Batches ohne
+Versuch zurückgestellt (`deferred`, attempts bleibt gleich); lehnt er dagegen nur
+eine einzelne Mail ab, geht es über dieselbe Verbindung mit der nächsten weiter.
+Dauerhafte Ablehnungen (5xx) und Mails nach MAIL_MAX_ATTEMPTS Versuchen landen auf
+`failed`. Auf PostgreSQL sperrt jeder Worker seine Zeilen mit SKIP LOCKED, es
+können also mehrere parallel laufen.
+"""
+import random
+import smtplib
+import time
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import func, select
+
+from extensions import db
+from models import OutboundMail
+
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+mail_stats = {
+    "enqueued": 0,
+    "sent": 0,
+    "retried": 0,
+    "deferred": 0,     # ohne Versuch zurückgestellt, weil der Server nicht erreichbar war
+    "failed": 0,
+    "connections": 0,  # aufgebaute SMTP-Verbindungen (sent / connections = Wiederverwendung)
+}
+
+
+def enqueue_mail(subject: str, body: str, recipient: str = None, sender: str = None, reply_to: str = None):
+    """Mail zur Zustellung vormerken; committen muss der Aufrufer."""
+    config = current_app.config
+    mail = OutboundMail(
+        sender=sender or config["MAIL_FROM"],
+        recipient=recipient or config["MAIL_TO"],
+        reply_to=reply_to,
+        subject=subject,
+        body=body,
+        status=PENDING,
+        attempts=0,
+        next_attempt_at=datetime.utcnow(),
+    )
+    db.session.add(mail)
+    mail_stats["enqueued"] += 1
+    return mail
+
+
+def build_message(mail: OutboundMail) -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = mail.subject
+    msg["From"] = mail.sender
+    msg["To"] = mail.recipient
+    if mail.reply_to:
+        msg["Reply-To"] = mail.reply_to
+    msg.set_content(mail.body)
+    return msg
+
+
+def backoff_seconds(attempts: int, base: float, maximum: float) -> float:
+    """base * 2^(n-1), gedeckelt, mit bis zu 10 % Jitter gegen gleichzeitige Wiederholungen."""
+    delay = min(maximum, base * 2 ** max(0, attempts - 1))
+    return delay * (1 + random.random() * 0.1)
+
+
+class SmtpConnection:
+    """Eine wiederverwendete SMTP-Verbindung; wird bei Bedarf (neu) aufgebaut."""
+
+    def __init__(self, host, port, user=None, password=None, starttls=True, timeout=10.0):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.server = None
+        self.last_used = 0.0
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            config["MAIL_SMTP_HOST"],
+            config["MAIL_SMTP_PORT"],
+            config.get("MAIL_SMTP_USER"),
+            config.get("MAIL_SMTP_PASSWORD"),
+            config.get("MAIL_SMTP_STARTTLS", True),
+            config.get("MAIL_SMTP_TIMEOUT", 10.0),
+        )
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.user and self.password:
+                server.login(self.user, self.password)
+        except Exception:
+            server.close()
+            raise
+        self.server = server
+        mail_stats["connections"] += 1
+
+    def send(self, message: EmailMessage):
+        if self.server is None:
+            self._connect()
+        try:
+            self.server.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # Server hat die ruhende Verbindung beendet: einmal neu verbinden
+            self.server = None
+            self._connect()
+            self.server.send_message(message)
+        self.last_used = time.monotonic()
+
+    def close_if_idle(self, idle_seconds: float):
+        if self.server is not None and time.monotonic() - self.last_used >= idle_seconds:
+            self.close()
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except smtplib.SMTPException:
+                self.server.close()
+            except OSError:
+                pass
+            self.server = None
+
+
+def _due_batch(limit: int, now: datetime) -> list:
+    query = (
+        select(OutboundMail)
+        .where(OutboundMail.status == PENDING, OutboundMail.next_attempt_at <= now)
+        .order_by(OutboundMail.next_attempt_at, OutboundMail.id)
+        .limit(limit)
+    )
+    if db.engine.dialect.name == "postgresql":
+        query = query.with_for_update(skip_locked=True)
+    return list(db.session.scalars(query))
+
+
+def _is_permanent(error: Exception) -> bool:
+    code = getattr(error, "smtp_code", None)
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [c for c, _ in error.recipients.values()]
+        return all(500 <= c < 600 for c in codes)
+    return code is not None and 500 <= code < 600
+
+
+def process_batch(connection: SmtpConnection, now: datetime = None) -> dict:
+    """
+    Einen Batch fälliger Mails über `connection` senden und das Ergebnis in einer
+    Transaktion festschreiben. Lehnt der Server eine Mail ab (RCPT/DATA), bleibt
+    die Verbindung offen und der Batch läuft weiter. Ist der Server nicht
+    erreichbar, wird der Rest des Batches ohne weitere Verbindungsversuche
+    zurückgestellt: gleicher Termin wie die gescheiterte Mail, ohne dass ein
+    Versuch gezählt wird.
+    """
+    config = current_app.config
+    now = now or datetime.utcnow()
+    batch = _due_batch(config["MAIL_BATCH_SIZE"], now)
+    result = {"sent": 0, "retried": 0, "deferred": 0, "failed": 0}
+    unreachable = None
+    deferred_until = None
+
+    for mail in batch:
+        if unreachable is not None:
+            mail.next_attempt_at = deferred_until
+            result["deferred"] += 1
+            continue
+
+        error = None
+        try:
+            connection.send(build_message(mail))
+        except smtplib.SMTPServerDisconnected as exc:
+            connection.close()
+            error = unreachable = exc
+        except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused) as exc:
+            # Antwort des Servers; smtplib hat danach RSET geschickt, die Verbindung bleibt nutzbar
+            error = exc
+            if connection.server is None:
+                # Schon der Verbindungsaufbau (Begrüßung/STARTTLS/Login) ist gescheitert
+                unreachable = exc
+        except OSError as exc:
+            # Netzwerkfehler, Timeout und übrige SMTPException (SMTPException erbt von OSError)
+            connection.close()
+            error = unreachable = exc
+
+        if error is None:
+            mail.status, mail.sent_at, mail.last_error = SENT, now, None
+            mail.attempts += 1
+            result["sent"] += 1
+            continue
+
+        mail.attempts += 1
+        mail.last_error = f"{type(error).__name__}: {error}"[:1000]
+        # Fehler beim Verbindungsaufbau (auch 5xx beim Login) betreffen den Server, nicht die Mail
+        permanent = error is not unreachable and _is_permanent(error)
+        if permanent or mail.attempts >= config["MAIL_MAX_ATTEMPTS"]:
+            mail.status = FAILED
+            result["failed"] += 1
+        else:
+            delay = backoff_seconds(mail.attempts, config["MAIL_BACKOFF_SECONDS"], config["MAIL_BACKOFF_MAX_SECONDS"])
+            mail.next_attempt_at = now + timedelta(seconds=delay)
+            result["retried"] += 1
+        if unreachable is not None:
+            # Der Rest des Batches kommt zusammen mit dieser Mail wieder dran
+            deferred_until = mail.next_attempt_at
+            if mail.status == FAILED:
+                deferred_until = now + timedelta(seconds=config["MAIL_BACKOFF_SECONDS"])
+
+    db.session.commit()
+    for key, value in result.items():
+        mail_stats[key] += value
+    if batch:
+        current_app.logger.info(
+            "Mail-Queue: %(sent)d gesendet, %(retried)d neu eingeplant, %(deferred)d zurückgestellt, "
+            "%(failed)d fehlgeschlagen", result,
+        )
+    return result
+
+
+def run_worker(once: bool = False):
+    config = current_app.config
+    connection = SmtpConnection.from_config(config)
+    try:
+        while True:
+            result = process_batch(connection)
+            if sum(result.values()) < config["MAIL_BATCH_SIZE"]:
+                # Keine fälligen Mails mehr: warten, ruhende Verbindung irgendwann schließen
+                if once:
+                    return
+                connection.close_if_idle(config["MAIL_IDLE_SECONDS"])
+                time.sleep(config["MAIL_POLL_SECONDS"])
+    finally:
+        connection.close()
+
+
+def queue_status() -> dict:
+    rows = db.session.execute(
+        select(OutboundMail.status, func.count()).group_by(OutboundMail.status)
+    ).all()
+    return {status: count for status, count in rows}
+
+
+# =====================================================
+# CLI: flask mail worker / flask mail status
+# =====================================================
+
+mail_cli = AppGroup("mail", help="Warteschlange für ausgehende Mails.")
+
+
+@mail_cli.command("worker")
+@click.option("--once", is_flag=True, help="Nur fällige Mails senden und dann beenden.")
+def worker_command(once):
+    """Verschickt Mails aus outbound_mail."""
+    run_worker(once=once)
+
+
+@mail_cli.command("status")
+def status_command():
+    """Anzahl Mails pro Status."""
+    for status, count in sorted(queue_status().items()):
+        click.echo(f"{status:<8} {count}")
@@ -0,0 +1,40 @@
+"""
+Normalisierung von Länder- und Krankheitsnamen, gemeinsam genutzt vom Crawler
+(URL-Slugs, Abgleich mit der Datenbank) und von der Web-App (Ländersuche).
+"""
+import re
+import unicodedata
+
+
+def normalize_name(name):
+    """
+    Normalisiert einen String für eine URL:
+    - Entfernt Klammern und ihren Inhalt
+    - Konvertiert zu Kleinbuchstaben
+    - Ersetzt Umlaute (ä -> ae, etc.)
+    - Ersetzt Leerzeichen und Sonderzeichen durch Bindestriche
+    """
+    # Entfernt Inhalte in Klammern, z.B. (Reise nach)
+    name = re.sub(r'\(.*\)', '', name).strip()
+    
+    # Konvertiert zu Kleinbuchstaben
+    name = name.lower()
+    
+    # Ersetzt deutsche Umlaute
+    replacements = {
+        'ä': 'ae',
+        'ö': 'oe',
+        'ü': 'ue',
+        'ß': 'ss'
+    }
+    for char, replacement in replacements.items():
+        name = name.replace(char, replacement)
+        
+    # Normalisiert andere diakritische Zeichen (z.B. é -> e)
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('utf-8')
+    
+    # Ersetzt verbleibende ungültige Zeichen durch Bindestriche
+    name = re.sub(r'[^a-z0-9\s-]', '', name)
+    name = re.sub(r'[\s_]+', '-', name)
+    
+    return name
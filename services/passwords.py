@@ -0,0 +1,148 @@
+"""
+Passwort-Hashing mit konfigurierbaren Kosten und begrenzter Parallelität.
+
+- PASSWORD_HASH_METHOD legt Verfahren und Parameter fest (werkzeug-Syntax, z.B.
+  "scrypt:32768:8:1" oder "pbkdf2:sha256:600000"). Hashes mit anderen Parametern
+  werden beim nächsten erfolgreichen Login transparent neu berechnet.
+- Prüfen und Neuberechnen laufen auf einem kleinen Thread-Pool
+  (PASSWORD_VERIFY_WORKERS). Sind Pool und Warteschlange (PASSWORD_VERIFY_QUEUE)
+  voll, wird sofort mit PasswordVerifierBusy abgelehnt (-> 503), statt dass ein
+  Login-Ansturm alle WSGI-Worker mit Hashing blockiert. hashlib gibt dabei den
+  GIL frei, die Threads rechnen also tatsächlich parallel.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import lru_cache
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = "scrypt:32768:8:1"
+DEFAULT_SALT_LENGTH = 16
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE = 8
+DEFAULT_TIMEOUT = 10.0
+
+password_stats = {
+    "verified": 0,       # erfolgreiche Prüfungen
+    "failed": 0,         # falsches Passwort / unbekannter Nutzer
+    "rehashed": 0,       # Hash beim Login auf aktuelle Parameter gebracht
+    "rejected_busy": 0,  # abgelehnt, weil Pool und Warteschlange voll waren
+}
+
+
+class PasswordVerifierBusy(Exception):
+    """Zu viele gleichzeitige Passwortprüfungen – der Aufrufer antwortet mit 503."""
+
+
+def _config(key, default):
+    if has_app_context():
+        return current_app.config.get(key, default)
+    return default
+
+
+def hash_method() -> str:
+    return _config("PASSWORD_HASH_METHOD", DEFAULT_METHOD)
+
+
+def hash_password(password: str, method: str = None, salt_length: int = None) -> str:
+    return generate_password_hash(
+        password,
+        method=method or hash_method(),
+        salt_length=salt_length or _config("PASSWORD_HASH_SALT_LENGTH", DEFAULT_SALT_LENGTH),
+    )
+
+
+@lru_cache(maxsize=16)
+def _method_prefix(method: str) -> str:
+    """Vollständige Parameterangabe, wie sie im Hash steht ("scrypt" -> "scrypt:32768:8:1")."""
+    return generate_password_hash("", method=method, salt_length=1).split("$", 1)[0]
+
+
+def needs_rehash(stored_hash: str, method: str = None) -> bool:
+    return stored_hash.split("$", 1)[0] != _method_prefix(method or hash_method())
+
+
+@lru_cache(maxsize=16)
+def _dummy_hash(method: str) -> str:
+    return generate_password_hash("dummy-password", method=method)
+
+
+# =====================================================
+# Begrenzter Pool für die eigentliche Rechenarbeit
+# =====================================================
+
+class _VerifierPool:
+    def __init__(self, workers: int, queue: int, timeout: float):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password")
+        self.slots = threading.BoundedSemaphore(workers + queue)
+        self.timeout = timeout
+
+    def run(self, fn, *args):
+        if not self.slots.acquire(blocking=False):
+            password_stats["rejected_busy"] += 1
+            raise PasswordVerifierBusy()
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordVerifierBusy()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> _VerifierPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = _VerifierPool(
+                    _config("PASSWORD_VERIFY_WORKERS", DEFAULT_WORKERS),
+                    _config("PASSWORD_VERIFY_QUEUE", DEFAULT_QUEUE),
+                    _config("PASSWORD_VERIFY_TIMEOUT", DEFAULT_TIMEOUT),
+                )
+    return _pool
+
+
+def verify_password(stored_hash, password: str) -> bool:
+    """
+    Prüft auf dem Pool. Ohne gespeicherten Hash (unbekannte E-Mail) wird gegen
+    einen Dummy-Hash gerechnet, damit die Antwortzeit nichts über Konten verrät.
+    """
+    pool = _get_pool()
+    if stored_hash is None:
+        pool.run(check_password_hash, _dummy_hash(hash_method()), password)
+        password_stats["failed"] += 1
+        return False
+    ok = pool.run(check_password_hash, stored_hash, password)
+    password_stats["verified" if ok else "failed"] += 1
+    return ok
+
+
+def check_and_upgrade(user, password: str) -> bool:
+    """
+    Login-Prüfung für `user` (oder None). Ist das Passwort korrekt und der Hash
+    veraltet, wird `user.password_hash` neu gesetzt – committen muss der Aufrufer.
+    """
+    if not verify_password(user.password_hash if user else None, password):
+        return False
+    if needs_rehash(user.password_hash):
+        # Parameter hier auflösen – im Pool-Thread gibt es keinen App-Kontext
+        salt_length = _config("PASSWORD_HASH_SALT_LENGTH", DEFAULT_SALT_LENGTH)
+        user.password_hash = _get_pool().run(hash_password, password, hash_method(), salt_length)
+        password_stats["rehashed"] += 1
+    return True
+
+
+def get_password_stats() -> dict:
+    stats = dict(password_stats)
+    stats["method"] = _method_prefix(hash_method())
+    return stats
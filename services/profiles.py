@@ -0,0 +1,82 @@
+"""
+Impfprofile pro Krankheit direkt per GROUP BY in der Datenbank.
+
+Statt alle Vaccination-Objekte samt Vaccine, Illness und VaccinationDate zu
+laden und in Python zu zählen, liefert die DB pro illness_id nur noch
+(Anzahl Termine, letztes Datum).
+"""
+from sqlalchemy import func, select
+
+from extensions import db
+from models import Vaccination, VaccinationDate, Vaccine
+
+# Obergrenze für IN-Listen bei der Batch-Variante
+BATCH_SIZE = 1000
+
+
+def _profile_query(*extra_columns):
+    return (
+        select(
+            *extra_columns,
+            Vaccine.illness_id.label("illness_id"),
+            func.count(VaccinationDate.id).label("dose_count"),
+            func.max(VaccinationDate.date).label("last_dose_date"),
+        )
+        .select_from(Vaccination)
+        .join(Vaccine, Vaccination.vaccine_id == Vaccine.id)
+        .outerjoin(VaccinationDate, VaccinationDate.vaccination_id == Vaccination.id)
+        .group_by(*extra_columns, Vaccine.illness_id)
+    )
+
+
+def illness_profile_select(user_id: int):
+    """SELECT (illness_id, dose_count, last_dose_date) eines Nutzers, z.B. als Subquery."""
+    return _profile_query().where(Vaccination.user_id == user_id)
+
+
+def vaccination_version(user_id: int) -> tuple:
+    """
+    (Anzahl, max(id)) der Impfungen eines Nutzers. Impfungen samt Terminen werden
+    nur angelegt oder gelöscht, nie bearbeitet – jede Änderung am Impfprofil ändert
+    also auch diesen Wert. Billiger Schlüssel für ETags, ohne das Profil zu bauen.
+    """
+    count, max_id = db.session.execute(
+        select(func.count(Vaccination.id), func.max(Vaccination.id)).where(Vaccination.user_id == user_id)
+    ).one()
+    return count, max_id
+
+
+def build_illness_profile(user_id: int) -> dict:
+    """
+    Aggregiert userbezogene Impf-Daten pro Krankheit (illness_id):
+    - dose_count: Summe aller gespeicherten Termine (VaccinationDate)
+    - last_dose_date: letztes Datum (max)
+    Impfungen ohne Termin erzeugen einen Eintrag mit dose_count 0.
+    """
+    rows = db.session.execute(illness_profile_select(user_id)).all()
+    return {
+        illness_id: {"dose_count": dose_count, "last_dose_date": last_dose_date}
+        for illness_id, dose_count, last_dose_date in rows
+    }
+
+
+def build_illness_profiles(user_ids) -> dict:
+    """
+    Batch-Variante für Reports und Hintergrundjobs: user_id -> Profil.
+    Nutzer ohne Impfungen erhalten ein leeres Profil.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    profiles = {user_id: {} for user_id in user_ids}
+
+    for start in range(0, len(user_ids), BATCH_SIZE):
+        chunk = user_ids[start:start + BATCH_SIZE]
+        rows = db.session.execute(
+            _profile_query(Vaccination.user_id).where(Vaccination.user_id.in_(chunk))
+        ).all()
+        for user_id, illness_id, dose_count, last_dose_date in rows:
+            profiles[user_id][illness_id] = {
+                "dose_count": dose_count,
+                "last_dose_date": last_dose_date,
+            }
+
+    return profiles
@@ -0,0 +1,111 @@
+"""
+QR-Codes für das MFA-Setup, als kompaktes SVG oder PNG.
+
+Die Matrix wird einmal mit `qrcode` berechnet; SVG wird direkt daraus als ein
+einziger Pfad geschrieben (zusammenhängende Module einer Zeile als ein "h"-Segment),
+PNG als 1-Bit-Bild mit kleiner Modulgröße. Fertige Bilder liegen pro
+Provisioning-URI und Format in einem LRU-Cache (QR_CACHE_MAX Einträge) – ein
+Neuladen der Setup-Seite kostet damit nichts mehr.
+"""
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import qrcode
+from qrcode.constants import ERROR_CORRECT_M
+
+FORMATS = {
+    "svg": "image/svg+xml",
+    "png": "image/png",
+}
+
+DEFAULT_CACHE_MAX = 256
+PNG_BOX_SIZE = 4  # Pixel pro Modul; das Bild wird per CSS/Attribut skaliert
+BORDER = 4        # Ruhezone in Modulen (Minimum laut Spezifikation)
+
+qr_stats = {
+    "hits": 0,
+    "misses": 0,
+    "evicted": 0,
+}
+
+_lock = threading.Lock()
+_cache = OrderedDict()  # (daten, format) -> bytes
+
+
+def qr_matrix(data: str) -> list:
+    code = qrcode.QRCode(error_correction=ERROR_CORRECT_M, border=BORDER)
+    code.add_data(data)
+    code.make(fit=True)
+    return code.get_matrix()
+
+
+def matrix_to_svg(matrix: list) -> bytes:
+    size = len(matrix)
+    segments = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < size:
+            if row[x]:
+                start = x
+                while x < size and row[x]:
+                    x += 1
+                segments.append(f"M{start} {y}h{x - start}")
+            else:
+                x += 1
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+        f'<rect width="{size}" height="{size}" fill="#fff"/>'
+        f'<path stroke="#000" d="{"".join(segments)}" transform="translate(0 .5)"/>'
+        f'</svg>'
+    ).encode("utf-8")
+
+
+def matrix_to_png(matrix: list, box_size: int = PNG_BOX_SIZE) -> bytes:
+    from PIL import Image
+
+    size = len(matrix)
+    # Modus "1": 0 = schwarz; erst 1 Pixel pro Modul, dann ohne Interpolation hochskalieren
+    img = Image.new("1", (size, size), 1)
+    img.putdata([0 if cell else 1 for row in matrix for cell in row])
+    img = img.resize((size * box_size, size * box_size), Image.NEAREST)
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def render_qr(data: str, fmt: str = "svg") -> bytes:
+    """Bild ohne Cache rendern (für Benchmarks und render_qr_cached)."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unbekanntes QR-Format: {fmt}")
+    matrix = qr_matrix(data)
+    return matrix_to_svg(matrix) if fmt == "svg" else matrix_to_png(matrix)
+
+
+def render_qr_cached(data: str, fmt: str = "svg", max_entries: int = DEFAULT_CACHE_MAX) -> bytes:
+    key = (data, fmt)
+    with _lock:
+        image = _cache.get(key)
+        if image is not None:
+            _cache.move_to_end(key)
+            qr_stats["hits"] += 1
+            return image
+
+    qr_stats["misses"] += 1
+    image = render_qr(data, fmt)
+    with _lock:
+        _cache[key] = image
+        while len(_cache) > max_entries:
+            _cache.popitem(last=False)
+            qr_stats["evicted"] += 1
+    return image
+
+
+def qr_etag(data: str, fmt: str) -> str:
+    return hashlib.sha1(f"{fmt}:{data}".encode("utf-8")).hexdigest()
+
+
+def clear_qr_cache():
+    with _lock:
+        _cache.clear()
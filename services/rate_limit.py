@@ -0,0 +1,183 @@
+"""
+Token-Bucket-Drosselung für Login und MFA-Challenge.
+
+Jeder Schlüssel (IP-Adresse bzw. Konto) hat einen Eimer mit `capacity` Token,
+der gleichmäßig mit `capacity / per_seconds` Token pro Sekunde nachläuft. Jeder
+Versuch kostet ein Token; ist der Eimer leer, wird mit 429 und Retry-After
+abgelehnt – bevor eine Datenbankabfrage oder Hash-/TOTP-Prüfung stattfindet.
+
+Backends:
+- MemoryBackend: prozesslokal, LRU-begrenzt (RATE_LIMIT_MAX_KEYS)
+- RedisBackend: geteilt über alle Worker, atomar per Lua-Skript
+  (RATE_LIMIT_STORAGE_URL = "redis://..."; benötigt das Paket `redis`)
+
+Limits werden als "anzahl/sekunden" konfiguriert, z.B. "5/300".
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from flask import current_app, request
+from werkzeug.exceptions import TooManyRequests
+
+try:
+    import redis
+except ImportError:  # optional, nur für RedisBackend nötig
+    redis = None
+
+DEFAULT_MAX_KEYS = 100_000
+
+# Scope -> Config-Schlüssel des Limits pro Schlüsselart
+LIMIT_KEYS = {
+    ("login", "ip"): "RATE_LIMIT_LOGIN_IP",
+    ("login", "account"): "RATE_LIMIT_LOGIN_ACCOUNT",
+    ("mfa", "ip"): "RATE_LIMIT_MFA_IP",
+    ("mfa", "account"): "RATE_LIMIT_MFA_ACCOUNT",
+}
+
+rate_limit_stats = {
+    "allowed": 0,
+    "rejected": 0,
+    "evicted": 0,
+}
+
+
+class Limit(NamedTuple):
+    capacity: int
+    per_seconds: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.per_seconds
+
+    @classmethod
+    def parse(cls, value) -> "Limit":
+        if isinstance(value, Limit):
+            return value
+        count, seconds = str(value).split("/", 1)
+        return cls(int(count), float(seconds))
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    retry_after: float
+
+
+def _refill(tokens, last, now, limit: Limit):
+    return min(limit.capacity, tokens + (now - last) * limit.rate)
+
+
+class MemoryBackend:
+    """Eimer im Prozessspeicher; bei mehr als `max_keys` fliegt der älteste raus."""
+
+    def __init__(self, max_keys: int = DEFAULT_MAX_KEYS):
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def consume(self, key: str, limit: Limit, now: float = None) -> Decision:
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            tokens, last = self.buckets.pop(key, (limit.capacity, now))
+            tokens = _refill(tokens, last, now, limit)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self.buckets[key] = (tokens, now)
+            while len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+                rate_limit_stats["evicted"] += 1
+        return Decision(allowed, 0.0 if allowed else (1 - tokens) / limit.rate)
+
+    def reset(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class RedisBackend:
+    """Gemeinsame Eimer für alle Worker; Refill und Abbuchung atomar in Redis."""
+
+    SCRIPT = """
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'last')
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local tokens = tonumber(state[1]) or capacity
+    local last = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - last) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'last', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url: str, prefix: str = "imt:ratelimit:"):
+        if redis is None:
+            raise RuntimeError("RATE_LIMIT_STORAGE_URL=redis://... benötigt das Paket 'redis'")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.script = self.client.register_script(self.SCRIPT)
+
+    def consume(self, key: str, limit: Limit, now: float = None) -> Decision:
+        # Wanduhr statt monotonic: alle Worker müssen dieselbe Zeitbasis haben
+        now = time.time() if now is None else now
+        allowed, tokens = self.script(keys=[self.prefix + key], args=[limit.capacity, limit.rate, now])
+        tokens = float(tokens)
+        return Decision(bool(allowed), 0.0 if allowed else (1 - tokens) / limit.rate)
+
+    def reset(self):
+        for key in self.client.scan_iter(self.prefix + "*"):
+            self.client.delete(key)
+
+
+def init_rate_limit(app):
+    """Backend nach RATE_LIMIT_STORAGE_URL wählen (leer = MemoryBackend)."""
+    url = app.config.get("RATE_LIMIT_STORAGE_URL")
+    if url and url.startswith("redis"):
+        backend = RedisBackend(url)
+    else:
+        backend = MemoryBackend(app.config.get("RATE_LIMIT_MAX_KEYS", DEFAULT_MAX_KEYS))
+    app.extensions["rate_limit"] = backend
+    return backend
+
+
+def _backend():
+    backend = current_app.extensions.get("rate_limit")
+    if backend is None:
+        backend = init_rate_limit(current_app)
+    return backend
+
+
+def enforce(scope: str, account: str = None):
+    """
+    Bucht je ein Token für IP und (falls bekannt) Konto ab; ist einer der Eimer
+    leer, wird TooManyRequests (429, Retry-After) ausgelöst.
+    """
+    if not current_app.config.get("RATE_LIMIT_ENABLED", True):
+        return
+    backend = _backend()
+    keys = [("ip", request.remote_addr or "unbekannt")]
+    if account:
+        keys.append(("account", account.strip().lower()))
+
+    for kind, value in keys:
+        limit = Limit.parse(current_app.config[LIMIT_KEYS[(scope, kind)]])
+        decision = backend.consume(f"{scope}:{kind}:{value}", limit)
+        if not decision.allowed:
+            rate_limit_stats["rejected"] += 1
+            rate_limit_stats[f"rejected_{scope}_{kind}"] = rate_limit_stats.get(f"rejected_{scope}_{kind}", 0) + 1
+            raise TooManyRequests(retry_after=max(1, round(decision.retry_after)))
+    rate_limit_stats["allowed"] += 1
+
+
+def get_rate_limit_stats() -> dict:
+    stats = dict(rate_limit_stats)
+    backend = current_app.extensions.get("rate_limit")
+    if isinstance(backend, MemoryBackend):
+        stats["keys"] = len(backend.buckets)
+    return stats
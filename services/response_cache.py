@@ -0,0 +1,170 @@
+"""
+Cache für komplett gerenderte öffentliche Seiten.
+
+`@cached_page()` speichert Body, ETag und (ab RESPONSE_CACHE_GZIP_MIN_BYTES) eine
+gzip-Variante pro Pfad und Version. Die Version besteht aus RESPONSE_CACHE_VERSION
+(Deploy, IMT_DEPLOY_VERSION) und optional einer Funktion der Route, z.B. dem Tag
+des Katalog-Snapshots für /impfrequirements. Treffer werden ohne Jinja und ohne
+Datenbank ausgeliefert, bei passendem If-None-Match als 304.
+
+Umgangen wird der Cache, wenn Flash-Nachrichten auf ihre Anzeige warten (die
+Seite sähe dann anders aus) und für alles außer GET/HEAD. Der Speicher ist über
+RESPONSE_CACHE_MAX_BYTES begrenzt, verdrängt wird der am längsten ungenutzte Eintrag.
+"""
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import NamedTuple
+
+from flask import Response, current_app, make_response, request, session
+
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+DEFAULT_GZIP_MIN_BYTES = 512
+CACHE_CONTROL = "no-cache"  # speichern erlaubt, aber immer per ETag revalidieren (Flashes, Katalog)
+
+response_cache_stats = {
+    "hits": 0,
+    "not_modified": 0,  # 304 aus dem Cache
+    "misses": 0,
+    "bypassed": 0,      # Flashes ausstehend / andere Methode / deaktiviert
+    "evicted": 0,
+}
+
+
+class CachedPage(NamedTuple):
+    body: bytes
+    gzip_body: bytes  # None, wenn sich Komprimieren nicht lohnt
+    etag: str
+    mimetype: str
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzip_body or b"")
+
+
+class ResponseCache:
+    """LRU über Seiten, begrenzt auf `max_bytes` (Body plus gzip-Variante)."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            page = self.entries.get(key)
+            if page is not None:
+                self.entries.move_to_end(key)
+            return page
+
+    def put(self, key, page: CachedPage):
+        if page.size > self.max_bytes:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old.size
+            self.entries[key] = page
+            self.bytes += page.size
+            while self.bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.bytes -= evicted.size
+                response_cache_stats["evicted"] += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+
+def init_response_cache(app):
+    cache = ResponseCache(app.config.get("RESPONSE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+    app.extensions["response_cache"] = cache
+    return cache
+
+
+def _cache() -> ResponseCache:
+    cache = current_app.extensions.get("response_cache")
+    if cache is None:
+        cache = init_response_cache(current_app)
+    return cache
+
+
+def build_page(response: Response) -> CachedPage:
+    body = response.get_data()
+    etag = hashlib.sha1(body).hexdigest()
+    gzip_body = None
+    if len(body) >= current_app.config.get("RESPONSE_CACHE_GZIP_MIN_BYTES", DEFAULT_GZIP_MIN_BYTES):
+        # mtime=0: gleicher Inhalt ergibt byte-gleiches gzip
+        compressed = gzip.compress(body, compresslevel=6, mtime=0)
+        if len(compressed) < len(body):
+            gzip_body = compressed
+    return CachedPage(body, gzip_body, etag, response.mimetype)
+
+
+def page_response(page: CachedPage) -> Response:
+    if page.etag in request.if_none_match:
+        response = Response(status=304)
+    elif page.gzip_body is not None and request.accept_encodings["gzip"]:
+        response = Response(page.gzip_body, mimetype=page.mimetype)
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = Response(page.body, mimetype=page.mimetype)
+    response.set_etag(page.etag)
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if page.gzip_body is not None:
+        response.vary.add("Accept-Encoding")
+    return response
+
+
+def _cacheable_request() -> bool:
+    return (
+        request.method in ("GET", "HEAD")
+        and current_app.config.get("RESPONSE_CACHE_ENABLED", True)
+        and not session.get("_flashes")
+    )
+
+
+def cached_page(version=None):
+    """
+    Route-Decorator für Seiten, die nur vom Deploy (und ggf. `version()`) abhängen.
+    Nicht für Seiten mit nutzerabhängigem Inhalt verwenden.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not _cacheable_request():
+                response_cache_stats["bypassed"] += 1
+                return view(*args, **kwargs)
+
+            key = (
+                request.path,
+                current_app.config.get("RESPONSE_CACHE_VERSION"),
+                version() if version is not None else None,
+            )
+            cache = _cache()
+            page = cache.get(key)
+            if page is not None:
+                response_cache_stats["not_modified" if page.etag in request.if_none_match else "hits"] += 1
+                return page_response(page)
+
+            response_cache_stats["misses"] += 1
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.direct_passthrough or session.get("_flashes"):
+                return response
+            page = build_page(response)
+            cache.put(key, page)
+            return page_response(page)
+        return wrapper
+    return decorator
+
+
+def get_response_cache_stats() -> dict:
+    stats = dict(response_cache_stats)
+    cache = current_app.extensions.get("response_cache")
+    if cache is not None:
+        stats.update(entries=len(cache.entries), bytes=cache.bytes, max_bytes=cache.max_bytes)
+    return stats
@@ -0,0 +1,147 @@
+"""
+Jinja-Bytecode-Cache, Vorkompilieren beim Start und Zeitmessung pro Template.
+
+- TEMPLATE_BYTECODE_CACHE: kompilierte Templates landen in TEMPLATE_CACHE_DIR
+  (Default: instance/jinja_cache). Neue Worker und Deploys mit unveränderten
+  Templates laden dann nur noch Bytecode; geänderte Templates erkennt Jinja an
+  der Prüfsumme des Quelltexts.
+- TEMPLATE_PRELOAD: `create_app` lädt alle Templates unter templates/ vorab,
+  damit der erste Request eines Workers nicht kompilieren muss.
+- Kompilier- und Renderzeiten werden pro Template gesammelt (`template_stats`);
+  alles über TEMPLATE_SLOW_MS wird als Warnung geloggt, der Rest auf DEBUG.
+
+`init_templates(app)` muss vor dem ersten Zugriff auf `app.jinja_env` laufen,
+also vor dem Registrieren der Blueprints.
+"""
+import os
+import threading
+import time
+
+import click
+from flask import before_render_template, current_app, template_rendered
+from flask.cli import AppGroup
+from flask.templating import Environment
+from jinja2 import FileSystemBytecodeCache, TemplateError
+
+DEFAULT_SLOW_MS = 50.0
+PRELOAD_EXTENSIONS = (".html", ".svg", ".txt", ".xml")
+
+template_stats = {}  # Name -> {"compiles", "compile_ms", "renders", "render_ms_total", "render_ms_max"}
+
+_stats_lock = threading.Lock()
+_render_starts = threading.local()
+
+
+def _entry(name: str) -> dict:
+    entry = template_stats.get(name)
+    if entry is None:
+        entry = template_stats[name] = {
+            "compiles": 0, "compile_ms": 0.0, "renders": 0, "render_ms_total": 0.0, "render_ms_max": 0.0,
+        }
+    return entry
+
+
+class TimedEnvironment(Environment):
+    """Flask-Jinja-Environment, das jede echte Kompilierung (Bytecode-Cache-Miss) misst."""
+
+    def compile(self, source, name=None, filename=None, raw=False, defer_init=False):
+        started = time.perf_counter()
+        code = super().compile(source, name, filename, raw, defer_init)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if name is not None:
+            with _stats_lock:
+                entry = _entry(name)
+                entry["compiles"] += 1
+                entry["compile_ms"] += elapsed_ms
+            _log(self.app, "Template %s kompiliert in %.1f ms", name, elapsed_ms)
+        return code
+
+
+def _log(app, message, name, elapsed_ms):
+    slow_ms = app.config.get("TEMPLATE_SLOW_MS", DEFAULT_SLOW_MS)
+    if elapsed_ms >= slow_ms:
+        app.logger.warning(message, name, elapsed_ms)
+    else:
+        app.logger.debug(message, name, elapsed_ms)
+
+
+def _before_render(app, template, context, **extra):
+    stack = getattr(_render_starts, "stack", None)
+    if stack is None:
+        stack = _render_starts.stack = []
+    stack.append(time.perf_counter())
+
+
+def _after_render(app, template, context, **extra):
+    stack = getattr(_render_starts, "stack", None)
+    if not stack:
+        return
+    elapsed_ms = (time.perf_counter() - stack.pop()) * 1000
+    name = template.name or "<string>"
+    with _stats_lock:
+        entry = _entry(name)
+        entry["renders"] += 1
+        entry["render_ms_total"] += elapsed_ms
+        entry["render_ms_max"] = max(entry["render_ms_max"], elapsed_ms)
+    _log(app, "Template %s gerendert in %.1f ms", name, elapsed_ms)
+
+
+def init_templates(app):
+    """Environment-Klasse, Bytecode-Cache und Render-Messung für `app` einrichten."""
+    app.jinja_environment = TimedEnvironment
+    if app.config.get("TEMPLATE_BYTECODE_CACHE", True):
+        cache_dir = app.config.get("TEMPLATE_CACHE_DIR") or os.path.join(app.instance_path, "jinja_cache")
+        os.makedirs(cache_dir, exist_ok=True)
+        app.jinja_options = {**app.jinja_options, "bytecode_cache": FileSystemBytecodeCache(cache_dir)}
+
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+
+
+def preload_templates(app) -> dict:
+    """
+    Lädt alle Templates (aus dem Bytecode-Cache oder frisch kompiliert), damit der
+    erste Request nichts mehr übersetzen muss. Fehlerhafte Templates werden geloggt
+    und übersprungen – sie schlagen dann wie bisher erst beim Rendern fehl.
+    """
+    started = time.perf_counter()
+    env = app.jinja_env
+    loaded, failed = 0, []
+    for name in env.list_templates(extensions=[ext.lstrip(".") for ext in PRELOAD_EXTENSIONS]):
+        try:
+            env.get_template(name)
+            loaded += 1
+        except TemplateError as exc:
+            failed.append(name)
+            app.logger.warning("Template %s konnte nicht vorkompiliert werden: %s", name, exc)
+    result = {"loaded": loaded, "failed": failed, "ms": round((time.perf_counter() - started) * 1000, 1)}
+    app.logger.info("Templates vorgeladen: %(loaded)d in %(ms).1f ms", result)
+    return result
+
+
+def get_template_stats() -> dict:
+    with _stats_lock:
+        stats = {name: dict(entry) for name, entry in template_stats.items()}
+    for entry in stats.values():
+        entry["render_ms_avg"] = round(entry["render_ms_total"] / entry["renders"], 3) if entry["renders"] else 0.0
+    return stats
+
+
+# =====================================================
+# CLI: flask templates preload
+# =====================================================
+
+templates_cli = AppGroup("templates", help="Jinja-Templates vorkompilieren.")
+
+
+@templates_cli.command("preload")
+def preload_command():
+    """Füllt den Bytecode-Cache, z.B. als Schritt im Deploy vor dem Start der Worker."""
+    result = preload_templates(current_app)
+    click.echo(f"{result['loaded']} Templates in {result['ms']} ms geladen.")
+    for name in result["failed"]:
+        click.echo(f"Fehler: {name}")
+    slowest = sorted(get_template_stats().items(), key=lambda item: item[1]["compile_ms"], reverse=True)[:5]
+    for name, entry in slowest:
+        if entry["compiles"]:
+            click.echo(f"  {entry['compile_ms']:8.1f} ms  {name}")
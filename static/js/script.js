@@ -13,19 +13,32 @@ const iso3to2 = {
   LKA: "LK"
 };
 
-Object.entries(impfstatus).forEach(([landIso, percent]) => {
-  const p = Number(percent);
+// Wird aufgerufen, sobald der Impfstatus aus /api/compliance geladen ist.
+// Die Weltkarte steckt als <object id="worldmap-svg"> im Dokument; ist sie
+// noch nicht geladen, wird nach dem load-Event eingefärbt.
+function faerbeLaender(impfstatus) {
+  const svgObject = document.getElementById("worldmap-svg");
+  const svgDoc = svgObject && svgObject.contentDocument;
+  if (svgObject && !(svgDoc && svgDoc.documentElement && svgDoc.documentElement.nodeName === "svg")) {
+    svgObject.addEventListener("load", () => faerbeLaender(impfstatus), { once: true });
+    return;
+  }
+  const doc = svgDoc || document;
 
-  let farbe;
-  if (p >= 80) farbe = farben[3];      // grün
-  else if (p >= 50) farbe = farben[2]; // gelb
-  else if (p >= 20) farbe = farben[1]; // orange
-  else farbe = farben[0];              // rot
+  Object.entries(impfstatus).forEach(([landIso, percent]) => {
+    const p = Number(percent);
 
-  const id2 = iso3to2[landIso] || landIso;
-  const element =
-    document.getElementById(landIso) ||
-    document.getElementById(id2);
+    let farbe;
+    if (p >= 80) farbe = farben[3];      // grün
+    else if (p >= 50) farbe = farben[2]; // gelb
+    else if (p >= 20) farbe = farben[1]; // orange
+    else farbe = farben[0];              // rot
 
-  if (element) element.style.fill = farbe;
-});
+    const id2 = iso3to2[landIso] || landIso;
+    const element =
+      doc.getElementById(landIso) ||
+      doc.getElementById(id2);
+
+    if (element) element.style.fill = farbe;
+  });
+}
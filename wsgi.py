@@ -3,4 +3,6 @@ import os
 
 sys.path.insert(0, '/var/www/immuntrack')
 
-from app import app as application
+from app import create_app
+
+application = create_app()